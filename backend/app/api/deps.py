@@ -5,6 +5,7 @@ from typing import Annotated
 
 from fastapi import Depends
 
+from app.core.batch_ingest_service import BatchIngestService
 from app.core.entity_service import EntityService
 from app.core.extraction.workflow_service import ExtractionWorkflowService
 from app.core.ftm_service import FTMService
@@ -31,7 +32,10 @@ def get_ftm_service() -> FTMService:
 @lru_cache
 def get_investigation_service() -> InvestigationService:
     """Get investigation service singleton."""
-    return InvestigationService(graph_service=get_graph_service())
+    return InvestigationService(
+        graph_service=get_graph_service(),
+        storage_service=get_storage_service(),
+    )
 
 
 @lru_cache
@@ -64,6 +68,16 @@ def get_extraction_workflow_service() -> ExtractionWorkflowService:
     return ExtractionWorkflowService()
 
 
+@lru_cache
+def get_batch_ingest_service() -> BatchIngestService:
+    """Get bulk document ingest service singleton."""
+    return BatchIngestService(
+        entity_service=get_entity_service(),
+        storage_service=get_storage_service(),
+        workflow_service=get_extraction_workflow_service(),
+    )
+
+
 @lru_cache
 def get_notebook_service() -> NotebookService:
     """Get notebook service singleton."""
@@ -81,4 +95,5 @@ ExtractionWorkflowServiceDep = Annotated[
     ExtractionWorkflowService,
     Depends(get_extraction_workflow_service),
 ]
+BatchIngestServiceDep = Annotated[BatchIngestService, Depends(get_batch_ingest_service)]
 NotebookServiceDep = Annotated[NotebookService, Depends(get_notebook_service)]
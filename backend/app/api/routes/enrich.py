@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Query, status
 from app.api.deps import EntityServiceDep, YenteServiceDep
 from app.core.graph_service import GraphServiceError
 from app.core.yente_service import YenteServiceError
-from app.models.enrich import YenteLinkResponse, YenteSearchResponse
+from app.models.enrich import YenteCacheStats, YenteLinkResponse, YenteSearchResponse
 
 router = APIRouter()
 
@@ -29,7 +29,7 @@ async def search_yente(
 ) -> YenteSearchResponse:
     """Search Yente/OpenSanctions for entities."""
     try:
-        return service.search(query, limit=limit)
+        return await service.search(query, limit=limit)
     except YenteServiceError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -37,6 +37,12 @@ async def search_yente(
         ) from exc
 
 
+@router.get("/yente/cache")
+async def get_yente_cache_stats(service: YenteServiceDep) -> YenteCacheStats:
+    """Report hit/miss counts, evictions and the dataset version of the Yente cache."""
+    return YenteCacheStats.model_validate(service.cache.stats())
+
+
 @router.post("/yente/link/{investigation_id}/{entity_id}")
 async def link_yente_entity(
     investigation_id: str,
@@ -46,7 +52,7 @@ async def link_yente_entity(
 ) -> YenteLinkResponse:
     """Link an entity to already-present graph entities using Yente adjacency."""
     try:
-        linked_ids = yente.adjacent_entity_ids(entity_id)
+        linked_ids = await yente.adjacent_entity_ids(entity_id)
         if not linked_ids:
             return YenteLinkResponse(
                 investigation_id=investigation_id,
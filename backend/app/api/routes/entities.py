@@ -1,14 +1,22 @@
 """Entity CRUD routes."""
 
+import re
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, Response, status
+import logfire
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import EntityServiceDep
+from app.api.deps import EntityServiceDep, StorageServiceDep
 from app.core.graph_service import GraphServiceError
 from app.models.entity import (
+    BulkMergeEntitiesRequest,
+    BulkMergeEntitiesResponse,
     DuplicateCandidate,
     Entity,
+    EntityAppearance,
     EntityCreate,
     EntityExpand,
     EntityUpdate,
@@ -18,6 +26,28 @@ from app.models.entity import (
 
 router = APIRouter()
 
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Return the inclusive range a single-range ``Range`` header selects, None for all.
+
+    Multi-range and malformed headers are ignored, as RFC 9110 allows; a range starting past
+    the end of the object raises ValueError.
+    """
+    match = BYTE_RANGE.match(header.strip()) if header else None
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        msg = "Requested range not satisfiable"
+        raise ValueError(msg)
+    return start, end
+
 
 @router.post(
     "/{investigation_id}/entities",
@@ -104,9 +134,11 @@ async def delete_entity(
     investigation_id: str,
     entity_id: str,
     service: EntityServiceDep,
+    storage_service: StorageServiceDep,
 ) -> Response:
-    """Delete an entity by ID."""
+    """Delete an entity by ID, releasing a Document's shared stored content."""
     try:
+        entity = service.get(investigation_id, entity_id)
         deleted = service.delete(investigation_id, entity_id)
     except GraphServiceError as exc:
         raise HTTPException(
@@ -116,9 +148,74 @@ async def delete_entity(
 
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entity not found")
+    if entity is not None and entity.schema_ == "Document":
+        for url in entity.properties.get("sourceUrl", []):
+            key = storage_service.key_from_url(url)
+            if key is None:
+                continue
+            try:
+                storage_service.release_reference(investigation_id, entity_id, key)
+            except (BotoCoreError, ClientError) as exc:
+                logfire.warn("could not release document content", key=key, error=str(exc))
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.get("/{investigation_id}/entities/{entity_id}/content")
+async def get_document_content(
+    investigation_id: str,
+    entity_id: str,
+    service: EntityServiceDep,
+    storage_service: StorageServiceDep,
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+) -> StreamingResponse:
+    """Stream a Document's original file, honouring single byte-range requests for previews."""
+    entity = service.get(investigation_id, entity_id)
+    if entity is None or entity.schema_ != "Document":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+
+    key = next(
+        (
+            source_key
+            for url in entity.properties.get("sourceUrl", [])
+            if (source_key := storage_service.source_key(investigation_id, url))
+        ),
+        storage_service.document_key(entity_id, (entity.properties.get("fileName") or [""])[0]),
+    )
+    size = await run_in_threadpool(storage_service.object_size, investigation_id, key)
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document content not found",
+        )
+
+    try:
+        byte_range = _byte_range(range_header, size)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=str(exc),
+            headers={"Content-Range": f"bytes */{size}"},
+        ) from exc
+
+    media_type = (entity.properties.get("mimeType") or ["application/octet-stream"])[0]
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(size)}
+    if byte_range is None:
+        return StreamingResponse(
+            storage_service.iter_object(investigation_id, key),
+            media_type=media_type,
+            headers=headers,
+        )
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        storage_service.iter_object(investigation_id, key, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get("/{investigation_id}/entities/{entity_id}/expand")
 async def expand_entity(
     investigation_id: str,
@@ -139,6 +236,26 @@ async def expand_entity(
     return expanded
 
 
+@router.get("/{investigation_id}/entities/{entity_id}/appearances")
+async def find_entity_appearances(
+    investigation_id: str,
+    entity_id: str,
+    service: EntityServiceDep,
+) -> list[EntityAppearance]:
+    """List matching entities in other investigations via the shared match index."""
+    try:
+        appearances = service.find_appearances(investigation_id, entity_id)
+    except GraphServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+    if appearances is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entity not found")
+    return appearances
+
+
 @router.get("/{investigation_id}/entities/deduplicate/candidates")
 async def find_duplicates(
     investigation_id: str,
@@ -183,3 +300,19 @@ async def merge_entities(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         ) from exc
+
+
+@router.post("/{investigation_id}/entities/merge/bulk")
+async def merge_entities_bulk(
+    investigation_id: str,
+    payload: BulkMergeEntitiesRequest,
+    service: EntityServiceDep,
+) -> BulkMergeEntitiesResponse:
+    """Merge many duplicate clusters at once and report per-cluster results."""
+    try:
+        return service.merge_entities_bulk(investigation_id, payload.clusters)
+    except GraphServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
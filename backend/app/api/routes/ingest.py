@@ -3,17 +3,38 @@
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+import logfire
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 
-from app.api.deps import ExtractionWorkflowServiceDep, IngestServiceDep, StorageServiceDep
+from app.api.deps import (
+    BatchIngestServiceDep,
+    ExtractionWorkflowServiceDep,
+    IngestServiceDep,
+    StorageServiceDep,
+)
+from app.core.batch_ingest_service import BatchUpload
 from app.core.graph_service import GraphServiceError
-from app.models.entity import EntityCreate
-from app.models.ingest import ExtractionStatus, IngestResult
+from app.core.ingest.archive import is_archive
+from app.models.entity import EntityCreate, EntityUpdate
+from app.models.ingest import (
+    BatchIngestResult,
+    BatchIngestStatus,
+    ExtractionMetrics,
+    ExtractionStatus,
+    IngestResult,
+    UploadCompletion,
+    UploadRequest,
+    UploadTicket,
+)
 
 router = APIRouter()
 
 FTM_EXTENSIONS = {".ftm", ".ijson", ".json", ".ndjson"}
 UploadFileBody = Annotated[UploadFile, File(...)]
+UploadFilesBody = Annotated[list[UploadFile], File(...)]
 
 
 @router.post("/{investigation_id}/ingest")
@@ -26,21 +47,28 @@ async def ingest_file(
 ) -> IngestResult:
     """Ingest structured FTM records or extract entities from uploaded documents."""
     try:
-        content = await file.read()
-        if not content:
+        filename = file.filename or "upload.bin"
+        if is_archive(filename):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload archives and mbox files through the batch ingest endpoint",
+            )
+
+        # Peek instead of reading: documents are streamed to storage from the spooled upload.
+        if not await file.read(1):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Uploaded file is empty",
             )
+        await file.seek(0)
 
-        filename = file.filename or "upload.bin"
         extension = Path(filename).suffix.lower()
 
         if extension in FTM_EXTENSIONS:
             return ingest_service.ingest_file(
                 investigation_id=investigation_id,
                 filename=filename,
-                content=content,
+                content=await file.read(),
             )
 
         document = ingest_service.entity_service.create(
@@ -56,13 +84,23 @@ async def ingest_file(
             ),
         )
 
-        storage_key = storage_service.upload_bytes(
-            investigation_id=investigation_id,
-            document_id=document.id,
-            filename=filename,
-            content=content,
-            content_type=file.content_type,
-        )
+        try:
+            storage_key = await run_in_threadpool(
+                storage_service.upload_stream,
+                investigation_id=investigation_id,
+                document_id=document.id,
+                filename=filename,
+                fileobj=file.file,
+                content_type=file.content_type,
+            )
+        except (BotoCoreError, ClientError, S3UploadFailedError) as exc:
+            # No workflow will pick up a queued Document without stored bytes.
+            ingest_service.entity_service.delete(investigation_id, document.id)
+            logfire.warn("document upload failed", document_id=document.id, error=str(exc))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Document storage is unavailable: {exc}",
+            ) from exc
 
         workflow_id = workflow_service.enqueue(
             investigation_id=investigation_id,
@@ -79,15 +117,144 @@ async def ingest_file(
             errors=[],
             status="processing",
             workflow_id=workflow_id,
-            message="Document uploaded and extraction workflow started",
+            message="Document uploaded and extraction workflow queued",
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except GraphServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+
+@router.post("/{investigation_id}/ingest/uploads")
+async def create_direct_upload(
+    investigation_id: str,
+    payload: UploadRequest,
+    ingest_service: IngestServiceDep,
+    storage_service: StorageServiceDep,
+) -> UploadTicket:
+    """Create a Document awaiting upload and return presigned URLs for its bytes."""
+    extension = Path(payload.filename).suffix.lower()
+    if is_archive(payload.filename) or extension in FTM_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Archives, mbox and FTM files must be uploaded through the API",
+        )
+    try:
+        document = ingest_service.entity_service.create(
+            investigation_id,
+            EntityCreate(
+                schema="Document",
+                properties={
+                    "fileName": [payload.filename],
+                    "mimeType": [payload.content_type or "application/octet-stream"],
+                    "extension": [extension],
+                    "processingStatus": ["uploading"],
+                },
+            ),
+        )
+    except GraphServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+    ticket = await run_in_threadpool(
+        storage_service.presign_upload,
+        investigation_id=investigation_id,
+        document_id=document.id,
+        filename=payload.filename,
+        content_type=payload.content_type,
+        size_bytes=payload.size_bytes,
+    )
+    return UploadTicket(document_id=document.id, **ticket)
+
+
+@router.post("/{investigation_id}/ingest/uploads/{document_id}/complete")
+async def complete_direct_upload(  # noqa: PLR0913, PLR0917
+    investigation_id: str,
+    document_id: str,
+    payload: UploadCompletion,
+    ingest_service: IngestServiceDep,
+    storage_service: StorageServiceDep,
+    workflow_service: ExtractionWorkflowServiceDep,
+) -> IngestResult:
+    """Confirm a direct upload landed in storage and queue its extraction workflow."""
+    entity_service = ingest_service.entity_service
+    try:
+        document = entity_service.get(investigation_id, document_id)
+    except GraphServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+    if document is None or document.schema_ != "Document":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    if document.properties.get("processingStatus") != ["uploading"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload was already completed",
+        )
+
+    filename = (document.properties.get("fileName") or ["upload.bin"])[0]
+    content_type = (document.properties.get("mimeType") or [None])[0]
+    storage_key = storage_service.document_key(document_id, filename)
+    try:
+        await run_in_threadpool(
+            storage_service.complete_upload,
+            investigation_id=investigation_id,
+            key=storage_key,
+            upload_id=payload.upload_id,
+            parts=[(part.part_number, part.etag) for part in payload.parts],
         )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    try:
+        entity_service.update(
+            investigation_id,
+            document_id,
+            EntityUpdate(properties={**document.properties, "processingStatus": ["queued"]}),
+        )
     except GraphServiceError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         ) from exc
+    # A deterministic workflow ID makes a retried completion call idempotent.
+    workflow_id = workflow_service.enqueue(
+        investigation_id=investigation_id,
+        document_id=document_id,
+        storage_key=storage_key,
+        filename=filename,
+        content_type=content_type,
+        workflow_id=f"upload-{document_id}",
+    )
+    return IngestResult(
+        processed=1,
+        nodes_created=1,
+        edges_created=0,
+        errors=[],
+        status="processing",
+        workflow_id=workflow_id,
+        message="Upload completed and extraction workflow queued",
+    )
+
+
+@router.get("/{investigation_id}/ingest/metrics")
+async def get_extraction_metrics(
+    investigation_id: str,
+    workflow_service: ExtractionWorkflowServiceDep,
+    limit: Annotated[int, Query(ge=1, le=5000)] = 500,
+    since_hours: Annotated[int, Query(ge=1, le=720)] = 24,
+) -> ExtractionMetrics:
+    """Summarize per-stage durations, sizes, throughput and queue wait of recent extractions."""
+    summary = await run_in_threadpool(
+        workflow_service.metrics_summary, investigation_id, limit, since_hours
+    )
+    return ExtractionMetrics.model_validate(summary)
 
 
 @router.get("/{investigation_id}/ingest/{workflow_id}/status")
@@ -100,3 +267,40 @@ async def get_extraction_status(
     _ = investigation_id
     status_payload = workflow_service.get_status(workflow_id)
     return ExtractionStatus(**status_payload)
+
+
+@router.post("/{investigation_id}/ingest/batch")
+async def ingest_batch(
+    investigation_id: str,
+    batch_service: BatchIngestServiceDep,
+    files: UploadFilesBody,
+) -> BatchIngestResult:
+    """Upload many documents, zip/tar archives or mbox files, and queue their extraction."""
+    uploads = [
+        BatchUpload(
+            filename=file.filename or "upload.bin",
+            fileobj=file.file,
+            content_type=file.content_type,
+        )
+        for file in files
+    ]
+    try:
+        return await run_in_threadpool(batch_service.ingest, investigation_id, uploads)
+    except GraphServiceError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get("/{investigation_id}/ingest/batch/{batch_id}")
+async def get_batch_status(
+    investigation_id: str,
+    batch_id: str,
+    batch_service: BatchIngestServiceDep,
+) -> BatchIngestStatus:
+    """Get aggregate extraction progress for a bulk upload."""
+    batch_status = batch_service.status(investigation_id, batch_id)
+    if batch_status is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return batch_status
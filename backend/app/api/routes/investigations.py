@@ -1,8 +1,10 @@
 """Investigation CRUD routes."""
 
+import logfire
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import APIRouter, HTTPException, Response, status
 
-from app.api.deps import InvestigationServiceDep
+from app.api.deps import InvestigationServiceDep, StorageServiceDep
 from app.core.graph_service import GraphServiceError
 from app.models.investigation import Investigation, InvestigationCreate, InvestigationList
 
@@ -13,15 +15,22 @@ router = APIRouter()
 async def create_investigation(
     payload: InvestigationCreate,
     service: InvestigationServiceDep,
+    storage_service: StorageServiceDep,
 ) -> Investigation:
-    """Create a new investigation and backing graph."""
+    """Create a new investigation, its backing graph and its document bucket."""
     try:
-        return service.create(payload)
+        investigation = service.create(payload)
     except GraphServiceError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         ) from exc
+    try:
+        storage_service.ensure_bucket(investigation.id)
+    except (BotoCoreError, ClientError) as exc:
+        # The bucket is created on first upload instead.
+        logfire.warn("could not create investigation bucket", error=str(exc))
+    return investigation
 
 
 @router.get("")
@@ -0,0 +1,258 @@
+"""Bulk document upload with fan-out extraction."""
+
+from __future__ import annotations
+
+import mimetypes
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import IO, TYPE_CHECKING, cast
+from uuid import uuid4
+
+import logfire
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.config import settings
+from app.core.ingest.archive import is_archive, iter_archive
+from app.models.entity import EntityCreate
+from app.models.ingest import BatchIngestResult, BatchIngestStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from app.core.entity_service import EntityService
+    from app.core.extraction.workflow_service import ExtractionWorkflowService
+    from app.core.storage_service import StorageService
+
+DONE_STATUSES = {"SUCCESS"}
+FAILED_STATUSES = {"ERROR", "CANCELLED", "MAX_RECOVERY_ATTEMPTS_EXCEEDED"}
+
+
+@dataclass(slots=True)
+class BatchUpload:
+    filename: str
+    fileobj: IO[bytes]
+    content_type: str | None
+
+
+@dataclass(slots=True)
+class StagedDocument:
+    document_id: str
+    filename: str
+    content_type: str | None
+    storage_key: str = ""
+    workflow_id: str = ""
+
+
+class BatchIngestService:
+    """Store many documents, create their Document nodes together and queue extraction."""
+
+    def __init__(
+        self,
+        entity_service: EntityService,
+        storage_service: StorageService,
+        workflow_service: ExtractionWorkflowService,
+    ) -> None:
+        self.entity_service = entity_service
+        self.storage_service = storage_service
+        self.workflow_service = workflow_service
+
+    @staticmethod
+    def manifest_key(batch_id: str) -> str:
+        return f"_batches/{batch_id}.json"
+
+    @logfire.instrument("ingest document batch", extract_args=False)
+    def ingest(self, investigation_id: str, uploads: list[BatchUpload]) -> BatchIngestResult:
+        """Upload files and archive entries, then queue one extraction workflow per document.
+
+        Entries are uploaded concurrently while the next ones are read, with at most
+        ``ingest_batch_upload_concurrency`` uploads in flight and ``ingest_batch_buffer_mb`` of
+        archive entries (or one larger entry) held in memory; plain files are streamed from the
+        upload. Objects whose Document node cannot be created are removed again.
+        """
+        batch_id = f"batch-{uuid4().hex}"
+        errors: list[str] = []
+        staged = self._upload_all(investigation_id, uploads, errors)
+
+        payloads = [
+            EntityCreate(
+                id=document.document_id,
+                schema="Document",
+                properties={
+                    "fileName": [document.filename],
+                    "mimeType": [document.content_type or "application/octet-stream"],
+                    "extension": [Path(document.filename).suffix.lower()],
+                    "processingStatus": ["queued"],
+                },
+            )
+            for document in staged
+        ]
+        created, create_errors = self.entity_service.create_many(investigation_id, payloads)
+        errors.extend(
+            f"{staged[index].filename}: {error}" for index, error in create_errors.items()
+        )
+
+        for index in sorted(create_errors):
+            self._discard(investigation_id, staged[index])
+
+        queued = [staged[index] for index in sorted(created)]
+        for position, document in enumerate(queued):
+            document.workflow_id = f"{batch_id}-{position:06d}"
+        if queued:
+            self.workflow_service.enqueue_many(
+                investigation_id,
+                [
+                    {
+                        "document_id": document.document_id,
+                        "storage_key": document.storage_key,
+                        "filename": document.filename,
+                        "content_type": document.content_type,
+                        "workflow_id": document.workflow_id,
+                    }
+                    for document in queued
+                ],
+                batch_workflow_id=batch_id,
+            )
+
+        self.storage_service.put_json(
+            investigation_id,
+            self.manifest_key(batch_id),
+            {
+                "batch_id": batch_id,
+                "documents": [asdict(document) for document in queued],
+                "errors": errors,
+            },
+        )
+        logfire.info("document batch queued", documents=len(queued), errors=len(errors))
+        return BatchIngestResult(
+            batch_id=batch_id,
+            documents=len(queued),
+            workflow_ids=[document.workflow_id for document in queued],
+            errors=errors,
+            message=f"{len(queued)} documents uploaded and extraction workflows queued",
+        )
+
+    @logfire.instrument("get document batch status", extract_args=False)
+    def status(self, investigation_id: str, batch_id: str) -> BatchIngestStatus | None:
+        """Aggregate workflow states for a batch, or None when the batch does not exist."""
+        try:
+            manifest = cast(
+                "dict[str, list]",
+                self.storage_service.get_json(investigation_id, self.manifest_key(batch_id)),
+            )
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NoSuchBucket", "NotFound"}:
+                return None
+            raise
+
+        total = len(manifest.get("documents", []))
+        counts = self.workflow_service.count_by_status(f"{batch_id}-")
+        completed = sum(count for state, count in counts.items() if state in DONE_STATUSES)
+        failed = sum(count for state, count in counts.items() if state in FAILED_STATUSES)
+        return BatchIngestStatus(
+            batch_id=batch_id,
+            total=total,
+            counts=counts,
+            completed=completed,
+            failed=failed,
+            progress=round((completed + failed) / total, 4) if total else 1.0,
+            errors=[str(error) for error in manifest.get("errors", [])],
+        )
+
+    def _upload_all(
+        self,
+        investigation_id: str,
+        uploads: list[BatchUpload],
+        errors: list[str],
+    ) -> list[StagedDocument]:
+        concurrency = max(settings.ingest_batch_upload_concurrency, 1)
+        buffer_bytes = settings.ingest_batch_buffer_mb * 1024 * 1024
+        max_entry_bytes = settings.ingest_batch_max_entry_mb * 1024 * 1024
+        staged: list[StagedDocument] = []
+        pending: dict[Future[str | None], int] = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for name, fileobj, content_type, buffered in self._entries(uploads, errors):
+                if len(staged) >= settings.ingest_batch_max_files:
+                    errors.append(
+                        f"Batch limit of {settings.ingest_batch_max_files} files reached; "
+                        "remaining files were skipped"
+                    )
+                    break
+                filename = PurePosixPath(name).name
+                document = StagedDocument(
+                    document_id=str(uuid4()),
+                    filename=filename,
+                    content_type=content_type or mimetypes.guess_type(filename)[0],
+                )
+                staged.append(document)
+                future = executor.submit(self._upload, investigation_id, document, fileobj)
+                pending[future] = buffered
+                # Leave room for the next entry, which is read into memory before it is queued.
+                while pending and (
+                    len(pending) >= concurrency
+                    or sum(pending.values()) + max_entry_bytes > buffer_bytes
+                ):
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        del pending[finished]
+                    errors.extend(error for finished in done if (error := finished.result()))
+            errors.extend(error for future in wait(pending).done if (error := future.result()))
+        return [document for document in staged if document.storage_key]
+
+    def _entries(
+        self,
+        uploads: list[BatchUpload],
+        errors: list[str],
+    ) -> Iterator[tuple[str, IO[bytes], str | None, int]]:
+        """Yield (name, stream, content type, bytes held in memory) per document.
+
+        Plain files stream straight from the upload with the content type the client sent, and
+        hold nothing in memory. Archive entries have no content type of their own.
+        """
+        max_entry_bytes = settings.ingest_batch_max_entry_mb * 1024 * 1024
+        for upload in uploads:
+            if is_archive(upload.filename):
+                try:
+                    for entry in iter_archive(upload.filename, upload.fileobj, max_entry_bytes):
+                        if entry.error is not None:
+                            errors.append(entry.error)
+                        elif entry.content:
+                            yield entry.name, BytesIO(entry.content), None, len(entry.content)
+                except ValueError as exc:
+                    errors.append(f"{upload.filename}: {exc}")
+                continue
+            if upload.fileobj.read(1):
+                upload.fileobj.seek(0)
+                yield upload.filename, upload.fileobj, upload.content_type, 0
+            else:
+                errors.append(f"{upload.filename}: file is empty")
+
+    def _upload(
+        self, investigation_id: str, document: StagedDocument, fileobj: IO[bytes]
+    ) -> str | None:
+        try:
+            document.storage_key = self.storage_service.upload_stream(
+                investigation_id=investigation_id,
+                document_id=document.document_id,
+                filename=document.filename,
+                fileobj=fileobj,
+                content_type=document.content_type,
+            )
+        except (BotoCoreError, ClientError, S3UploadFailedError) as exc:
+            return f"{document.filename}: upload failed: {exc}"
+        return None
+
+    def _discard(self, investigation_id: str, document: StagedDocument) -> None:
+        try:
+            self.storage_service.delete_document_object(
+                investigation_id,
+                document.document_id,
+                document.storage_key,
+            )
+        except (BotoCoreError, ClientError) as exc:
+            logfire.warn(
+                "could not remove orphaned upload", key=document.storage_key, error=str(exc)
+            )
@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from difflib import SequenceMatcher
-from itertools import combinations
-from typing import TYPE_CHECKING, Any, Protocol, cast
+from threading import Lock
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, cast
 from uuid import uuid4
 
+from app.core.match_keys import (
+    MATCH_FOLDED,
+    MATCH_IDENTIFIERS,
+    MATCH_KEY_PROPERTIES,
+    MATCH_TOKENS,
+    index_keys,
+    match_keys,
+)
 from app.models.entity import (
+    BulkMergeEntitiesResponse,
     DuplicateCandidate,
     Entity,
+    EntityAppearance,
     EntityCreate,
     EntityExpand,
     EntityUpdate,
+    MergeClusterResult,
+    MergeEntitiesRequest,
     MergeEntitiesResponse,
 )
 
@@ -33,24 +46,103 @@ class GraphProtocol(Protocol):
     def query(self, query: str, params: dict[str, object] | None = None) -> QueryResultProtocol: ...
 
 
+COMPARABLE_FIELDS = (
+    "birthDate",
+    "country",
+    "nationality",
+    "jurisdiction",
+    "registrationNumber",
+    "email",
+    "innCode",
+    "vatCode",
+)
+
+
+@dataclass(slots=True)
+class MatchProfile:
+    folded: set[str]
+    tokens: set[str]
+    identifiers: set[str]
+    attributes: dict[str, set[str]]
+
+
+@dataclass(slots=True)
+class MergePlan:
+    index: int
+    source_ids: list[str]
+    target_id: str
+    merged_properties: dict[str, list[str]] | None
+    schema: str
+    properties: dict[str, list[str]]
+
+
 class EntityService:
     """Manage entities within an investigation graph."""
 
+    _backfill_lock = Lock()
+    _backfilled_investigations: ClassVar[set[str]] = set()
+
     def __init__(self, graph_service: GraphService, ftm_service: FTMService) -> None:
         self.graph_service = graph_service
         self.ftm_service = ftm_service
 
     def _graph(self, investigation_id: str) -> GraphProtocol:
-        return cast(
+        graph = cast(
             "GraphProtocol",
             self.graph_service.create_investigation_graph(investigation_id),
         )
+        self._ensure_match_keys(investigation_id, graph)
+        return graph
+
+    def _ensure_match_keys(self, investigation_id: str, graph: GraphProtocol) -> None:
+        """Backfill match keys once per process for nodes written before they existed."""
+        if investigation_id in EntityService._backfilled_investigations:
+            return
+        with EntityService._backfill_lock:
+            if investigation_id in EntityService._backfilled_investigations:
+                return
+            rows = graph.query(
+                f"MATCH (n:Entity) WHERE n.{MATCH_IDENTIFIERS} IS NULL RETURN n",
+            ).result_set
+            entities = [self._to_entity(row[0]) for row in rows]  # type: ignore[arg-type]
+            if entities:
+                graph.query(
+                    "UNWIND $rows AS row MATCH (n:Entity {id: row.id}) SET n += row.keys",
+                    params={
+                        "rows": [
+                            {"id": entity.id, "keys": match_keys(entity.properties)}
+                            for entity in entities
+                        ]
+                    },
+                )
+                self._index_entities(investigation_id, entities)
+            EntityService._backfilled_investigations.add(investigation_id)
+
+    def _index_entities(self, investigation_id: str, entities: list[Entity]) -> None:
+        """Keep the cross-investigation match index in step with entity writes."""
+        refs: list[dict[str, Any]] = []
+        unindexed: list[str] = []
+        for entity in entities:
+            keys = index_keys(entity.properties)
+            if not keys:
+                unindexed.append(entity.id)
+                continue
+            refs.append(
+                {
+                    "entity_id": entity.id,
+                    "schema": entity.schema_,
+                    "caption": (entity.properties.get("name") or [entity.id])[0],
+                    "keys": keys,
+                }
+            )
+        self.graph_service.upsert_match_refs(investigation_id, refs)
+        self.graph_service.delete_match_refs(investigation_id, unindexed)
 
     @staticmethod
     def _normalize_properties(properties: dict[str, Any]) -> dict[str, list[str]]:
         normalized: dict[str, list[str]] = {}
         for key, value in properties.items():
-            if key in {"id", "schema"}:
+            if key in {"id", "schema"} or key in MATCH_KEY_PROPERTIES:
                 continue
 
             prop_name = key.removeprefix("_")
@@ -69,7 +161,9 @@ class EntityService:
 
     @staticmethod
     def _db_properties(properties: dict[str, list[str]]) -> dict[str, list[str]]:
-        return {f"_{key}": values for key, values in properties.items()}
+        db_properties = {f"_{key}": values for key, values in properties.items()}
+        db_properties.update(match_keys(properties))
+        return db_properties
 
     def _to_entity(self, node: NodeProtocol) -> Entity:
         props = self._normalize_properties(node.properties)
@@ -79,9 +173,9 @@ class EntityService:
             properties=props,
         )
 
-    @staticmethod
+    @classmethod
     def _set_entity_properties(
-        graph: GraphProtocol, entity_id: str, properties: dict[str, list[str]]
+        cls, graph: GraphProtocol, entity_id: str, properties: dict[str, list[str]]
     ) -> None:
         existing = graph.query(
             "MATCH (n:Entity {id: $entity_id}) RETURN n LIMIT 1",
@@ -98,36 +192,59 @@ class EntityService:
             remove_clause = "REMOVE " + ", ".join(f"n.{key}" for key in removable_keys)
 
         query = f"MATCH (n:Entity {{id: $entity_id}}) {remove_clause} SET n += $properties RETURN n"
-        db_properties = {f"_{key}": values for key, values in properties.items()}
         graph.query(
             query,
-            params={"entity_id": entity_id, "properties": db_properties},
+            params={"entity_id": entity_id, "properties": cls._db_properties(properties)},
         )
 
     @staticmethod
-    def _similarity(left: Entity, right: Entity) -> tuple[float, str]:
-        left_name = (left.properties.get("name") or [left.id])[0]
-        right_name = (right.properties.get("name") or [right.id])[0]
-        name_similarity = SequenceMatcher(None, left_name.casefold(), right_name.casefold()).ratio()
-
-        score = 0.7 * name_similarity
-        reasons = [f"name similarity {name_similarity:.2f}"]
-
-        comparable_fields = [
-            "birthDate",
-            "country",
-            "nationality",
-            "jurisdiction",
-            "registrationNumber",
-            "email",
-            "innCode",
-            "vatCode",
-        ]
+    def _match_profile(node: NodeProtocol) -> MatchProfile:
+        """Build a comparison profile from the match keys stored on the node."""
+        properties = node.properties
+        return MatchProfile(
+            folded=set(properties.get(MATCH_FOLDED) or []),
+            tokens=set(properties.get(MATCH_TOKENS) or []),
+            identifiers=set(properties.get(MATCH_IDENTIFIERS) or []),
+            attributes={
+                field: {str(value).casefold() for value in properties.get(f"_{field}") or []}
+                for field in COMPARABLE_FIELDS
+            },
+        )
+
+    @staticmethod
+    def _similarity(left: MatchProfile, right: MatchProfile) -> tuple[float, str]:
+        """Score a blocked pair by name similarity and comparable attribute overlap.
+
+        A shared strong identifier counts as full attribute overlap.
+        """
+        if left.folded & right.folded:
+            name_ratio = 1.0
+            reasons = ["same folded name"]
+        elif left.tokens & right.tokens:
+            name_ratio = 1.0
+            reasons = ["same name tokens"]
+        else:
+            name_ratio = max(
+                (
+                    SequenceMatcher(None, left_name, right_name).ratio()
+                    for left_name in left.folded
+                    for right_name in right.folded
+                ),
+                default=0.0,
+            )
+            reasons = [f"name similarity {name_ratio:.2f}"]
+        score = 0.7 * name_ratio
+
+        if left.identifiers & right.identifiers:
+            score += 0.3
+            reasons.append("shared identifier")
+            return min(score, 1.0), ", ".join(reasons)
+
         overlap_count = 0
         checked_fields = 0
-        for field in comparable_fields:
-            left_values = {value.casefold() for value in left.properties.get(field, [])}
-            right_values = {value.casefold() for value in right.properties.get(field, [])}
+        for field in COMPARABLE_FIELDS:
+            left_values = left.attributes[field]
+            right_values = right.attributes[field]
             if not left_values or not right_values:
                 continue
             checked_fields += 1
@@ -153,35 +270,8 @@ class EntityService:
         return merged
 
     @staticmethod
-    def _recreate_edge(
-        graph: GraphProtocol,
-        source_id: str,
-        target_id: str,
-        rel_type: str,
-        properties: dict[str, Any],
-    ) -> None:
-        relation = "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in rel_type)
-        edge_id = properties.get("id")
-        if edge_id is not None:
-            graph.query(
-                f"MATCH (a:Entity {{id: $source}}), (b:Entity {{id: $target}}) "
-                f"MERGE (a)-[r:{relation} {{id: $edge_id}}]->(b) "
-                "SET r += $properties",
-                params={
-                    "source": source_id,
-                    "target": target_id,
-                    "edge_id": str(edge_id),
-                    "properties": properties,
-                },
-            )
-            return
-
-        graph.query(
-            f"MATCH (a:Entity {{id: $source}}), (b:Entity {{id: $target}}) "
-            f"CREATE (a)-[r:{relation}]->(b) "
-            "SET r += $properties",
-            params={"source": source_id, "target": target_id, "properties": properties},
-        )
+    def _relation_label(rel_type: str) -> str:
+        return "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in rel_type)
 
     def _get_node(self, graph: GraphProtocol, entity_id: str) -> NodeProtocol | None:
         result = graph.query(
@@ -209,7 +299,51 @@ class EntityService:
             "CREATE (n:Entity {id: $entity_id, schema: $schema}) SET n += $properties RETURN n",
             params={"entity_id": entity_id, "schema": schema_name, "properties": db_properties},
         ).result_set
-        return self._to_entity(result[0][0])  # type: ignore[arg-type]
+        entity = self._to_entity(result[0][0])  # type: ignore[arg-type]
+        self._index_entities(investigation_id, [entity])
+        return entity
+
+    def create_many(
+        self, investigation_id: str, payloads: list[EntityCreate]
+    ) -> tuple[dict[int, Entity], dict[int, str]]:
+        """Create entities in one batch, returning created entities and errors by input index."""
+        graph = self._graph(investigation_id)
+        errors: dict[int, str] = {}
+        rows: dict[int, dict[str, Any]] = {}
+        for index, payload in enumerate(payloads):
+            try:
+                self.ftm_service.validate_entity_input(payload.schema_, payload.properties)
+            except ValueError as exc:
+                errors[index] = str(exc)
+                continue
+            rows[index] = {
+                "id": payload.id or str(uuid4()),
+                "schema": payload.schema_,
+                "properties": self._db_properties(payload.properties),
+            }
+
+        explicit_ids = [str(payloads[index].id) for index in rows if payloads[index].id]
+        existing = self._get_entities(graph, explicit_ids)
+        seen: set[str] = set()
+        for index, row in list(rows.items()):
+            if row["id"] in existing or row["id"] in seen:
+                errors[index] = f"Entity '{row['id']}' already exists"
+                del rows[index]
+            seen.add(row["id"])
+
+        created: dict[int, Entity] = {}
+        if rows:
+            result = graph.query(
+                "UNWIND $rows AS row "
+                "CREATE (n:Entity {id: row.id, schema: row.schema}) "
+                "SET n += row.properties RETURN n",
+                params={"rows": list(rows.values())},
+            ).result_set
+            entities = [self._to_entity(row[0]) for row in result]  # type: ignore[arg-type]
+            by_id = {entity.id: entity for entity in entities}
+            created = {index: by_id[row["id"]] for index, row in rows.items() if row["id"] in by_id}
+            self._index_entities(investigation_id, list(created.values()))
+        return created, dict(sorted(errors.items()))
 
     def list(self, investigation_id: str, search: str | None = None) -> list[Entity]:
         graph = self._graph(investigation_id)
@@ -247,7 +381,9 @@ class EntityService:
             "MATCH (n:Entity {id: $entity_id}) RETURN n LIMIT 1",
             params={"entity_id": entity_id},
         ).result_set
-        return self._to_entity(result[0][0])  # type: ignore[arg-type]
+        entity = self._to_entity(result[0][0])  # type: ignore[arg-type]
+        self._index_entities(investigation_id, [entity])
+        return entity
 
     def delete(self, investigation_id: str, entity_id: str) -> bool:
         graph = self._graph(investigation_id)
@@ -255,6 +391,7 @@ class EntityService:
             "MATCH (n:Entity {id: $entity_id}) WITH n LIMIT 1 DETACH DELETE n RETURN 1",
             params={"entity_id": entity_id},
         ).result_set
+        self.graph_service.delete_match_refs(investigation_id, [entity_id])
         return bool(result)
 
     def expand(self, investigation_id: str, entity_id: str) -> EntityExpand | None:
@@ -288,6 +425,27 @@ class EntityService:
 
         return EntityExpand(entity=self._to_entity(node), neighbors=neighbors, edges=edges)  # type: ignore[arg-type]
 
+    def find_appearances(
+        self, investigation_id: str, entity_id: str
+    ) -> list[EntityAppearance] | None:
+        """Find entities in other investigations that share names or strong identifiers."""
+        entity = self.get(investigation_id, entity_id)
+        if entity is None:
+            return None
+
+        refs = self.graph_service.find_match_refs(index_keys(entity.properties))
+        return [
+            EntityAppearance(
+                investigation_id=str(ref["investigation_id"]),
+                entity_id=str(ref["entity_id"]),
+                schema=str(ref["schema"] or "Thing"),
+                caption=str(ref["caption"] or ref["entity_id"]),
+                matched_keys=[str(key) for key in ref["matched_keys"]],
+            )
+            for ref in refs
+            if ref["investigation_id"] != investigation_id
+        ]
+
     def find_duplicates(
         self,
         investigation_id: str,
@@ -295,21 +453,36 @@ class EntityService:
         threshold: float = 0.7,
         limit: int = 100,
     ) -> list[DuplicateCandidate]:
-        entities = self.list(investigation_id)
-        if schema:
-            entities = [entity for entity in entities if entity.schema_ == schema]
+        """Score pairs of same-schema entities that share a stored match key.
+
+        Candidate pairs come from indexed equality lookups on ``match_folded``,
+        ``match_tokens`` and ``match_identifiers``, so only blocked pairs are scored; names
+        within a pair blocked on an identifier are compared with ``SequenceMatcher``.
+        """
+        graph = self._graph(investigation_id)
+        rows = graph.query(
+            " UNION ".join(
+                "MATCH (a:Entity) WHERE $schema IS NULL OR a.schema = $schema "
+                f"UNWIND a.{key} AS key "
+                f"MATCH (b:Entity) WHERE key IN b.{key} "
+                "AND b.schema = a.schema AND a.id < b.id "
+                "RETURN a, b"
+                for key in (MATCH_FOLDED, MATCH_TOKENS, MATCH_IDENTIFIERS)
+            ),
+            params={"schema": schema},
+        ).result_set
 
         candidates: list[DuplicateCandidate] = []
-        for left, right in combinations(entities, 2):
-            if left.schema_ != right.schema_:
-                continue
-            similarity, reason = self._similarity(left, right)
+        for left_node, right_node in cast("list[tuple[NodeProtocol, NodeProtocol]]", rows):
+            similarity, reason = self._similarity(
+                self._match_profile(left_node), self._match_profile(right_node)
+            )
             if similarity < threshold:
                 continue
             candidates.append(
                 DuplicateCandidate(
-                    left=left,
-                    right=right,
+                    left=self._to_entity(left_node),
+                    right=self._to_entity(right_node),
                     similarity=round(similarity, 4),
                     reason=reason,
                 )
@@ -318,83 +491,233 @@ class EntityService:
         candidates.sort(key=lambda candidate: candidate.similarity, reverse=True)
         return candidates[:limit]
 
-    def merge_entities(  # noqa: C901
-        self,
-        investigation_id: str,
-        source_ids: list[str],
-        target_id: str,
-        merged_properties: dict[str, list[str]] | None,
-    ) -> MergeEntitiesResponse:
+    @classmethod
+    def _merge_source_ids(cls, source_ids: list[str], target_id: str) -> list[str]:
         unique_ids = [entity_id.strip() for entity_id in source_ids if entity_id.strip()]
         unique_ids = list(dict.fromkeys(unique_ids))
-        if len(unique_ids) < self.MIN_MERGE_SOURCE_IDS:
+        if len(unique_ids) < cls.MIN_MERGE_SOURCE_IDS:
             msg = "At least two source_ids are required"
             raise ValueError(msg)
         if target_id not in unique_ids:
             msg = "target_id must be one of source_ids"
             raise ValueError(msg)
+        return unique_ids
 
-        graph = self._graph(investigation_id)
-        entities: dict[str, Entity] = {}
-        for entity_id in unique_ids:
-            entity = self.get(investigation_id, entity_id)
+    def _get_entities(self, graph: GraphProtocol, entity_ids: list[str]) -> dict[str, Entity]:
+        if not entity_ids:
+            return {}
+        result = graph.query(
+            "MATCH (n:Entity) WHERE n.id IN $ids RETURN n",
+            params={"ids": list(dict.fromkeys(entity_ids))},
+        ).result_set
+        entities = [self._to_entity(row[0]) for row in result]  # type: ignore[arg-type]
+        return {entity.id: entity for entity in entities}
+
+    def _plan_merges(
+        self, clusters: list[MergeEntitiesRequest]
+    ) -> tuple[list[MergePlan], dict[int, str]]:
+        plans: list[MergePlan] = []
+        errors: dict[int, str] = {}
+        for index, cluster in enumerate(clusters):
+            try:
+                source_ids = self._merge_source_ids(cluster.source_ids, cluster.target_id)
+            except ValueError as exc:
+                errors[index] = str(exc)
+                continue
+
+            plans.append(
+                MergePlan(
+                    index=index,
+                    source_ids=source_ids,
+                    target_id=cluster.target_id,
+                    merged_properties=cluster.merged_properties,
+                    schema="",
+                    properties={},
+                )
+            )
+        return plans, errors
+
+    def _validate_merge_plan(self, plan: MergePlan, entities: dict[str, Entity]) -> None:
+        cluster_entities: list[Entity] = []
+        for entity_id in plan.source_ids:
+            entity = entities.get(entity_id)
             if entity is None:
                 msg = f"Entity '{entity_id}' not found"
                 raise ValueError(msg)
-            entities[entity_id] = entity
+            cluster_entities.append(entity)
 
-        schema_names = {entity.schema_ for entity in entities.values()}
+        schema_names = {entity.schema_ for entity in cluster_entities}
         if len(schema_names) != 1:
             msg = "All source entities must have the same schema"
             raise ValueError(msg)
 
-        final_properties = merged_properties or self._merge_properties(list(entities.values()))
-        schema_name = next(iter(schema_names))
-        self.ftm_service.validate_entity_input(schema_name, final_properties)
+        plan.schema = next(iter(schema_names))
+        plan.properties = plan.merged_properties or self._merge_properties(cluster_entities)
+        self.ftm_service.validate_entity_input(plan.schema, plan.properties)
+
+    def _apply_merge_plans(self, graph: GraphProtocol, plans: list[MergePlan]) -> None:
+        redirects = {
+            source_id: plan.target_id
+            for plan in plans
+            for source_id in plan.source_ids
+            if source_id != plan.target_id
+        }
+        removed_ids = list(redirects)
+
+        edge_rows = graph.query(
+            "MATCH (a:Entity)-[r]->(b:Entity) "
+            "WHERE a.id IN $ids OR b.id IN $ids "
+            "RETURN a.id, type(r), properties(r), b.id",
+            params={"ids": removed_ids},
+        ).result_set
 
-        for source_id in unique_ids:
+        edge_batches: dict[tuple[str, bool], list[dict[str, Any]]] = {}
+        for row in edge_rows:
+            source_id = redirects.get(str(row[0]), str(row[0]))
+            target_id = redirects.get(str(row[3]), str(row[3]))
             if source_id == target_id:
                 continue
+            rel_props = cast("dict[str, Any]", row[2] or {})
+            edge_id = rel_props.get("id")
+            key = (self._relation_label(str(row[1])), edge_id is not None)
+            edge_batches.setdefault(key, []).append(
+                {
+                    "source": source_id,
+                    "target": target_id,
+                    "edge_id": str(edge_id) if edge_id is not None else None,
+                    "properties": rel_props,
+                }
+            )
 
-            outgoing = graph.query(
-                "MATCH (source:Entity {id: $source_id})-[r]->(other:Entity) "
-                "RETURN type(r), properties(r), other.id",
-                params={"source_id": source_id},
-            ).result_set
-            incoming = graph.query(
-                "MATCH (other:Entity)-[r]->(source:Entity {id: $source_id}) "
-                "RETURN type(r), properties(r), other.id",
-                params={"source_id": source_id},
-            ).result_set
+        for (relation, has_id), rows in edge_batches.items():
+            if has_id:
+                write_clause = f"MERGE (a)-[r:{relation} {{id: row.edge_id}}]->(b) "
+            else:
+                write_clause = f"CREATE (a)-[r:{relation}]->(b) "
+            graph.query(
+                "UNWIND $rows AS row "
+                "MATCH (a:Entity {id: row.source}), (b:Entity {id: row.target}) "
+                f"{write_clause}"
+                "SET r += row.properties",
+                params={"rows": rows},
+            )
+
+        graph.query(
+            "MATCH (n:Entity) WHERE n.id IN $ids DETACH DELETE n",
+            params={"ids": removed_ids},
+        )
+        graph.query(
+            "UNWIND $rows AS row MATCH (n:Entity {id: row.id}) SET n = row.properties",
+            params={
+                "rows": [
+                    {
+                        "id": plan.target_id,
+                        "properties": {
+                            "id": plan.target_id,
+                            "schema": plan.schema,
+                            **self._db_properties(plan.properties),
+                        },
+                    }
+                    for plan in plans
+                ]
+            },
+        )
 
-            for row in outgoing:
-                rel_type = str(row[0])
-                rel_props = cast("dict[str, Any]", row[1] or {})
-                other_id = str(row[2])
-                if other_id == target_id:
-                    continue
-                self._recreate_edge(graph, target_id, other_id, rel_type, rel_props)
-
-            for row in incoming:
-                rel_type = str(row[0])
-                rel_props = cast("dict[str, Any]", row[1] or {})
-                other_id = str(row[2])
-                if other_id == target_id:
-                    continue
-                self._recreate_edge(graph, other_id, target_id, rel_type, rel_props)
+    def merge_entities_bulk(
+        self,
+        investigation_id: str,
+        clusters: list[MergeEntitiesRequest],
+    ) -> BulkMergeEntitiesResponse:
+        """Validate all clusters with one fetch, then apply the valid ones in batched writes."""
+        plans, errors = self._plan_merges(clusters)
+        graph = self._graph(investigation_id)
+        entities = self._get_entities(
+            graph, [entity_id for plan in plans for entity_id in plan.source_ids]
+        )
 
-            graph.query(
-                "MATCH (n:Entity {id: $entity_id}) DETACH DELETE n",
-                params={"entity_id": source_id},
+        valid_plans: list[MergePlan] = []
+        # Only clusters that pass validation claim their ids, so a rejected cluster
+        # cannot block a later valid one that shares an entity.
+        claimed_ids: set[str] = set()
+        for plan in plans:
+            try:
+                self._validate_merge_plan(plan, entities)
+            except ValueError as exc:
+                errors[plan.index] = str(exc)
+                continue
+            overlap = claimed_ids.intersection(plan.source_ids)
+            if overlap:
+                errors[plan.index] = f"Entity '{min(overlap)}' appears in more than one cluster"
+                continue
+            claimed_ids.update(plan.source_ids)
+            valid_plans.append(plan)
+
+        if valid_plans:
+            self._apply_merge_plans(graph, valid_plans)
+        targets = self._get_entities(graph, [plan.target_id for plan in valid_plans])
+        if valid_plans:
+            self.graph_service.delete_match_refs(
+                investigation_id,
+                [
+                    entity_id
+                    for plan in valid_plans
+                    for entity_id in plan.source_ids
+                    if entity_id != plan.target_id
+                ],
             )
+            self._index_entities(investigation_id, list(targets.values()))
+
+        plans_by_index = {plan.index: plan for plan in valid_plans}
+        results: list[MergeClusterResult] = []
+        for index, cluster in enumerate(clusters):
+            plan = plans_by_index.get(index)
+            if plan is None:
+                results.append(
+                    MergeClusterResult(
+                        target_id=cluster.target_id,
+                        status="failed",
+                        error=errors.get(index, "Cluster was not merged"),
+                    )
+                )
+                continue
+            results.append(
+                MergeClusterResult(
+                    target_id=plan.target_id,
+                    status="merged",
+                    merged_source_ids=[
+                        entity_id for entity_id in plan.source_ids if entity_id != plan.target_id
+                    ],
+                    target=targets.get(plan.target_id),
+                )
+            )
+
+        return BulkMergeEntitiesResponse(
+            results=results,
+            merged=len(valid_plans),
+            failed=len(clusters) - len(valid_plans),
+        )
 
-        self._set_entity_properties(graph, target_id, final_properties)
-        merged = self.get(investigation_id, target_id)
-        if merged is None:
+    def merge_entities(
+        self,
+        investigation_id: str,
+        source_ids: list[str],
+        target_id: str,
+        merged_properties: dict[str, list[str]] | None,
+    ) -> MergeEntitiesResponse:
+        cluster = MergeEntitiesRequest(
+            source_ids=source_ids,
+            target_id=target_id,
+            merged_properties=merged_properties,
+        )
+        outcome = self.merge_entities_bulk(investigation_id, [cluster]).results[0]
+        if outcome.status != "merged":
+            raise ValueError(outcome.error)
+        if outcome.target is None:
             msg = f"Merged entity '{target_id}' not found"
             raise RuntimeError(msg)
-
-        merged_ids = [entity_id for entity_id in unique_ids if entity_id != target_id]
-        return MergeEntitiesResponse(target=merged, merged_source_ids=merged_ids)
+        return MergeEntitiesResponse(
+            target=outcome.target,
+            merged_source_ids=outcome.merged_source_ids,
+        )
 
     MIN_MERGE_SOURCE_IDS = 2
@@ -0,0 +1,97 @@
+"""Merge repeated mentions of one entity within a document before it is persisted."""
+
+from __future__ import annotations
+
+from app.core.match_keys import name_key
+
+SPAN_START = "charStart"
+SPAN_END = "charEnd"
+RELATION_GROUP = "relationGroup"
+
+
+def _values(properties: dict[str, object], key: str) -> list[str]:
+    value = properties.get(key)
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+def _group_key(
+    schema: str,
+    properties: dict[str, object],
+    endpoint_keys: tuple[str, ...],
+) -> tuple[str, ...] | None:
+    """Key nodes by schema and name; key relations by schema, endpoints and relationGroup."""
+    if endpoint_keys:
+        endpoints = tuple(
+            name_key(values[0]) if (values := _values(properties, key)) else ""
+            for key in endpoint_keys
+        )
+        if not all(endpoints):
+            return None
+        groups = _values(properties, RELATION_GROUP)
+        return (schema, *endpoints, name_key(groups[0]) if groups else "")
+    names = _values(properties, "name")
+    if not names or not name_key(names[0]):
+        return None
+    return (schema, name_key(names[0]))
+
+
+def _merge_into(target: dict[str, list[str]], properties: dict[str, object]) -> None:
+    """Union property values in first-seen order, keeping charStart/charEnd paired."""
+    spans = list(zip(target.get(SPAN_START, []), target.get(SPAN_END, []), strict=False))
+    spans.extend(
+        zip(_values(properties, SPAN_START), _values(properties, SPAN_END), strict=False),
+    )
+    for key in properties:
+        if key in {SPAN_START, SPAN_END}:
+            continue
+        merged = target.setdefault(key, [])
+        merged.extend(value for value in _values(properties, key) if value not in merged)
+    unique_spans = list(dict.fromkeys(spans))
+    if unique_spans:
+        target[SPAN_START] = [start for start, _ in unique_spans]
+        target[SPAN_END] = [end for _, end in unique_spans]
+
+
+def consolidate_entities(
+    candidates: list[object],
+    relation_endpoints: dict[str, list[tuple[str, str]]],
+) -> list[object]:
+    """Group extraction candidates that describe the same entity in one document.
+
+    Nodes group by schema and normalised name, relations by schema, normalised endpoints
+    and relationGroup. Each group becomes one candidate whose properties are the union of
+    its mentions, with every mention's character span kept. Candidates that cannot be
+    keyed are passed through unchanged so persistence still reports their errors.
+    """
+    consolidated: list[object] = []
+    groups: dict[tuple[str, ...], dict[str, list[str]]] = {}
+    for candidate in candidates:
+        if not isinstance(candidate, dict) or not isinstance(candidate.get("properties"), dict):
+            consolidated.append(candidate)
+            continue
+        schema = str(candidate.get("schema", "")).strip()
+        properties = candidate["properties"]
+        endpoint_keys = next(
+            (
+                pair
+                for pair in relation_endpoints.get(schema, [])
+                if _values(properties, pair[0]) and _values(properties, pair[1])
+            ),
+            (),
+        )
+        if schema in relation_endpoints and not endpoint_keys:
+            consolidated.append(candidate)
+            continue
+        key = _group_key(schema, properties, endpoint_keys)
+        if key is None:
+            consolidated.append(candidate)
+            continue
+        if key not in groups:
+            groups[key] = {}
+            consolidated.append({"schema": schema, "properties": groups[key]})
+        _merge_into(groups[key], properties)
+    return consolidated
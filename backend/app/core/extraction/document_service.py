@@ -3,38 +3,153 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.core.extraction.pdf_pages import PDF_MIME_TYPE, split_pdf
 
 try:
-    from kreuzberg import extract_bytes_sync
+    from kreuzberg import extract_bytes_sync, extract_file_sync
 except ImportError:  # pragma: no cover - dependency/runtime concern
     extract_bytes_sync = None
+    extract_file_sync = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from app.core.extraction.parse_cache import ParseCache
+    from app.core.extraction.parse_pool import ParsePool
+
+
+def parse_bytes(content: bytes, mime_type: str) -> dict[str, object]:
+    """Parse raw bytes with Kreuzberg into a JSON-serialisable payload."""
+    if extract_bytes_sync is None:
+        msg = "kreuzberg is not installed"
+        raise RuntimeError(msg)
+    return _payload(extract_bytes_sync(content, mime_type))
+
+
+def parse_file(path: str, mime_type: str) -> dict[str, object]:
+    """Parse a file on disk with Kreuzberg, without loading it into memory first."""
+    if extract_file_sync is None:
+        msg = "kreuzberg is not installed"
+        raise RuntimeError(msg)
+    return _payload(extract_file_sync(path, mime_type))
+
+
+def _payload(result: Any) -> dict[str, object]:  # noqa: ANN401
+    metadata = dict(result.metadata) if result.metadata is not None else {}
+    return {
+        "content": result.content,
+        "mime_type": result.mime_type,
+        "metadata": metadata,
+    }
 
 
 class DocumentService:
     """Extract plain text and metadata from raw files."""
 
-    def extract(self, content: bytes, filename: str, content_type: str | None) -> dict[str, object]:
-        """Extract document content and metadata using Kreuzberg."""
-        if extract_bytes_sync is None:
-            msg = "kreuzberg is not installed"
-            raise RuntimeError(msg)
+    def __init__(
+        self,
+        parse_cache: ParseCache | None = None,
+        parse_pool: ParsePool | None = None,
+    ) -> None:
+        self.parse_cache = parse_cache
+        self.parse_pool = parse_pool
 
+    def extract(
+        self,
+        content: bytes | Path,
+        filename: str,
+        content_type: str | None,
+    ) -> dict[str, object]:
+        """Extract document content and metadata, reusing cached parses of identical bytes.
+
+        ``content`` may be a path to a downloaded file, which is hashed and parsed from disk.
+        """
         mime_type = content_type or self._guess_mime_type(filename)
-        result = extract_bytes_sync(content, mime_type)
-        metadata = dict(result.metadata) if result.metadata is not None else {}
 
+        cache_key = None
+        parsed = None
+        if self.parse_cache is not None:
+            cache_key = self.parse_cache.cache_key(content, mime_type)
+            parsed = self.parse_cache.get(cache_key)
+
+        cache_hit = parsed is not None
+        if parsed is None:
+            parsed = self._parse(content, mime_type)
+            if self.parse_cache is not None and cache_key is not None:
+                self.parse_cache.put(cache_key, parsed)
+
+        return self._result(parsed, mime_type, filename, cache_hit=cache_hit)
+
+    def split_pages(
+        self,
+        content: bytes | Path,
+        filename: str,
+        content_type: str | None,
+        min_pages: int,
+        range_size: int,
+    ) -> Iterator[tuple[int, int, bytes]]:
+        """Lazily split a large, not yet parsed PDF into page ranges; none means parse it whole."""
+        mime_type = content_type or self._guess_mime_type(filename)
+        if mime_type != PDF_MIME_TYPE:
+            return iter(())
+        if self.parse_cache is not None and self.parse_cache.contains(
+            self.parse_cache.cache_key(content, mime_type)
+        ):
+            return iter(())
+        return split_pdf(content, min_pages, range_size)
+
+    def join_pages(
+        self,
+        parts: list[dict[str, object]],
+        filename: str,
+        cache_key: str | None = None,
+    ) -> dict[str, object]:
+        """Join page-range parses, in page order, into one document result."""
+        metadata = parts[0].get("metadata") if parts else None
+        joined: dict[str, object] = {
+            "content": "\n\n".join(str(part.get("content") or "") for part in parts),
+            "mime_type": str(parts[0].get("mime_type") or PDF_MIME_TYPE)
+            if parts
+            else PDF_MIME_TYPE,
+            "metadata": dict(metadata) if isinstance(metadata, dict) else {},
+        }
+        if self.parse_cache is not None and cache_key is not None:
+            self.parse_cache.put(cache_key, joined)
+        return self._result(joined, PDF_MIME_TYPE, filename, cache_hit=False)
+
+    def _result(
+        self,
+        parsed: dict[str, object],
+        mime_type: str,
+        filename: str,
+        *,
+        cache_hit: bool,
+    ) -> dict[str, object]:
+        text = str(parsed.get("content") or "")
+        metadata = parsed.get("metadata")
+        metadata = metadata if isinstance(metadata, dict) else {}
         return {
-            "content": result.content,
-            "mime_type": result.mime_type,
+            "content": text,
+            "mime_type": parsed.get("mime_type") or mime_type,
             "metadata": metadata,
-            "document_type": self.detect_document_type(filename, result.content, metadata),
+            "document_type": self.detect_document_type(filename, text, metadata),
+            "cache_hit": cache_hit,
         }
 
+    def _parse(self, content: bytes | Path, mime_type: str) -> dict[str, object]:
+        if self.parse_pool is not None:
+            return self.parse_pool.parse(content, mime_type)
+        if isinstance(content, Path):
+            return parse_file(str(content), mime_type)
+        return parse_bytes(content, mime_type)
+
     @staticmethod
     def _guess_mime_type(filename: str) -> str:
         suffix = Path(filename).suffix.lower()
         if suffix == ".pdf":
-            return "application/pdf"
+            return PDF_MIME_TYPE
         if suffix in {".html", ".htm"}:
             return "text/html"
         if suffix == ".eml":
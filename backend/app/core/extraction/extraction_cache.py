@@ -0,0 +1,105 @@
+"""Chunk-level cache for LLM extraction results in object storage."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import zlib
+from typing import TYPE_CHECKING, ClassVar
+
+from app.core.extraction.object_cache import JsonObjectCache
+
+if TYPE_CHECKING:
+    from app.core.storage_service import StorageService
+
+# Bump when the cached extraction shape or chunking rules change.
+EXTRACTION_CACHE_FORMAT = 1
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# One in four paragraph ends is a chunk boundary, so boundaries depend on local
+# content and an edit early in a document leaves later chunks (and their keys) intact.
+BOUNDARY_MODULUS = 4
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _paragraphs(text: str, max_chars: int) -> list[tuple[int, str]]:
+    """Split text into (offset, paragraph) pairs, hard-splitting oversize paragraphs."""
+    pieces: list[tuple[int, str]] = []
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        pieces.append((start, text[start : match.end()]))
+        start = match.end()
+    if start < len(text):
+        pieces.append((start, text[start:]))
+
+    paragraphs: list[tuple[int, str]] = []
+    for offset, piece in pieces:
+        paragraphs.extend(
+            (offset + index, piece[index : index + max_chars])
+            for index in range(0, len(piece), max_chars)
+        )
+    return paragraphs
+
+
+def split_chunks(text: str, max_chars: int) -> list[tuple[int, str]]:
+    """Split text into content-defined, paragraph-aligned (offset, chunk) pairs."""
+    if not text:
+        return []
+    max_chars = max(max_chars, 1)
+    chunks: list[tuple[int, str]] = []
+    chunk_start = 0
+    chunk_parts: list[str] = []
+    chunk_len = 0
+
+    for offset, paragraph in _paragraphs(text, max_chars):
+        if chunk_parts and chunk_len + len(paragraph) > max_chars:
+            chunks.append((chunk_start, "".join(chunk_parts)))
+            chunk_parts, chunk_len = [], 0
+        if not chunk_parts:
+            chunk_start = offset
+        chunk_parts.append(paragraph)
+        chunk_len += len(paragraph)
+
+        at_boundary = zlib.crc32(paragraph.strip().encode("utf-8")) % BOUNDARY_MODULUS == 0
+        if at_boundary and chunk_len >= max_chars // 2:
+            chunks.append((chunk_start, "".join(chunk_parts)))
+            chunk_parts, chunk_len = [], 0
+
+    if chunk_parts:
+        chunks.append((chunk_start, "".join(chunk_parts)))
+    return chunks
+
+
+class ExtractionCache(JsonObjectCache):
+    """Reuse raw LLM extractions for chunks already sent with the same model and prompt."""
+
+    label: ClassVar[str] = "extraction cache"
+
+    def __init__(
+        self,
+        storage: StorageService,
+        *,
+        model_id: str,
+        prompt: str,
+        examples: list[object],
+        options: dict[str, object],
+    ) -> None:
+        super().__init__(storage)
+        model_slug = re.sub(r"[^a-z0-9.+-]", "_", model_id.lower())
+        examples_json = json.dumps(examples, sort_keys=True, default=str)
+        options_json = json.dumps(options, sort_keys=True, default=str)
+        self.prefix = (
+            f"extractions/{EXTRACTION_CACHE_FORMAT}/{model_slug}/"
+            f"{_digest(prompt)[:12]}/{_digest(examples_json)[:12]}/{_digest(options_json)[:12]}"
+        )
+
+    def cache_key(self, chunk: str) -> str:
+        return f"{self.prefix}/{_digest(chunk)}.json"
+
+    def get(self, key: str) -> list[dict[str, object]] | None:
+        extractions = super().get(key)
+        return extractions if isinstance(extractions, list) else None
@@ -1,12 +1,16 @@
 """LLM extraction service powered by LangExtract."""
 
-from typing import cast
+import dataclasses
+from typing import Any, cast
 
 import langextract as lx
 import logfire
 
 from app.config import settings
 from app.core.cleaning_service import CleaningService
+from app.core.extraction.extraction_cache import ExtractionCache, split_chunks
+from app.core.extraction.sec_sections import relevant_sections
+from app.core.storage_service import StorageService
 
 ALLOWED_EXTRACTION_CLASSES = {
     "Person",
@@ -29,72 +33,240 @@ ALLOWED_EXTRACTION_CLASSES = {
 class ExtractionService:
     """Run LangExtract and map outputs into FTM entities."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_storage: StorageService | None = None) -> None:
         if not settings.gemini_api_key:
             msg = "GEMINI_API_KEY is required for extraction"
             raise RuntimeError(msg)
         self.cleaning_service = CleaningService()
+        self.cache_storage = cache_storage
+        self.last_stats: dict[str, int] = {}
 
     @logfire.instrument("extract entities from document", extract_args=False)
-    def extract_entities(self, text: str, document_type: str) -> list[dict]:  # noqa: C901
+    def extract_entities(self, text: str, document_type: str) -> list[dict]:
         prompt = self._prompt_for(document_type)
         examples = self._examples()
+        segments = self._segments(text, document_type)
+        self.last_stats = {
+            "segments": len(segments),
+            "segment_chars": sum(len(segment) for _, segment in segments),
+            "cached_chunks": 0,
+            "model_texts": 0,
+            "model_chars": 0,
+            "model_chunks": 0,
+        }
 
-        result = lx.extract(
-            text_or_documents=text,
+        if self.cache_storage is None:
+            raw_extractions = self._extract_segments(segments, prompt, examples)
+        else:
+            raw_extractions = self._extract_with_cache(segments, prompt, examples)
+
+        entities: list[dict] = []
+        for extraction in raw_extractions:
+            entity = self._to_entity(extraction)
+            if entity is not None:
+                entities.append(entity)
+        return entities
+
+    @staticmethod
+    def _segments(text: str, document_type: str) -> list[tuple[int, str]]:
+        """Return the (offset, text) spans to extract; SEC filings keep only relevant items."""
+        if document_type != "sec_filing" or not settings.extract_sec_sections:
+            return [(0, text)]
+        segments = relevant_sections(text, settings.extract_sec_cover_chars)
+        logfire.info(
+            "sec filing sections selected",
+            sections=len(segments),
+            selected_chars=sum(len(segment) for _, segment in segments),
+            total_chars=len(text),
+        )
+        return segments
+
+    def _extract_segments(
+        self,
+        segments: list[tuple[int, str]],
+        prompt: str,
+        examples: list[object],
+    ) -> list[dict[str, object]]:
+        """Extract each segment as its own LangExtract document in a single batched call."""
+        if len(segments) == 1 and segments[0][0] == 0:
+            self._count_model_input([segments[0][1]])
+            return self._raw_extractions(self._run_model(segments[0][1], prompt, examples))
+        results = self._run_documents([segment for _, segment in segments], prompt, examples)
+        return [
+            extraction
+            for (offset, _), raw in zip(segments, results, strict=True)
+            for extraction in self._shift(raw, offset)
+        ]
+
+    def _extract_with_cache(
+        self,
+        segments: list[tuple[int, str]],
+        prompt: str,
+        examples: list[object],
+    ) -> list[dict[str, object]]:
+        """Send only chunks without a cached result to the model."""
+        cache = ExtractionCache(
+            cast("StorageService", self.cache_storage),
+            model_id=settings.extract_model_id,
+            prompt=prompt,
+            examples=[dataclasses.asdict(cast("Any", example)) for example in examples],
+            options={
+                "max_char_buffer": settings.extract_max_char_buffer,
+                "extraction_passes": settings.extract_passes,
+            },
+        )
+        chunks = [
+            (segment_offset + offset, chunk)
+            for segment_offset, segment in segments
+            for offset, chunk in split_chunks(segment, settings.extract_cache_chunk_chars)
+        ]
+        keys = [cache.cache_key(chunk) for _, chunk in chunks]
+        chunk_results: dict[int, list[dict[str, object]]] = {}
+        for index, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is not None:
+                chunk_results[index] = cached
+
+        misses = [index for index in range(len(chunks)) if index not in chunk_results]
+        self.last_stats["cached_chunks"] = len(chunk_results)
+        logfire.info(
+            "extraction cache lookup",
+            chunks=len(chunks),
+            cached=len(chunk_results),
+            uncached=len(misses),
+        )
+        # Cache each batch as it completes so a failed run only repeats unfinished chunks.
+        batch_size = max(settings.extract_batch_length, 1)
+        for batch_start in range(0, len(misses), batch_size):
+            batch = misses[batch_start : batch_start + batch_size]
+            results = self._run_documents([chunks[index][1] for index in batch], prompt, examples)
+            for index, raw in zip(batch, results, strict=True):
+                cache.put(keys[index], raw)
+                chunk_results[index] = raw
+
+        raw_extractions: list[dict[str, object]] = []
+        for index, (offset, _) in enumerate(chunks):
+            raw_extractions.extend(self._shift(chunk_results[index], offset))
+        return raw_extractions
+
+    def _run_documents(
+        self,
+        texts: list[str],
+        prompt: str,
+        examples: list[object],
+    ) -> list[list[dict[str, object]]]:
+        """Run several texts through one model call; LangExtract batches them across workers."""
+        self._count_model_input(texts)
+        documents = [
+            lx.data.Document(text=text, document_id=f"chunk-{index}")
+            for index, text in enumerate(texts)
+        ]
+        annotated = cast("list[object]", self._run_model(documents, prompt, examples))
+        by_document = {
+            str(getattr(document, "document_id", "")): document for document in annotated
+        }
+        return [
+            self._raw_extractions(by_document.get(f"chunk-{index}")) for index in range(len(texts))
+        ]
+
+    def _count_model_input(self, texts: list[str]) -> None:
+        """Record the texts, characters and LangExtract chunks sent to the model."""
+        buffer = max(settings.extract_max_char_buffer, 1)
+        self.last_stats["model_texts"] += len(texts)
+        self.last_stats["model_chars"] += sum(len(text) for text in texts)
+        self.last_stats["model_chunks"] += sum(-(-len(text) // buffer) for text in texts)
+
+    @staticmethod
+    def _shift(raw: list[dict[str, object]], offset: int) -> list[dict[str, object]]:
+        """Move span positions relative to a chunk or section back onto the full text."""
+        shifted_extractions: list[dict[str, object]] = []
+        for extraction in raw:
+            shifted = dict(extraction)
+            for bound in ("start", "end"):
+                position = shifted.get(bound)
+                if isinstance(position, int):
+                    shifted[bound] = position + offset
+            shifted_extractions.append(shifted)
+        return shifted_extractions
+
+    @staticmethod
+    def _run_model(
+        text_or_documents: str | list[lx.data.Document],
+        prompt: str,
+        examples: list[object],
+    ) -> object:
+        return lx.extract(
+            text_or_documents=text_or_documents,
             prompt_description=prompt,
             examples=examples,
             model_id=settings.extract_model_id,
             api_key=settings.gemini_api_key,
+            model_url=settings.extract_model_url or None,
+            max_char_buffer=settings.extract_max_char_buffer,
+            batch_length=settings.extract_batch_length,
+            max_workers=settings.extract_max_workers,
+            extraction_passes=settings.extract_passes,
         )
 
-        entities: list[dict] = []
-        for extraction in getattr(result, "extractions", []):
-            extraction_class = str(getattr(extraction, "extraction_class", "")).strip()
-            extraction_text = str(getattr(extraction, "extraction_text", "")).strip()
-            attributes = getattr(extraction, "attributes", {}) or {}
+    @staticmethod
+    def _raw_extractions(result: object) -> list[dict[str, object]]:
+        """Flatten LangExtract extractions into JSON-serialisable records."""
+        raw: list[dict[str, object]] = []
+        for extraction in getattr(result, "extractions", None) or []:
             char_interval = getattr(extraction, "char_interval", None)
-            confidence = getattr(extraction, "confidence", None)
+            raw.append(
+                {
+                    "extraction_class": str(getattr(extraction, "extraction_class", "")).strip(),
+                    "extraction_text": str(getattr(extraction, "extraction_text", "")).strip(),
+                    "attributes": dict(getattr(extraction, "attributes", {}) or {}),
+                    "start": getattr(char_interval, "start_pos", None),
+                    "end": getattr(char_interval, "end_pos", None),
+                    "confidence": getattr(extraction, "confidence", None),
+                }
+            )
+        return raw
+
+    def _to_entity(self, extraction: dict[str, object]) -> dict | None:
+        extraction_class = str(extraction.get("extraction_class", ""))
+        extraction_text = str(extraction.get("extraction_text", ""))
+        attributes = cast("dict[str, object]", extraction.get("attributes") or {})
+        confidence = extraction.get("confidence")
 
-            if extraction_class not in ALLOWED_EXTRACTION_CLASSES:
+        if extraction_class not in ALLOWED_EXTRACTION_CLASSES:
+            return None
+        schema = extraction_class
+
+        properties: dict[str, list[str]] = {}
+        for key, value in attributes.items():
+            if value is None:
                 continue
-            schema = extraction_class
-
-            properties: dict[str, list[str]] = {}
-            for key, value in attributes.items():
-                if value is None:
-                    continue
-                if isinstance(value, list):
-                    properties[key] = [str(item) for item in value]
-                else:
-                    properties[key] = [str(value)]
-
-            if confidence is not None:
-                properties["confidence"] = [str(confidence)]
-
-            if char_interval is not None:
-                start = getattr(char_interval, "start_pos", None)
-                end = getattr(char_interval, "end_pos", None)
-                if start is not None:
-                    properties["charStart"] = [str(start)]
-                if end is not None:
-                    properties["charEnd"] = [str(end)]
-
-            if extraction_text and "name" not in properties:
-                properties["name"] = [extraction_text]
-
-            if properties:
-                cleaned_properties = self.cleaning_service.clean_properties(
-                    cast("dict[str, object]", properties)
-                )
-                entities.append(
-                    {
-                        "schema": schema,
-                        "properties": cleaned_properties,
-                    }
-                )
+            if isinstance(value, list):
+                properties[key] = [str(item) for item in value]
+            else:
+                properties[key] = [str(value)]
 
-        return entities
+        if confidence is not None:
+            properties["confidence"] = [str(confidence)]
+
+        start = extraction.get("start")
+        end = extraction.get("end")
+        if start is not None:
+            properties["charStart"] = [str(start)]
+        if end is not None:
+            properties["charEnd"] = [str(end)]
+
+        if extraction_text and "name" not in properties:
+            properties["name"] = [extraction_text]
+
+        if not properties:
+            return None
+        cleaned_properties = self.cleaning_service.clean_properties(
+            cast("dict[str, object]", properties)
+        )
+        return {
+            "schema": schema,
+            "properties": cleaned_properties,
+        }
 
     @staticmethod
     def _prompt_for(document_type: str) -> str:
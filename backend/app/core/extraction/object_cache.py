@@ -0,0 +1,78 @@
+"""JSON payload cache backed by the shared object-storage cache bucket."""
+
+from __future__ import annotations
+
+import json
+from threading import Lock
+from typing import TYPE_CHECKING, ClassVar
+
+import logfire
+from botocore.exceptions import BotoCoreError, ClientError
+
+if TYPE_CHECKING:
+    from app.core.storage_service import StorageService
+
+
+class JsonObjectCache:
+    """Read and write JSON payloads by key, tracking hit/miss counts per subclass."""
+
+    label: ClassVar[str] = "object cache"
+    _stats_lock: ClassVar[Lock] = Lock()
+    _stats: ClassVar[dict[str, int]] = {"hits": 0, "misses": 0}
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._stats_lock = Lock()
+        cls._stats = {"hits": 0, "misses": 0}
+
+    def __init__(self, storage: StorageService) -> None:
+        self.storage = storage
+
+    def get(self, key: str) -> object | None:
+        try:
+            raw = self.storage.get_cached_object(key)
+        except (BotoCoreError, ClientError) as exc:
+            logfire.warn(f"{self.label} read failed", key=key, error=str(exc))
+            raw = None
+
+        payload: object | None = None
+        if raw is not None:
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                payload = None
+        self._record(hit=payload is not None)
+        return payload
+
+    def contains(self, key: str) -> bool:
+        """Return whether a payload exists, without reading it or counting a hit/miss."""
+        try:
+            return self.storage.has_cached_object(key)
+        except (BotoCoreError, ClientError) as exc:
+            logfire.warn(f"{self.label} lookup failed", key=key, error=str(exc))
+            return False
+
+    def put(self, key: str, payload: object) -> None:
+        content = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        try:
+            self.storage.put_cached_object(key, content, "application/json")
+        except (BotoCoreError, ClientError) as exc:
+            logfire.warn(f"{self.label} write failed", key=key, error=str(exc))
+
+    @classmethod
+    def _record(cls, *, hit: bool) -> None:
+        with cls._stats_lock:
+            cls._stats["hits" if hit else "misses"] += 1
+
+    @classmethod
+    def stats(cls) -> dict[str, float]:
+        """Return process-wide hit/miss counts and hit rate."""
+        with cls._stats_lock:
+            hits = cls._stats["hits"]
+            misses = cls._stats["misses"]
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
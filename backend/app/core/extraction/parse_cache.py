@@ -0,0 +1,48 @@
+"""Content-addressed cache for parsed documents in object storage."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from app.core.extraction.object_cache import JsonObjectCache
+
+if TYPE_CHECKING:
+    from app.core.storage_service import StorageService
+
+# Bump when the cached payload shape or parsing options change.
+PARSE_CACHE_FORMAT = 1
+
+
+def parser_version() -> str:
+    """Return the Kreuzberg version that produced cached parses."""
+    try:
+        return metadata.version("kreuzberg")
+    except metadata.PackageNotFoundError:  # pragma: no cover - dependency/runtime concern
+        return "unknown"
+
+
+class ParseCache(JsonObjectCache):
+    """Reuse Kreuzberg output for byte-identical documents across investigations."""
+
+    label: ClassVar[str] = "parse cache"
+
+    def __init__(self, storage: StorageService) -> None:
+        super().__init__(storage)
+        self.version = f"{parser_version()}-{PARSE_CACHE_FORMAT}"
+
+    def cache_key(self, content: bytes | Path, mime_type: str) -> str:
+        if isinstance(content, Path):
+            with content.open("rb") as file:
+                digest = hashlib.file_digest(file, "sha256").hexdigest()
+        else:
+            digest = hashlib.sha256(content).hexdigest()
+        mime_slug = re.sub(r"[^a-z0-9.+-]", "_", mime_type.lower())
+        return f"parsed/{self.version}/{digest}/{mime_slug}.json"
+
+    def get(self, key: str) -> dict[str, object] | None:
+        parsed = super().get(key)
+        return parsed if isinstance(parsed, dict) else None
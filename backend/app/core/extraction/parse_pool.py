@@ -0,0 +1,130 @@
+"""Size-bounded process pool for CPU-bound Kreuzberg parsing."""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from threading import Lock
+from typing import ClassVar
+
+import logfire
+
+from app.config import settings
+from app.core.extraction.document_service import parse_bytes, parse_file
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - platform concern (Windows)
+    resource = None
+
+
+def _limit_worker_memory(limit_bytes: int) -> None:
+    """Cap the worker's address space so a pathological document fails instead of swapping."""
+    if resource is None or limit_bytes <= 0:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit_bytes = min(limit_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+
+
+class ParsePool:
+    """Run Kreuzberg in worker processes with per-document timeouts and memory limits."""
+
+    _lock = Lock()
+    _shared: ClassVar[ParsePool | None] = None
+
+    def __init__(
+        self,
+        max_workers: int,
+        timeout_seconds: float,
+        memory_limit_mb: int = 0,
+        max_tasks_per_child: int | None = None,
+    ) -> None:
+        self.max_workers = max(max_workers, 1)
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_bytes = max(memory_limit_mb, 0) * 1024 * 1024
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self._executor_lock = Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    @classmethod
+    def shared(cls) -> ParsePool:
+        """Return the process-wide pool configured from settings."""
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls(
+                        max_workers=settings.parse_pool_workers,
+                        timeout_seconds=settings.parse_timeout_seconds,
+                        memory_limit_mb=settings.parse_memory_limit_mb,
+                        max_tasks_per_child=settings.parse_pool_max_tasks_per_child,
+                    )
+        return cls._shared
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # Spawned workers do not inherit DBOS, boto3 or logfire threads from the parent.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_limit_worker_memory,
+                    initargs=(self.memory_limit_bytes,),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool whose worker hung or died; the next parse starts a fresh one."""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor cannot cancel a running task, so stop its workers directly.
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @logfire.instrument("parse document in worker process", extract_args=False)
+    def parse(self, content: bytes | Path, mime_type: str) -> dict[str, object]:
+        """Parse in a worker; paths are passed by name so large files are not pickled."""
+        executor = self._get_executor()
+        try:
+            return self._parse_with(executor, content, mime_type)
+        except BrokenProcessPool:
+            if self._executor is executor:
+                raise
+        # Another parse timed out and recycled the pool under this one; retry once.
+        return self._parse_with(self._get_executor(), content, mime_type)
+
+    def _parse_with(
+        self, executor: ProcessPoolExecutor, content: bytes | Path, mime_type: str
+    ) -> dict[str, object]:
+        if isinstance(content, Path):
+            future = executor.submit(parse_file, str(content), mime_type)
+        else:
+            future = executor.submit(parse_bytes, content, mime_type)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError as exc:
+            self._discard_executor(executor)
+            msg = f"Document parsing timed out after {self.timeout_seconds:g}s"
+            raise RuntimeError(msg) from exc
+        except BrokenProcessPool:
+            if self._executor is not executor:
+                raise
+            self._discard_executor(executor)
+            msg = "Document parser process crashed (possibly exceeding its memory limit)"
+            raise RuntimeError(msg) from None
+        except MemoryError as exc:
+            msg = f"Document parsing exceeded the {self.memory_limit_bytes // 2**20} MB limit"
+            raise RuntimeError(msg) from exc
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,59 @@
+"""Split large PDFs into page ranges that can be parsed independently."""
+
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.errors import PdfReadError
+except ImportError:  # pragma: no cover - dependency/runtime concern
+    PdfReader = None
+    PdfWriter = None
+    PdfReadError = ValueError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+PDF_MIME_TYPE = "application/pdf"
+
+
+def page_ranges(page_count: int, range_size: int) -> list[tuple[int, int]]:
+    """Return 1-based inclusive (first, last) page ranges covering the document."""
+    range_size = max(range_size, 1)
+    return [
+        (first, min(first + range_size - 1, page_count))
+        for first in range(1, page_count + 1, range_size)
+    ]
+
+
+def split_pdf(
+    content: bytes | Path,
+    min_pages: int,
+    range_size: int,
+) -> Iterator[tuple[int, int, bytes]]:
+    """Yield (first, last, bytes) ranges one at a time; yields nothing when it should parse whole.
+
+    Only one range is written out at a time, so callers that store each range before taking
+    the next never hold more than one range's bytes in memory.
+    """
+    if PdfReader is None or PdfWriter is None:
+        return
+    try:
+        reader = PdfReader(content if isinstance(content, Path) else BytesIO(content))
+        page_count = len(reader.pages)
+    except (PdfReadError, ValueError, OSError):
+        # Encrypted or damaged files are left to Kreuzberg, which reports its own errors.
+        return
+    if page_count < max(min_pages, 1) or page_count <= range_size:
+        return
+
+    for first, last in page_ranges(page_count, range_size):
+        writer = PdfWriter()
+        for index in range(first - 1, last):
+            writer.add_page(reader.pages[index])
+        buffer = BytesIO()
+        writer.write(buffer)
+        yield first, last, buffer.getvalue()
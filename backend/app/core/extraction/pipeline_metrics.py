@@ -0,0 +1,99 @@
+"""Per-stage timing and throughput metrics for the document extraction pipeline."""
+
+from __future__ import annotations
+
+from statistics import fmean, median
+from typing import cast
+
+STAGES = ("download", "parse", "extract", "persist")
+
+
+def stage_metrics(seconds: float, **sizes: int | bool | None) -> dict[str, object]:
+    """Return one stage record, with a per-second rate for every integer size measured."""
+    record: dict[str, object] = {"seconds": round(seconds, 4)}
+    for name, value in sizes.items():
+        if value is None:
+            continue
+        record[name] = value
+        if isinstance(value, int) and not isinstance(value, bool) and seconds > 0:
+            record[f"{name}_per_second"] = round(value / seconds, 2)
+    return record
+
+
+def workflow_metrics(
+    stages: dict[str, dict[str, object]],
+    queue_wait: dict[str, float] | None = None,
+) -> dict[str, object]:
+    """Combine stage records into the metrics attached to a workflow result."""
+    total = sum(float(cast("float", stage.get("seconds", 0.0))) for stage in stages.values())
+    return {
+        "stages": stages,
+        "queue_wait_seconds": queue_wait or {},
+        "total_seconds": round(total, 4),
+    }
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(round(fraction * (len(ordered) - 1)), len(ordered) - 1)
+    return ordered[index]
+
+
+def _distribution(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    return {
+        "mean": round(fmean(values), 4),
+        "p50": round(median(values), 4),
+        "p95": round(_percentile(values, 0.95), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def summarize(metrics: list[dict[str, object]]) -> dict[str, object]:
+    """Aggregate workflow metrics: latency distributions, total sizes and overall throughput.
+
+    Throughput is total size over total stage time, so the stage with the largest share of
+    time is reported as the bottleneck.
+    """
+    stages: dict[str, dict[str, object]] = {}
+    stage_seconds: dict[str, float] = {}
+    for name in STAGES:
+        records = [
+            cast("dict[str, object]", cast("dict", item.get("stages", {}))[name])
+            for item in metrics
+            if name in cast("dict", item.get("stages", {}))
+        ]
+        if not records:
+            continue
+        seconds = [float(cast("float", record.get("seconds", 0.0))) for record in records]
+        stage_seconds[name] = sum(seconds)
+        totals: dict[str, object] = {}
+        for record in records:
+            for key, value in record.items():
+                if key == "seconds" or key.endswith("_per_second"):
+                    continue
+                if isinstance(value, int) and not isinstance(value, bool):
+                    totals[key] = cast("int", totals.get(key, 0)) + value
+        summary: dict[str, object] = {"count": len(records), "seconds": _distribution(seconds)}
+        summary["totals"] = totals
+        summary["throughput_per_second"] = {
+            key: round(cast("int", value) / stage_seconds[name], 2)
+            for key, value in totals.items()
+            if stage_seconds[name] > 0
+        }
+        stages[name] = summary
+
+    waits: dict[str, list[float]] = {}
+    for item in metrics:
+        for queue, seconds in cast("dict[str, float]", item.get("queue_wait_seconds", {})).items():
+            waits.setdefault(queue, []).append(float(seconds))
+
+    return {
+        "workflows": len(metrics),
+        "stages": stages,
+        "queue_wait_seconds": {queue: _distribution(values) for queue, values in waits.items()},
+        "bottleneck": max(stage_seconds, key=lambda name: stage_seconds[name])
+        if stage_seconds
+        else None,
+    }
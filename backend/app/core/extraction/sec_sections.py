@@ -0,0 +1,93 @@
+"""Split SEC filing text into items and keep the sections that name people and owners."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+FORM_PATTERN = re.compile(r"FORM\s+(10-K|10-Q|8-K)\b", re.IGNORECASE)
+ITEM_HEADING = re.compile(
+    r"^[ \t]*ITEM[ \t]+(\d{1,2}(?:\.\d{2}|[A-C])?)\b[ \t]*[.:\-\u2013\u2014]?[ \t]*(.*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Only whole-line exhibit headings start a section; the "Exhibit 21.1 ..." rows of an
+# exhibit index stay inside it.
+EXHIBIT_HEADING = re.compile(
+    r"^[ \t]*(EXHIBIT[ \t]+INDEX|INDEX[ \t]+TO[ \t]+EXHIBITS|EXHIBITS)[ \t]*[.:]?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Items that identify directors, officers, owners, related parties and subsidiaries.
+RELEVANT_ITEMS = {
+    # Directors and officers, security ownership, related transactions, exhibits (subsidiaries).
+    "10-K": {"10", "12", "13", "15"},
+    # Other information (director/officer trading plans) and exhibits.
+    "10-Q": {"5", "6"},
+    # Material agreements, acquisitions, changes in control, director/officer changes, exhibits.
+    "8-K": {"1.01", "2.01", "5.01", "5.02", "9.01"},
+}
+EXHIBITS = "exhibits"
+COVER = "cover"
+
+
+@dataclass(slots=True)
+class SecSection:
+    item: str
+    title: str
+    start: int
+    end: int
+
+
+def filing_form(text: str) -> str | None:
+    """Return the form type named near the top of the filing, if any."""
+    match = FORM_PATTERN.search(text[:10000])
+    return match.group(1).upper() if match else None
+
+
+def split_sections(text: str) -> list[SecSection]:
+    """Split filing text at item and exhibit headings, keeping the longest copy of each item.
+
+    Filings repeat every heading in the table of contents; those copies are short because the
+    next heading follows immediately, so the body is the longest occurrence.
+    """
+    headings: list[tuple[int, str, str]] = [
+        (match.start(), match.group(1).upper().rstrip("."), match.group(2).strip())
+        for match in ITEM_HEADING.finditer(text)
+    ]
+    headings.extend(
+        (match.start(), EXHIBITS, match.group(1).strip())
+        for match in EXHIBIT_HEADING.finditer(text)
+    )
+    headings.sort()
+
+    sections: dict[str, SecSection] = {}
+    if headings and headings[0][0] > 0:
+        sections[COVER] = SecSection(COVER, "", 0, headings[0][0])
+    for index, (start, item, title) in enumerate(headings):
+        end = headings[index + 1][0] if index + 1 < len(headings) else len(text)
+        current = sections.get(item)
+        if current is None or end - start > current.end - current.start:
+            sections[item] = SecSection(item, title, start, end)
+    return sorted(sections.values(), key=lambda section: section.start)
+
+
+def relevant_sections(text: str, cover_chars: int = 2000) -> list[tuple[int, str]]:
+    """Return (offset, text) for sections worth sending to extraction, or the whole text.
+
+    The cover page is kept (truncated) because it names the issuer. When no relevant item is
+    found the filing is returned whole, so unusual layouts are never silently skipped.
+    """
+    form = filing_form(text)
+    wanted = RELEVANT_ITEMS.get(form or "") or set().union(*RELEVANT_ITEMS.values())
+    selected: list[tuple[int, str]] = []
+    found_item = False
+    for section in split_sections(text):
+        if section.item == COVER:
+            end = min(section.end, section.start + cover_chars)
+            selected.append((section.start, text[section.start : end]))
+        elif section.item in wanted or section.item == EXHIBITS:
+            found_item = True
+            selected.append((section.start, text[section.start : section.end]))
+    if not found_item:
+        return [(0, text)]
+    return [(offset, chunk) for offset, chunk in selected if chunk.strip()]
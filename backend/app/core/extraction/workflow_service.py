@@ -2,22 +2,41 @@
 
 from __future__ import annotations
 
+import shutil
+from collections import Counter
+from contextlib import closing, contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from tempfile import NamedTemporaryFile
 from threading import Lock
-from typing import Any, Protocol, cast
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Protocol, cast
 from uuid import uuid4
 
 import logfire
-from dbos import DBOS
+from dbos import DBOS, DBOSClient, EnqueueOptions, Queue, SetEnqueueOptions, SetWorkflowID
+from dbos._error import DBOSException
 
 from app.config import settings
 from app.core.entity_service import EntityService
+from app.core.extraction.consolidation import consolidate_entities
 from app.core.extraction.document_service import DocumentService
 from app.core.extraction.extraction_service import ExtractionService
+from app.core.extraction.parse_cache import ParseCache
+from app.core.extraction.parse_pool import ParsePool
+from app.core.extraction.pdf_pages import PDF_MIME_TYPE
+from app.core.extraction.pipeline_metrics import stage_metrics, summarize, workflow_metrics
 from app.core.ftm_service import FTMService
 from app.core.graph_service import GraphService
-from app.core.storage_service import StorageService
+from app.core.match_keys import MATCH_FOLDED, MATCH_NAME, folded_key, name_key
+from app.core.storage_service import STREAM_CHUNK_BYTES, StorageService
 from app.models.entity import EntityCreate, EntityUpdate
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from dbos._queue import QueueRateLimit
+
 
 class QueryResultProtocol(Protocol):
     result_set: list[list[object]]
@@ -29,6 +48,38 @@ class GraphProtocol(Protocol):
 
 DBOS_STATE = {"launched": False}
 DBOS_INIT_LOCK = Lock()
+# Workflows scanned per page when looking for one investigation's results.
+METRICS_PAGE_SIZE = 500
+
+
+def _llm_rate_limit() -> QueueRateLimit | None:
+    if settings.extraction_llm_rate_limit <= 0:
+        return None
+    return {
+        "limit": settings.extraction_llm_rate_limit,
+        "period": settings.extraction_llm_rate_period,
+    }
+
+
+# Uploads are admitted per investigation, so one large batch cannot starve the others.
+INVESTIGATION_QUEUE = Queue(
+    "extraction_investigations",
+    concurrency=settings.extraction_investigation_concurrency,
+    partition_queue=True,
+)
+# Parsing and LLM extraction are bounded per worker process and rate limited globally.
+EXTRACTION_QUEUE = Queue(
+    "extraction_workers",
+    limiter=_llm_rate_limit(),
+    worker_concurrency=settings.extraction_worker_concurrency,
+)
+# A bulk upload is handed over as one fan-out workflow that enqueues each of its documents.
+BATCH_QUEUE = Queue("extraction_batches")
+# Page ranges of large PDFs are parsed in parallel, up to the parse pool size per worker.
+PARSE_QUEUE = Queue(
+    "document_parse_ranges",
+    worker_concurrency=max(settings.parse_pool_workers, 1),
+)
 RELATION_ENDPOINT_CANDIDATES: dict[str, list[tuple[str, str]]] = {
     "Ownership": [("owner", "asset")],
     "Directorship": [("director", "organization")],
@@ -51,102 +102,294 @@ def _sanitize_relation(schema: str) -> str:
     return cleaned
 
 
-def _resolve_entity_ref(graph: GraphProtocol, ref: str, name_to_id: dict[str, str]) -> str | None:
-    token = ref.strip()
-    if not token:
-        return None
-
-    mapped = name_to_id.get(token.casefold())
-    if mapped:
-        return mapped
-
-    by_id = graph.query(
-        "MATCH (n:Entity {id: $entity_id}) RETURN n.id LIMIT 1",
-        params={"entity_id": token},
-    ).result_set
-    if by_id:
-        return str(by_id[0][0])
-
-    by_name = graph.query(
-        "MATCH (n:Entity) "
-        "WHERE any(name IN coalesce(n._name, []) WHERE toLower(name) = toLower($name)) "
-        "RETURN n.id LIMIT 1",
-        params={"name": token},
-    ).result_set
-    if by_name:
-        resolved = str(by_name[0][0])
-        name_to_id[token.casefold()] = resolved
+def _resolve_entity_refs(
+    graph: GraphProtocol,
+    refs: list[str],
+    name_to_id: dict[str, str],
+) -> dict[str, str]:
+    """Resolve endpoint refs from the in-memory name map, then one bulk graph lookup.
+
+    A ref matches an entity id first, then a normalised name, then an accent- and
+    punctuation-folded name, mirroring the single-ref lookup order used by ingestion.
+    """
+    resolved: dict[str, str] = {}
+    pending: list[dict[str, str]] = []
+    for ref in dict.fromkeys(ref.strip() for ref in refs):
+        if not ref:
+            continue
+        mapped = name_to_id.get(name_key(ref))
+        if mapped:
+            resolved[ref] = mapped
+        else:
+            pending.append({"ref": ref, "name": name_key(ref), "folded": folded_key(ref)})
+    if not pending:
         return resolved
 
-    return None
-
-
-def _create_edge(  # noqa: PLR0913
-    graph: GraphProtocol,
-    edge_id: str,
-    schema: str,
-    source: str,
-    target: str,
-    properties: dict[str, list[str]],
-    proof_document_id: str | None = None,
-) -> bool:
-    db_properties = {f"_{key}": values for key, values in properties.items()}
-    if proof_document_id and "proof" not in properties:
-        db_properties["_proof"] = [proof_document_id]
-    relation = _sanitize_relation(schema)
-    result = graph.query(
-        "MATCH (a:Entity {id: $source}), (b:Entity {id: $target}) "
-        f"MERGE (a)-[r:{relation} {{id: $edge_id}}]->(b) "
-        "SET r.schema = $schema "
-        "SET r += $properties "
-        "RETURN r",
-        params={
-            "source": source,
-            "target": target,
-            "edge_id": edge_id,
-            "schema": schema,
-            "properties": db_properties,
-        },
+    rows = graph.query(
+        "UNWIND $refs AS ref MATCH (n:Entity {id: ref.ref}) "
+        "RETURN ref.ref AS ref, n.id AS id, 0 AS rank "
+        "UNION ALL "
+        f"UNWIND $refs AS ref MATCH (n:Entity) WHERE ref.name IN n.{MATCH_NAME} "
+        "RETURN ref.ref AS ref, n.id AS id, 1 AS rank "
+        "UNION ALL "
+        f"UNWIND $refs AS ref MATCH (n:Entity) WHERE ref.folded IN n.{MATCH_FOLDED} "
+        "RETURN ref.ref AS ref, n.id AS id, 2 AS rank",
+        params={"refs": pending},
     ).result_set
-    return bool(result)
+    best: dict[str, tuple[int, str]] = {}
+    for ref, entity_id, rank in rows:
+        current = best.get(str(ref))
+        if current is None or int(cast("int", rank)) < current[0]:
+            best[str(ref)] = (int(cast("int", rank)), str(entity_id))
+    for ref, (_, entity_id) in best.items():
+        resolved[ref] = entity_id
+        name_to_id.setdefault(name_key(ref), entity_id)
+    return resolved
+
+
+def _create_edges(graph: GraphProtocol, rows: list[dict[str, object]]) -> set[str]:
+    """Write edges with one UNWIND query per relation type and return the created edge ids."""
+    by_relation: dict[str, list[dict[str, object]]] = {}
+    for row in rows:
+        by_relation.setdefault(_sanitize_relation(str(row["schema"])), []).append(row)
+
+    created: set[str] = set()
+    for relation, relation_rows in by_relation.items():
+        result = graph.query(
+            "UNWIND $rows AS row "
+            "MATCH (a:Entity {id: row.source}), (b:Entity {id: row.target}) "
+            f"MERGE (a)-[r:{relation} {{id: row.edge_id}}]->(b) "
+            "SET r.schema = row.schema "
+            "SET r += row.properties "
+            "RETURN row.edge_id",
+            params={"rows": relation_rows},
+        ).result_set
+        created.update(str(row[0]) for row in result)
+    return created
 
 
 def _entity_service() -> EntityService:
     return EntityService(graph_service=GraphService(), ftm_service=FTMService())
 
 
+def _parsed_ref(
+    storage: StorageService,
+    investigation_id: str,
+    document_id: str,
+    parsed: dict[str, object],
+    size_bytes: int,
+) -> dict:
+    cache_hit = parsed.pop("cache_hit", False)
+    parsed_key = storage.put_json(
+        investigation_id,
+        storage.derived_key(document_id, "parsed"),
+        parsed,
+    )
+    return {
+        "parsed_key": parsed_key,
+        "mime_type": parsed["mime_type"],
+        "document_type": parsed["document_type"],
+        "size_bytes": size_bytes,
+        "content_chars": len(str(parsed["content"])),
+        "parse_cache": {"hit": cache_hit, **ParseCache.stats()},
+    }
+
+
+def _document_service(storage: StorageService) -> DocumentService:
+    parse_cache = ParseCache(storage) if settings.parse_cache_enabled else None
+    parse_pool = ParsePool.shared() if settings.parse_pool_workers > 0 else None
+    return DocumentService(parse_cache=parse_cache, parse_pool=parse_pool)
+
+
+@contextmanager
+def _downloaded(
+    storage: StorageService,
+    investigation_id: str,
+    storage_key: str,
+) -> Iterator[tuple[bytes | Path, int]]:
+    """Yield a document's bytes and size, streaming large documents to a temporary file.
+
+    Documents of ``PARSE_STREAM_THRESHOLD_MB`` or more are copied chunk by chunk to disk and
+    yielded as a path, so neither the worker nor the parser process holds them in memory.
+    """
+    response = storage.open_object(investigation_id, storage_key)
+    size = int(response.get("ContentLength", 0))
+    with closing(response["Body"]) as body:
+        if size < settings.parse_stream_threshold_mb * 1024 * 1024:
+            yield body.read(), size
+            return
+        with NamedTemporaryFile(suffix=Path(storage_key).suffix) as file:
+            shutil.copyfileobj(body, file, STREAM_CHUNK_BYTES)
+            file.flush()
+            yield Path(file.name), size
+
+
 @DBOS.step()
-def download_document_step(investigation_id: str, storage_key: str) -> bytes:
-    """Step 1: Download object bytes from RustFS/S3."""
+def parse_document_step(
+    investigation_id: str,
+    document_id: str,
+    storage_key: str,
+    filename: str,
+    content_type: str | None,
+) -> dict:
+    """Step 1: Parse the document, or split a large PDF into page ranges parsed separately."""
     storage = StorageService()
-    return storage.download_bytes(investigation_id, storage_key)
+    started = perf_counter()
+    with _downloaded(storage, investigation_id, storage_key) as (content, size_bytes):
+        download = stage_metrics(
+            perf_counter() - started,
+            bytes=size_bytes,
+            streamed=isinstance(content, Path),
+        )
+        started = perf_counter()
+        parser = _document_service(storage)
+
+        # Each range is stored before the next is written, bounding memory to one range.
+        page_ranges = []
+        for first, last, range_bytes in parser.split_pages(
+            content,
+            filename,
+            content_type,
+            min_pages=settings.parse_split_min_pages,
+            range_size=settings.parse_page_range_size,
+        ):
+            key = f"{document_id}/_derived/pages-{first:05d}-{last:05d}.pdf"
+            storage.upload_derived_bytes(investigation_id, key, range_bytes, PDF_MIME_TYPE)
+            page_ranges.append({"key": key, "first_page": first, "last_page": last})
+        if page_ranges:
+            parse_cache = parser.parse_cache
+            return {
+                "page_ranges": page_ranges,
+                "size_bytes": size_bytes,
+                "parse_cache_key": (
+                    parse_cache.cache_key(content, PDF_MIME_TYPE)
+                    if parse_cache is not None
+                    else None
+                ),
+                "metrics": {
+                    "download": download,
+                    "parse": stage_metrics(perf_counter() - started, bytes=size_bytes),
+                },
+            }
+
+        parsed = parser.extract(content=content, filename=filename, content_type=content_type)
+    parsed_ref = _parsed_ref(storage, investigation_id, document_id, parsed, size_bytes)
+    parsed_ref["metrics"] = {
+        "download": download,
+        "parse": stage_metrics(
+            perf_counter() - started,
+            bytes=size_bytes,
+            chars=parsed_ref["content_chars"],
+        ),
+    }
+    return parsed_ref
+
+
+@DBOS.step()
+def parse_page_range_step(investigation_id: str, filename: str, page_range: dict) -> dict:
+    """Parse one page range of a split PDF and store its text next to the range."""
+    started = perf_counter()
+    storage = StorageService()
+    key = str(page_range["key"])
+    content = storage.download_bytes(investigation_id, key)
+    parsed = _document_service(storage).extract(content, filename, PDF_MIME_TYPE)
+    parsed_key = storage.put_json(investigation_id, key.removesuffix(".pdf") + ".json", parsed)
+    return {**page_range, "parsed_key": parsed_key, "seconds": perf_counter() - started}
+
+
+@DBOS.workflow()
+def parse_page_range_workflow(investigation_id: str, filename: str, page_range: dict) -> dict:
+    """Checkpoint a single page range so a crash only re-parses unfinished ranges."""
+    return parse_page_range_step(investigation_id, filename, page_range)
 
 
 @DBOS.step()
-def parse_document_step(content: bytes, filename: str, content_type: str | None) -> dict:
-    """Step 2: Parse document with Kreuzberg."""
-    parser = DocumentService()
-    return parser.extract(content=content, filename=filename, content_type=content_type)
+def join_page_ranges_step(
+    investigation_id: str,
+    document_id: str,
+    filename: str,
+    split_ref: dict,
+    range_refs: list[dict],
+) -> dict:
+    """Join parsed page ranges in page order into the document's parsed output.
+
+    Ranges are parsed in parallel, so the parse stage counts the slowest range, not their sum.
+    """
+    started = perf_counter()
+    storage = StorageService()
+    ordered = sorted(range_refs, key=lambda ref: int(ref["first_page"]))
+    parts = [
+        cast("dict[str, object]", storage.get_json(investigation_id, str(ref["parsed_key"])))
+        for ref in ordered
+    ]
+    parsed = _document_service(storage).join_pages(
+        parts,
+        filename,
+        cache_key=split_ref.get("parse_cache_key"),
+    )
+    parsed_ref = _parsed_ref(
+        storage,
+        investigation_id,
+        document_id,
+        parsed,
+        int(split_ref["size_bytes"]),
+    )
+    parsed_ref["page_ranges"] = len(ordered)
+    split_metrics = cast("dict[str, dict]", split_ref.get("metrics") or {})
+    split_seconds = float(split_metrics.get("parse", {}).get("seconds", 0.0))
+    slowest_range = max((float(ref.get("seconds", 0.0)) for ref in ordered), default=0.0)
+    parsed_ref["metrics"] = {
+        "download": split_metrics.get("download", {}),
+        "parse": stage_metrics(
+            split_seconds + slowest_range + perf_counter() - started,
+            bytes=int(split_ref["size_bytes"]),
+            chars=parsed_ref["content_chars"],
+            pages=int(ordered[-1]["last_page"]) if ordered else None,
+            page_ranges=len(ordered),
+        ),
+    }
+    return parsed_ref
 
 
 @DBOS.step()
-def extract_entities_step(parsed: dict) -> list[dict]:
-    """Step 3: Extract entities via LangExtract + Gemini."""
-    extractor = ExtractionService()
-    return extractor.extract_entities(parsed["content"], parsed["document_type"])
+def extract_entities_step(investigation_id: str, document_id: str, parsed_ref: dict) -> dict:
+    """Step 2: Extract entities via LangExtract + Gemini, reusing cached chunk results."""
+    started = perf_counter()
+    storage = StorageService()
+    parsed = cast("dict", storage.get_json(investigation_id, str(parsed_ref["parsed_key"])))
+    cache_storage = storage if settings.extract_cache_enabled else None
+    extractor = ExtractionService(cache_storage=cache_storage)
+    entities = extractor.extract_entities(parsed["content"], parsed["document_type"])
+    entities_key = storage.put_json(
+        investigation_id,
+        storage.derived_key(document_id, "entities"),
+        entities,
+    )
+    return {
+        "entities_key": entities_key,
+        "entity_count": len(entities),
+        "metrics": stage_metrics(
+            perf_counter() - started,
+            chars=len(parsed["content"]),
+            entities=len(entities),
+            **extractor.last_stats,
+        ),
+    }
 
 
 @DBOS.step()
 def persist_entities_step(  # noqa: C901, PLR0912, PLR0915
     payload: dict[str, object],
 ) -> dict:
-    """Step 4: Persist parsed document and extracted entities."""
+    """Step 3: Persist the stored parse and extracted entities into the graph."""
+    started = perf_counter()
     investigation_id = str(payload.get("investigation_id", ""))
     document_id = str(payload.get("document_id", ""))
     storage_key = str(payload.get("storage_key", ""))
     filename = str(payload.get("filename", ""))
-    parsed = payload.get("parsed")
-    entities = payload.get("entities")
+    storage = StorageService()
+    parsed = storage.get_json(investigation_id, str(payload.get("parsed_key", "")))
+    entities = storage.get_json(investigation_id, str(payload.get("entities_key", "")))
     if not isinstance(parsed, dict):
         return {
             "processed": 0,
@@ -164,8 +407,10 @@ def persist_entities_step(  # noqa: C901, PLR0912, PLR0915
             "document_id": document_id,
         }
 
+    mentions = len(entities)
+    entities = consolidate_entities(entities, RELATION_ENDPOINT_CANDIDATES)
+
     entity_service = _entity_service()
-    storage = StorageService()
     graph = cast(
         "GraphProtocol",
         entity_service.graph_service.create_investigation_graph(investigation_id),
@@ -192,11 +437,7 @@ def persist_entities_step(  # noqa: C901, PLR0912, PLR0915
         EntityUpdate(properties=merged_properties),
     )
 
-    nodes_created = 0
-    edges_created = 0
     errors: list[str] = []
-    name_to_id: dict[str, str] = {}
-
     node_candidates: list[dict] = []
     relation_candidates: list[dict] = []
     for candidate in entities:
@@ -208,49 +449,56 @@ def persist_entities_step(  # noqa: C901, PLR0912, PLR0915
         else:
             node_candidates.append(candidate)
 
+    payloads: list[EntityCreate] = []
+    payload_numbers: list[int] = []
     for idx, candidate in enumerate(node_candidates, start=1):
-        if not isinstance(candidate, dict):
-            errors.append(f"Entity {idx}: invalid candidate")
-            continue
         schema = str(candidate.get("schema", "")).strip()
-        properties = candidate.get("properties", {})
         if not schema:
             errors.append(f"Entity {idx}: missing schema")
             continue
         try:
-            created = entity_service.create(
-                investigation_id,
-                EntityCreate(schema=schema, properties=properties),
-            )
-            nodes_created += 1
-            names = created.properties.get("name", [])
-            if names:
-                name_to_id[names[0].casefold()] = created.id
-        except (ValueError, RuntimeError, TypeError) as exc:
+            payloads.append(EntityCreate(schema=schema, properties=candidate.get("properties", {})))
+        except (ValueError, TypeError) as exc:
             errors.append(f"Entity {idx}: {exc}")
+            continue
+        payload_numbers.append(idx)
+
+    created, create_errors = entity_service.create_many(investigation_id, payloads)
+    errors.extend(
+        f"Entity {payload_numbers[index]}: {error}" for index, error in create_errors.items()
+    )
+    nodes_created = len(created)
+    name_to_id: dict[str, str] = {}
+    for entity in created.values():
+        for name in entity.properties.get("name", []):
+            name_to_id.setdefault(name_key(name), entity.id)
 
+    endpoints: dict[int, tuple[str, str, str, str]] = {}
     for idx, candidate in enumerate(relation_candidates, start=1):
         schema = str(candidate.get("schema", "")).strip()
         properties = candidate.get("properties", {})
         if not isinstance(properties, dict):
             errors.append(f"Relation {idx}: invalid properties")
             continue
-
-        endpoint_pair = None
         for left_key, right_key in RELATION_ENDPOINT_CANDIDATES.get(schema, []):
             left_values = properties.get(left_key) or []
             right_values = properties.get(right_key) or []
             if left_values and right_values:
-                endpoint_pair = (left_key, right_key, str(left_values[0]), str(right_values[0]))
+                endpoints[idx] = (left_key, right_key, str(left_values[0]), str(right_values[0]))
                 break
-
-        if endpoint_pair is None:
+        else:
             errors.append(f"Relation {idx}: missing endpoints")
-            continue
 
-        left_key, right_key, left_ref, right_ref = endpoint_pair
-        source_id = _resolve_entity_ref(graph, left_ref, name_to_id)
-        target_id = _resolve_entity_ref(graph, right_ref, name_to_id)
+    refs = [ref for _, _, left, right in endpoints.values() for ref in (left, right)]
+    resolved = _resolve_entity_refs(graph, refs, name_to_id)
+
+    edge_rows: list[dict[str, object]] = []
+    edge_numbers: dict[str, int] = {}
+    for idx, (left_key, right_key, left_ref, right_ref) in endpoints.items():
+        candidate = relation_candidates[idx - 1]
+        schema = str(candidate.get("schema", "")).strip()
+        source_id = resolved.get(left_ref.strip())
+        target_id = resolved.get(right_ref.strip())
         if source_id is None or target_id is None:
             errors.append(
                 f"Relation {idx}: unresolved endpoints ({left_ref!r} -> {right_ref!r})",
@@ -258,28 +506,35 @@ def persist_entities_step(  # noqa: C901, PLR0912, PLR0915
             continue
 
         edge_properties: dict[str, list[str]] = {}
-        for key, value in properties.items():
+        for key, value in candidate["properties"].items():
             if isinstance(value, list):
                 edge_properties[key] = [str(item) for item in value]
             else:
                 edge_properties[key] = [str(value)]
         edge_properties[left_key] = [source_id]
         edge_properties[right_key] = [target_id]
+        if "proof" not in edge_properties:
+            edge_properties["proof"] = [document_id]
 
         edge_id = str(candidate.get("id") or f"rel-{document_id}-{idx}-{uuid4().hex[:8]}")
-        created = _create_edge(
-            graph=graph,
-            edge_id=edge_id,
-            schema=schema,
-            source=source_id,
-            target=target_id,
-            properties=edge_properties,
-            proof_document_id=document_id,
+        edge_numbers[edge_id] = idx
+        edge_rows.append(
+            {
+                "edge_id": edge_id,
+                "schema": schema,
+                "source": source_id,
+                "target": target_id,
+                "properties": {f"_{key}": values for key, values in edge_properties.items()},
+            }
         )
-        if created:
-            edges_created += 1
-        else:
-            errors.append(f"Relation {idx}: could not create edge")
+
+    created_edges = _create_edges(graph, edge_rows)
+    edges_created = len(created_edges)
+    errors.extend(
+        f"Relation {idx}: could not create edge"
+        for edge_id, idx in edge_numbers.items()
+        if edge_id not in created_edges
+    )
 
     return {
         "processed": 1,
@@ -287,80 +542,291 @@ def persist_entities_step(  # noqa: C901, PLR0912, PLR0915
         "edges_created": edges_created,
         "errors": errors,
         "document_id": document_id,
+        "metrics": stage_metrics(
+            perf_counter() - started,
+            mentions=mentions,
+            entities=nodes_created,
+            edges=edges_created,
+        ),
     }
 
 
 @DBOS.workflow()
-def document_extraction_workflow(
+def process_document_workflow(
     investigation_id: str,
     document_id: str,
     storage_key: str,
     filename: str,
     content_type: str | None,
 ) -> dict:
-    """Durable workflow: download -> parse -> extract -> persist."""
-    content = download_document_step(investigation_id, storage_key)
-    parsed = parse_document_step(content, filename, content_type)
-    entities = extract_entities_step(parsed)
-    return persist_entities_step(
+    """Durable workflow: parse -> extract -> persist.
+
+    Steps exchange object-storage keys and small metadata only; document bytes, parsed
+    text and extracted entities stay in RustFS/S3 so DBOS checkpoints remain small.
+    """
+    parsed_ref = parse_document_step(
+        investigation_id,
+        document_id,
+        storage_key,
+        filename,
+        content_type,
+    )
+    if parsed_ref.get("page_ranges"):
+        handles = [
+            PARSE_QUEUE.enqueue(parse_page_range_workflow, investigation_id, filename, page_range)
+            for page_range in parsed_ref["page_ranges"]
+        ]
+        range_refs = [handle.get_result() for handle in handles]
+        parsed_ref = join_page_ranges_step(
+            investigation_id,
+            document_id,
+            filename,
+            parsed_ref,
+            range_refs,
+        )
+    extracted_ref = extract_entities_step(investigation_id, document_id, parsed_ref)
+    result = persist_entities_step(
         payload={
             "investigation_id": investigation_id,
             "document_id": document_id,
             "storage_key": storage_key,
             "filename": filename,
-            "parsed": parsed,
-            "entities": entities,
+            "parsed_key": parsed_ref["parsed_key"],
+            "entities_key": extracted_ref["entities_key"],
         },
     )
+    result["parse_cache"] = parsed_ref.get("parse_cache")
+    result["metrics"] = workflow_metrics(
+        {
+            **cast("dict[str, dict[str, object]]", parsed_ref.get("metrics") or {}),
+            "extract": extracted_ref.get("metrics", {}),
+            "persist": result.pop("metrics", {}),
+        }
+    )
+    return result
 
 
-class ExtractionWorkflowService:
-    """Submit and inspect DBOS extraction workflows."""
+@DBOS.step()
+def queue_wait_step(workflow_id: str, worker_workflow_id: str) -> dict[str, float]:
+    """Measure how long a document waited on the investigation and worker queues."""
+    waits: dict[str, float] = {}
+    for queue, queued_id in (("investigation", workflow_id), ("worker", worker_workflow_id)):
+        status = DBOS.get_workflow_status(queued_id)
+        if status is not None and status.created_at and status.dequeued_at:
+            waits[queue] = round((status.dequeued_at - status.created_at) / 1000, 4)
+    return waits
 
-    def __init__(self) -> None:
-        self._init_dbos()
 
-    def _init_dbos(self) -> None:
+@DBOS.workflow()
+def document_extraction_workflow(
+    investigation_id: str,
+    document_id: str,
+    storage_key: str,
+    filename: str,
+    content_type: str | None,
+) -> dict:
+    """Hold an investigation slot while the document waits for and runs on a worker."""
+    handle = EXTRACTION_QUEUE.enqueue(
+        process_document_workflow,
+        investigation_id,
+        document_id,
+        storage_key,
+        filename,
+        content_type,
+    )
+    result = handle.get_result()
+    metrics = result.get("metrics")
+    if isinstance(metrics, dict) and DBOS.workflow_id is not None:
+        metrics["queue_wait_seconds"] = queue_wait_step(
+            DBOS.workflow_id,
+            handle.get_workflow_id(),
+        )
+    return result
+
+
+@DBOS.workflow()
+def batch_fan_out_workflow(investigation_id: str, documents: list[dict]) -> list[str]:
+    """Enqueue one extraction workflow per document of a bulk upload, under preassigned IDs."""
+    workflow_ids: list[str] = []
+    for document in documents:
+        with (
+            SetEnqueueOptions(queue_partition_key=investigation_id),
+            SetWorkflowID(str(document["workflow_id"])),
+        ):
+            handle = INVESTIGATION_QUEUE.enqueue(
+                document_extraction_workflow,
+                investigation_id,
+                document["document_id"],
+                document["storage_key"],
+                document["filename"],
+                document["content_type"],
+            )
+        workflow_ids.append(handle.get_workflow_id())
+    return workflow_ids
+
+
+def launch_dbos() -> None:
+    """Launch the DBOS runtime once per process; it dequeues and runs extraction workflows."""
+    if DBOS_STATE["launched"]:
+        return
+    with DBOS_INIT_LOCK:
         if DBOS_STATE["launched"]:
             return
-        with DBOS_INIT_LOCK:
-            if DBOS_STATE["launched"]:
-                return
-            config = {
-                "name": settings.dbos_app_name,
-                "system_database_url": settings.dbos_system_database_url,
-            }
-            with logfire.span("initialize dbos runtime"):
-                DBOS(config=cast("Any", config))
-                DBOS.launch()
-            DBOS_STATE["launched"] = True
+        config = {
+            "name": settings.dbos_app_name,
+            "system_database_url": settings.dbos_system_database_url,
+        }
+        with logfire.span("initialize dbos runtime"):
+            DBOS(config=cast("Any", config))
+            DBOS.launch()
+        DBOS_STATE["launched"] = True
+
+
+class ExtractionWorkflowService:
+    """Submit and inspect DBOS extraction workflows.
+
+    In ``inline`` mode the API process launches DBOS and runs workflows itself. In
+    ``enqueue`` mode it only writes to the DBOS system database through a client, and
+    ``python -m app.worker`` processes execute the queued workflows.
+    """
+
+    def __init__(self) -> None:
+        self.client: DBOSClient | None = None
+        if settings.extraction_mode == "enqueue":
+            self.client = DBOSClient(system_database_url=settings.dbos_system_database_url)
+        elif settings.extraction_mode == "inline":
+            launch_dbos()
+        else:
+            msg = f"Unsupported EXTRACTION_MODE '{settings.extraction_mode}'"
+            raise ValueError(msg)
 
     @logfire.instrument("enqueue extraction workflow", extract_args=False)
-    def enqueue(
+    def enqueue(  # noqa: PLR0913
         self,
         investigation_id: str,
         document_id: str,
         storage_key: str,
         filename: str,
         content_type: str | None,
+        workflow_id: str | None = None,
     ) -> str:
-        """Start durable extraction workflow and return workflow ID."""
-        handle = DBOS.start_workflow(
-            document_extraction_workflow,
-            investigation_id,
-            document_id,
-            storage_key,
-            filename,
-            content_type,
+        """Queue a durable extraction workflow and return its workflow ID."""
+        args = (investigation_id, document_id, storage_key, filename, content_type)
+        if self.client is not None:
+            options: EnqueueOptions = {
+                "queue_name": INVESTIGATION_QUEUE.name,
+                "workflow_name": str(document_extraction_workflow.dbos_function_name),
+                "queue_partition_key": investigation_id,
+            }
+            if workflow_id is not None:
+                options["workflow_id"] = workflow_id
+            return self.client.enqueue(options, *args).get_workflow_id()
+
+        with (
+            SetEnqueueOptions(queue_partition_key=investigation_id),
+            SetWorkflowID(workflow_id or str(uuid4())),
+        ):
+            handle = INVESTIGATION_QUEUE.enqueue(document_extraction_workflow, *args)
+        return handle.get_workflow_id()
+
+    @logfire.instrument("enqueue extraction workflow batch", extract_args=False)
+    def enqueue_many(
+        self,
+        investigation_id: str,
+        documents: list[dict[str, str | None]],
+        batch_workflow_id: str,
+    ) -> list[str]:
+        """Queue extraction for many documents with a single enqueue and return their IDs.
+
+        Each document carries ``document_id``, ``storage_key``, ``filename``, ``content_type``
+        and the ``workflow_id`` its extraction workflow will run under. DBOS has no multi-row
+        enqueue, so one durable fan-out workflow enqueues the documents on the worker side.
+        """
+        args = (investigation_id, documents)
+        if self.client is not None:
+            options: EnqueueOptions = {
+                "queue_name": BATCH_QUEUE.name,
+                "workflow_name": str(batch_fan_out_workflow.dbos_function_name),
+                "workflow_id": batch_workflow_id,
+            }
+            self.client.enqueue(options, *args)
+        else:
+            with SetWorkflowID(batch_workflow_id):
+                BATCH_QUEUE.enqueue(batch_fan_out_workflow, *args)
+        return [str(document["workflow_id"]) for document in documents]
+
+    @logfire.instrument("count extraction workflows", extract_args=False)
+    def count_by_status(self, workflow_id_prefix: str) -> dict[str, int]:
+        """Count extraction workflows whose ID starts with a prefix, grouped by status."""
+        statuses = self._list_workflows(
+            workflow_id_prefix=workflow_id_prefix,
+            load_input=False,
+            load_output=False,
         )
-        return str(getattr(handle, "workflow_id", ""))
+        return dict(Counter(str(workflow.status) for workflow in statuses))
+
+    @logfire.instrument("summarize extraction metrics", extract_args=False)
+    def metrics_summary(
+        self, investigation_id: str, limit: int, since_hours: int
+    ) -> dict[str, object]:
+        """Aggregate stage metrics from recent successful extraction workflows.
+
+        Metrics are read from workflow results in the DBOS system database, so they cover
+        documents processed by every worker, not just this process. Only workflows started in
+        the last ``since_hours`` are scanned, so the cost does not grow with the full history.
+        """
+        start_time = (datetime.now(UTC) - timedelta(hours=since_hours)).isoformat()
+        # Inputs are paged newest first until ``limit`` of this investigation's workflows are
+        # found; only those outputs are loaded.
+        workflow_ids: list[str] = []
+        offset = 0
+        while len(workflow_ids) < limit:
+            page = self._list_workflows(
+                status="SUCCESS",
+                start_time=start_time,
+                sort_desc=True,
+                limit=METRICS_PAGE_SIZE,
+                offset=offset,
+                load_input=True,
+                load_output=False,
+            )
+            workflow_ids.extend(
+                workflow.workflow_id
+                for workflow in page
+                if ((workflow.input or {}).get("args") or (None,))[0] == investigation_id
+            )
+            if len(page) < METRICS_PAGE_SIZE:
+                break
+            offset += len(page)
+
+        metrics: list[dict[str, object]] = []
+        if workflow_ids:
+            for workflow in self._list_workflows(
+                workflow_ids=workflow_ids[:limit],
+                load_input=False,
+                load_output=True,
+            ):
+                output = workflow.output
+                if isinstance(output, dict) and isinstance(output.get("metrics"), dict):
+                    metrics.append(output["metrics"])
+        return summarize(metrics)
+
+    def _list_workflows(self, **filters: Any) -> list[Any]:  # noqa: ANN401
+        filters["name"] = str(document_extraction_workflow.dbos_function_name)
+        if self.client is not None:
+            return self.client.list_workflows(**filters)
+        return DBOS.list_workflows(**filters)
 
     @logfire.instrument("get workflow status", extract_args=False)
     def get_status(self, workflow_id: str) -> dict:
         """Get workflow state and result/error if available."""
         try:
-            handle = DBOS.retrieve_workflow(workflow_id)
-        except (RuntimeError, ValueError, TypeError):
+            if self.client is not None:
+                handle = self.client.retrieve_workflow(workflow_id)
+            else:
+                handle = DBOS.retrieve_workflow(workflow_id)
+            status = str(handle.get_status().status)
+        except (DBOSException, RuntimeError, ValueError, TypeError):
             return {
                 "workflow_id": workflow_id,
                 "status": "NOT_FOUND",
@@ -368,7 +834,6 @@ class ExtractionWorkflowService:
                 "error": "Workflow not found",
             }
 
-        status = str(getattr(handle, "status", "UNKNOWN"))
         result = None
         error = None
 
@@ -381,7 +846,7 @@ class ExtractionWorkflowService:
         if status.upper() in {"ERROR", "FAILED", "CANCELLED"} and error is None:
             try:
                 handle.get_result()
-            except (RuntimeError, ValueError, TypeError) as exc:
+            except (DBOSException, RuntimeError, ValueError, TypeError) as exc:
                 error = str(exc)
 
         return {
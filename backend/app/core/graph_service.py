@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
-from typing import Any, Protocol, cast
+from threading import Lock
+from typing import Any, ClassVar, Protocol, cast
 
 try:
     from falkordb import FalkorDB  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - optional dependency
     FalkorDB = None
 
+try:
+    from redis.exceptions import ResponseError as RedisResponseError
+except ImportError:  # pragma: no cover - optional dependency
+    RedisResponseError = RuntimeError
+
 from app.config import settings
+from app.core.match_keys import MATCH_KEY_PROPERTIES
 from app.models.graph import GraphEdge, GraphNode, GraphPage
 
 
@@ -35,6 +42,12 @@ class GraphService:
 
     INVESTIGATION_PREFIX = "investigation_"
     META_GRAPH = "investigations_meta"
+    MATCH_INDEX_GRAPH = "entity_match_index"
+    ENTITY_INDEX_PROPERTIES = ("id", *MATCH_KEY_PROPERTIES)
+    MATCH_REF_INDEX_PROPERTIES = ("keys", "investigation_id", "entity_id")
+
+    _index_lock = Lock()
+    _indexed_graphs: ClassVar[set[str]] = set()
 
     def __init__(self) -> None:
         self.db: object | None = None
@@ -60,7 +73,31 @@ class GraphService:
 
     def create_investigation_graph(self, investigation_id: str) -> GraphHandle:
         """Create (or fetch) an investigation graph."""
-        return self._require_db().select_graph(self.graph_name(investigation_id))
+        graph_name = self.graph_name(investigation_id)
+        graph = self._require_db().select_graph(graph_name)
+        self._ensure_indexes(graph_name, graph, "Entity", self.ENTITY_INDEX_PROPERTIES)
+        return graph
+
+    @staticmethod
+    def _ensure_indexes(
+        graph_name: str,
+        graph: GraphHandle,
+        label: str,
+        properties: tuple[str, ...],
+    ) -> None:
+        """Create range indexes once per graph and process."""
+        if graph_name in GraphService._indexed_graphs:
+            return
+        with GraphService._index_lock:
+            if graph_name in GraphService._indexed_graphs:
+                return
+            for prop in properties:
+                try:
+                    graph.query(f"CREATE INDEX FOR (n:{label}) ON (n.{prop})")
+                except RedisResponseError:
+                    # FalkorDB rejects re-creating an existing index.
+                    continue
+            GraphService._indexed_graphs.add(graph_name)
 
     def _meta_graph(self) -> GraphHandle:
         return self._require_db().select_graph(self.META_GRAPH)
@@ -125,6 +162,70 @@ class GraphService:
             params={"id": investigation_id},
         )
 
+    def _match_index_graph(self) -> GraphHandle:
+        graph = self._require_db().select_graph(self.MATCH_INDEX_GRAPH)
+        self._ensure_indexes(
+            self.MATCH_INDEX_GRAPH,
+            graph,
+            "EntityRef",
+            self.MATCH_REF_INDEX_PROPERTIES,
+        )
+        return graph
+
+    def upsert_match_refs(self, investigation_id: str, refs: list[dict[str, Any]]) -> None:
+        """Record entity match keys in the cross-investigation index."""
+        if not refs:
+            return
+        self._match_index_graph().query(
+            "UNWIND $refs AS ref "
+            "MERGE (r:EntityRef {investigation_id: $investigation_id, entity_id: ref.entity_id}) "
+            "SET r.schema = ref.schema, r.caption = ref.caption, r.keys = ref.keys",
+            params={"investigation_id": investigation_id, "refs": refs},
+        )
+
+    def delete_match_refs(self, investigation_id: str, entity_ids: list[str] | None = None) -> None:
+        """Drop index entries for some entities, or for the whole investigation."""
+        graph = self._match_index_graph()
+        if entity_ids is None:
+            graph.query(
+                "MATCH (r:EntityRef {investigation_id: $investigation_id}) DELETE r",
+                params={"investigation_id": investigation_id},
+            )
+            return
+        if not entity_ids:
+            return
+        graph.query(
+            "MATCH (r:EntityRef {investigation_id: $investigation_id}) "
+            "WHERE r.entity_id IN $entity_ids DELETE r",
+            params={"investigation_id": investigation_id, "entity_ids": entity_ids},
+        )
+
+    def find_match_refs(self, keys: list[str]) -> list[dict[str, Any]]:
+        """Return index entries sharing at least one key, with the keys they matched on."""
+        if not keys:
+            return []
+        result = (
+            self._match_index_graph()
+            .query(
+                "UNWIND $keys AS key "
+                "MATCH (r:EntityRef) WHERE key IN r.keys "
+                "RETURN r.investigation_id, r.entity_id, r.schema, r.caption, collect(key) "
+                "ORDER BY r.investigation_id, r.entity_id",
+                params={"keys": keys},
+            )
+            .result_set
+        )
+        return [
+            {
+                "investigation_id": row[0],
+                "entity_id": row[1],
+                "schema": row[2],
+                "caption": row[3],
+                "matched_keys": list(row[4] or []),
+            }
+            for row in result
+        ]
+
     def list_investigations(self) -> list[str]:
         """List investigation IDs discovered from graph names."""
         graphs = self._require_db().list_graphs()
@@ -142,6 +243,7 @@ class GraphService:
             return
         graph = db.select_graph(graph_name)
         graph.delete()
+        GraphService._indexed_graphs.discard(graph_name)
 
     def count_entities(self, investigation_id: str) -> int:
         """Count entities in an investigation graph."""
@@ -155,7 +257,7 @@ class GraphService:
     def _normalize_properties(properties: dict[str, Any]) -> dict[str, list[str]]:
         normalized: dict[str, list[str]] = {}
         for key, value in properties.items():
-            if key in {"id", "schema"}:
+            if key in {"id", "schema"} or key in MATCH_KEY_PROPERTIES:
                 continue
 
             prop_name = key.removeprefix("_")
@@ -0,0 +1,144 @@
+"""Stream files out of zip, tar and mbox archives one entry at a time."""
+
+from __future__ import annotations
+
+import re
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MBOX_SUFFIXES = (".mbox", ".mbx")
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+    *MBOX_SUFFIXES,
+)
+ESCAPED_FROM = re.compile(rb"^>+From ")
+
+
+@dataclass(slots=True)
+class ArchiveEntry:
+    name: str
+    content: bytes | None
+    error: str | None = None
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _skipped(name: str) -> bool:
+    """Skip directories, resource forks and hidden files added by archivers."""
+    path = PurePosixPath(name)
+    return not path.name or path.name.startswith(".") or "__MACOSX" in path.parts
+
+
+def iter_archive(filename: str, fileobj: IO[bytes], max_entry_bytes: int) -> Iterator[ArchiveEntry]:
+    """Yield archive entries, holding at most one entry's bytes in memory at a time.
+
+    Entries larger than ``max_entry_bytes`` are reported with an error instead of being
+    returned; zip and tar entries are checked against their header size before reading.
+    """
+    if filename.lower().endswith(".zip"):
+        yield from _iter_zip(fileobj, max_entry_bytes)
+    elif filename.lower().endswith(MBOX_SUFFIXES):
+        yield from _iter_mbox(fileobj, max_entry_bytes)
+    else:
+        yield from _iter_tar(fileobj, max_entry_bytes)
+
+
+def _too_large(name: str, max_entry_bytes: int) -> ArchiveEntry:
+    return ArchiveEntry(name, None, f"{name}: entry exceeds {max_entry_bytes} bytes")
+
+
+def _iter_zip(fileobj: IO[bytes], max_entry_bytes: int) -> Iterator[ArchiveEntry]:
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile as exc:
+        msg = f"Invalid zip archive: {exc}"
+        raise ValueError(msg) from exc
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or _skipped(info.filename):
+                continue
+            if info.file_size > max_entry_bytes:
+                yield _too_large(info.filename, max_entry_bytes)
+                continue
+            with archive.open(info) as entry:
+                content = entry.read(max_entry_bytes + 1)
+            if len(content) > max_entry_bytes:
+                yield _too_large(info.filename, max_entry_bytes)
+                continue
+            yield ArchiveEntry(info.filename, content)
+
+
+def _iter_tar(fileobj: IO[bytes], max_entry_bytes: int) -> Iterator[ArchiveEntry]:
+    try:
+        archive = tarfile.open(fileobj=fileobj, mode="r|*")  # noqa: SIM115
+    except tarfile.TarError as exc:
+        msg = f"Invalid tar archive: {exc}"
+        raise ValueError(msg) from exc
+    with archive:
+        for member in archive:
+            if not member.isfile() or _skipped(member.name):
+                continue
+            if member.size > max_entry_bytes:
+                yield _too_large(member.name, max_entry_bytes)
+                continue
+            entry = archive.extractfile(member)
+            if entry is None:
+                continue
+            yield ArchiveEntry(member.name, entry.read())
+
+
+def _iter_mbox(fileobj: IO[bytes], max_entry_bytes: int) -> Iterator[ArchiveEntry]:
+    """Yield each message of an mbox file as an ``.eml`` entry, reading line by line.
+
+    A message starts at a ``From `` line at the top of the file or after a blank line.
+    ``>From `` escapes are undone; oversized messages are skipped without being buffered.
+    """
+    index = 0
+    lines: list[bytes] = []
+    size = 0
+    started = False
+    previous_blank = True
+    for line in fileobj:
+        if previous_blank and line.startswith(b"From "):
+            if started:
+                yield _mbox_message(index, lines, size, max_entry_bytes)
+                index += 1
+            started = True
+            lines = []
+            size = 0
+            previous_blank = False
+            continue
+        previous_blank = line in {b"\n", b"\r\n"}
+        if not started:
+            continue
+        if ESCAPED_FROM.match(line):
+            line = line[1:]  # noqa: PLW2901
+        size += len(line)
+        if size <= max_entry_bytes:
+            lines.append(line)
+        elif lines:
+            lines = []
+    if started:
+        yield _mbox_message(index, lines, size, max_entry_bytes)
+
+
+def _mbox_message(index: int, lines: list[bytes], size: int, max_entry_bytes: int) -> ArchiveEntry:
+    name = f"message-{index + 1:06d}.eml"
+    if size > max_entry_bytes:
+        return _too_large(name, max_entry_bytes)
+    return ArchiveEntry(name, b"".join(lines))
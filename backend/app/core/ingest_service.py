@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, cast
 
 from app.core.cleaning_service import CleaningService
 from app.core.ingest.ftm_json import FTMJsonIngestor
+from app.core.match_keys import MATCH_FOLDED, MATCH_NAME, folded_key, name_key
 from app.models.entity import EntityCreate, EntityUpdate
 from app.models.ingest import IngestResult
 
@@ -110,7 +111,7 @@ class IngestService:
         if not ref:
             return None
 
-        folded = ref.casefold()
+        folded = name_key(ref)
         cached = cache.get(folded)
         if cached:
             return cached
@@ -126,17 +127,16 @@ class IngestService:
             cache[folded] = resolved
             return resolved
 
-        by_name_result = graph.query(
-            "MATCH (n:Entity) "
-            "WHERE any(name IN coalesce(n._name, []) WHERE toLower(name) = toLower($name)) "
-            "RETURN n.id LIMIT 1",
-            params={"name": ref},
-        )
-        by_name = getattr(by_name_result, "result_set", [])
-        if by_name:
-            resolved = str(by_name[0][0])
-            cache[folded] = resolved
-            return resolved
+        for prop, value in ((MATCH_NAME, folded), (MATCH_FOLDED, folded_key(ref))):
+            by_name_result = graph.query(
+                f"MATCH (n:Entity) WHERE $name IN n.{prop} RETURN n.id LIMIT 1",
+                params={"name": value},
+            )
+            by_name = getattr(by_name_result, "result_set", [])
+            if by_name:
+                resolved = str(by_name[0][0])
+                cache[folded] = resolved
+                return resolved
         return None
 
     def _create_edge(self, investigation_id: str, candidate: EdgeCandidate) -> bool:
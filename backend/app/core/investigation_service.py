@@ -6,17 +6,27 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
+import logfire
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.config import settings
 from app.models.investigation import Investigation, InvestigationCreate, InvestigationList
 
 if TYPE_CHECKING:
     from app.core.graph_service import GraphService
+    from app.core.storage_service import StorageService
 
 
 class InvestigationService:
     """Manage investigation metadata and graph lifecycle."""
 
-    def __init__(self, graph_service: GraphService) -> None:
+    def __init__(
+        self,
+        graph_service: GraphService,
+        storage_service: StorageService | None = None,
+    ) -> None:
         self.graph_service = graph_service
+        self.storage_service = storage_service
 
     def _to_investigation(self, data: dict) -> Investigation:
         created_at = datetime.fromisoformat(data["created_at"])
@@ -62,4 +72,14 @@ class InvestigationService:
         exists = self.graph_service.get_investigation_metadata(investigation_id) is not None
         self.graph_service.delete_investigation_metadata(investigation_id)
         self.graph_service.delete_investigation(investigation_id)
+        self.graph_service.delete_match_refs(investigation_id)
+        if self.storage_service is not None and settings.s3_content_addressed:
+            try:
+                self.storage_service.release_investigation_references(investigation_id)
+            except (BotoCoreError, ClientError) as exc:
+                logfire.warn(
+                    "could not release investigation content",
+                    investigation_id=investigation_id,
+                    error=str(exc),
+                )
         return exists
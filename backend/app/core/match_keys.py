@@ -0,0 +1,82 @@
+"""Derived name match keys stored on entity nodes for indexed lookups."""
+
+from __future__ import annotations
+
+import unicodedata
+
+MATCH_NAME = "match_name"
+MATCH_FOLDED = "match_folded"
+MATCH_TOKENS = "match_tokens"
+MATCH_IDENTIFIERS = "match_identifiers"
+MATCH_KEY_PROPERTIES = (MATCH_NAME, MATCH_FOLDED, MATCH_TOKENS, MATCH_IDENTIFIERS)
+
+STRONG_IDENTIFIER_FIELDS = (
+    "email",
+    "registrationNumber",
+    "leiCode",
+    "innCode",
+    "vatCode",
+    "taxNumber",
+    "idNumber",
+    "passportNumber",
+    "imoNumber",
+    "isin",
+    "swiftBic",
+)
+
+
+def name_key(value: str) -> str:
+    """Casefold a name and collapse whitespace."""
+    return " ".join(value.split()).casefold()
+
+
+def folded_key(value: str) -> str:
+    """Strip accents and punctuation from a casefolded name."""
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    without_marks = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    stripped = "".join(ch if ch.isalnum() else " " for ch in without_marks)
+    return " ".join(stripped.split())
+
+
+def token_key(value: str) -> str:
+    """Return folded name tokens in sorted order."""
+    return " ".join(sorted(folded_key(value).split()))
+
+
+def identifier_key(value: str) -> str:
+    """Casefold an identifier and drop separators."""
+    return "".join(ch for ch in value.casefold() if ch.isalnum() or ch in "@.")
+
+
+def _unique(values: list[str]) -> list[str]:
+    return [value for value in dict.fromkeys(values) if value]
+
+
+def identifier_keys(properties: dict[str, list[str]]) -> list[str]:
+    """Build ``field:identifier`` keys from strong identifiers."""
+    return _unique(
+        [
+            f"{field}:{identifier_key(value)}"
+            for field in STRONG_IDENTIFIER_FIELDS
+            for value in properties.get(field) or []
+            if identifier_key(value)
+        ]
+    )
+
+
+def match_keys(properties: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Build the match key properties for an entity's names and strong identifiers."""
+    names = properties.get("name") or []
+    return {
+        MATCH_NAME: _unique([name_key(name) for name in names]),
+        MATCH_FOLDED: _unique([folded_key(name) for name in names]),
+        MATCH_TOKENS: _unique([token_key(name) for name in names]),
+        MATCH_IDENTIFIERS: identifier_keys(properties),
+    }
+
+
+def index_keys(properties: dict[str, list[str]]) -> list[str]:
+    """Build cross-investigation lookup keys from folded names and strong identifiers."""
+    keys = [f"name:{folded_key(name)}" for name in properties.get("name") or []]
+    keys.extend(identifier_keys(properties))
+    return [key for key in dict.fromkeys(keys) if not key.endswith(":")]
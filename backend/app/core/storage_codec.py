@@ -0,0 +1,90 @@
+"""Optional zstd compression of stored objects, with the codec recorded in object metadata."""
+
+from __future__ import annotations
+
+from typing import IO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency (the compression extra)
+    zstandard = None
+
+ZSTD = "zstd"
+CODECS = ("none", ZSTD)
+CODEC_METADATA_KEY = "codec"
+SIZE_METADATA_KEY = "uncompressed_size"
+READ_CHUNK_BYTES = 256 * 1024
+# Media types that are mostly text. PDFs, images and office archives are compressed already.
+COMPRESSIBLE_PREFIXES = ("text/", "message/")
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/xhtml+xml",
+    "application/rtf",
+    "application/mbox",
+}
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+
+def compressible(content_type: str | None) -> bool:
+    """Return whether content of this media type is worth compressing."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith(COMPRESSIBLE_PREFIXES)
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+    )
+
+
+def require_zstd() -> None:
+    if zstandard is None:
+        msg = "zstandard is not installed; install the backend's `compression` extra"
+        raise RuntimeError(msg)
+
+
+def compress(content: bytes, level: int) -> bytes:
+    require_zstd()
+    return zstandard.ZstdCompressor(level=level).compress(content)
+
+
+def compressing_reader(fileobj: IO[bytes], level: int) -> IO[bytes]:
+    """Return a readable that yields ``fileobj`` zstd-compressed, without buffering it."""
+    require_zstd()
+    return zstandard.ZstdCompressor(level=level).stream_reader(fileobj, closefd=False)
+
+
+class ZstdBody:
+    """Readable view of a compressed object body, optionally limited to a byte range.
+
+    Compressed frames cannot be entered mid-stream, so a range is served by decompressing
+    from the start and discarding bytes before ``start``.
+    """
+
+    def __init__(self, body: IO[bytes], start: int = 0, length: int | None = None) -> None:
+        require_zstd()
+        self._body = body
+        self._reader = zstandard.ZstdDecompressor().stream_reader(body, closefd=False)
+        self._skip = start
+        self._remaining = length
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(READ_CHUNK_BYTES), b""))
+        while self._skip > 0:
+            skipped = self._reader.read(min(self._skip, READ_CHUNK_BYTES))
+            if not skipped:
+                return b""
+            self._skip -= len(skipped)
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        if size == 0:
+            return b""
+        data = self._reader.read(size)
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._reader.close()
+        self._body.close()
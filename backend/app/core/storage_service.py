@@ -3,30 +3,77 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import math
 import re
+from io import BytesIO
+from threading import Lock
+from time import monotonic
+from typing import IO, TYPE_CHECKING, Any, ClassVar
+from uuid import uuid4
 
 import boto3
 import logfire
-from botocore.client import Config
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient, Config
 from botocore.exceptions import ClientError
 
 from app.config import settings
+from app.core.storage_codec import (
+    CODEC_METADATA_KEY,
+    CODECS,
+    SIZE_METADATA_KEY,
+    ZSTD,
+    ZstdBody,
+    compress,
+    compressible,
+    compressing_reader,
+    require_zstd,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 S3_BUCKET_MIN_LENGTH = 3
 S3_BUCKET_MAX_LENGTH = 63
 S3_BUCKET_HASH_LEN = 10
 S3_BUCKET_PREFIX_MAX = 52
+BLOB_KEY_PREFIX = "sha256/"
+HASH_CHUNK_BYTES = 1024 * 1024
+MEBIBYTE = 1024 * 1024
+STREAM_CHUNK_BYTES = 256 * 1024
+S3_MAX_PARTS = 10000
 
 
 class StorageService:
     """Handle upload and download of raw documents in object storage."""
 
+    # Buckets known to exist in this process, with the monotonic time they must be re-checked.
+    _bucket_lock: ClassVar[Lock] = Lock()
+    _known_buckets: ClassVar[dict[str, float]] = {}
+
     def __init__(self) -> None:
+        if settings.s3_compression not in CODECS:
+            msg = f"S3_COMPRESSION must be one of {', '.join(CODECS)}"
+            raise ValueError(msg)
+        if settings.s3_compression == ZSTD:
+            require_zstd()
         self.bucket_prefix = settings.s3_bucket_name
+        self.client = self._make_client(settings.s3_endpoint_url)
+        # Presigned URLs are used by browsers, which may reach storage on another host.
+        self.presign_client = (
+            self._make_client(settings.s3_public_endpoint_url)
+            if settings.s3_public_endpoint_url
+            else self.client
+        )
+
+    @staticmethod
+    def _make_client(endpoint_url: str) -> BaseClient:
         secret_key = settings.s3_secret_key or settings.s3_access_key
-        self.client = boto3.client(
+        return boto3.client(
             "s3",
-            endpoint_url=settings.s3_endpoint_url,
+            endpoint_url=endpoint_url,
             aws_access_key_id=settings.s3_access_key,
             aws_secret_access_key=secret_key,
             region_name=settings.s3_region,
@@ -51,10 +98,65 @@ class StorageService:
             cleaned = f"{cleaned[:S3_BUCKET_PREFIX_MAX].rstrip('-')}-{digest[:S3_BUCKET_HASH_LEN]}"
         return cleaned
 
-    @logfire.instrument("ensure storage bucket", extract_args=False)
+    def cache_bucket_name(self) -> str:
+        """Return the bucket shared by all investigations for derived caches."""
+        return f"{self.bucket_prefix}-cache"
+
+    def blob_bucket_name(self) -> str:
+        """Return the bucket holding content-addressed documents shared by investigations."""
+        return f"{self.bucket_prefix}-blobs"
+
+    @staticmethod
+    def document_key(document_id: str, filename: str) -> str:
+        """Return the per-investigation object key of an uploaded document."""
+        return f"{document_id}/{filename or 'upload.bin'}"
+
+    @staticmethod
+    def blob_key(digest: str) -> str:
+        return f"{BLOB_KEY_PREFIX}{digest[:2]}/{digest}"
+
+    @staticmethod
+    def _reference_prefix(digest: str, investigation_id: str | None = None) -> str:
+        prefix = f"refs/{digest}/"
+        return f"{prefix}{investigation_id}/" if investigation_id is not None else prefix
+
+    @staticmethod
+    def _investigation_reference_key(investigation_id: str, digest: str, document_id: str) -> str:
+        """Return the index marker listing a reference under its investigation."""
+        return f"investigations/{investigation_id}/{digest}/{document_id}"
+
+    def _bucket_for_key(self, investigation_id: str, key: str) -> str:
+        """Content-addressed keys live in the shared blob bucket, all others per investigation."""
+        if key.startswith(BLOB_KEY_PREFIX):
+            return self.blob_bucket_name()
+        return self._bucket_name_for(investigation_id)
+
     def ensure_bucket(self, investigation_id: str) -> str:
         """Create the bucket if it does not exist yet."""
-        bucket_name = self._bucket_name_for(investigation_id)
+        return self._ensure_bucket_named(self._bucket_name_for(investigation_id))
+
+    def _ensure_bucket_named(self, bucket_name: str) -> str:
+        """Return the bucket name, checking or creating it only when the cached entry expired."""
+        with self._bucket_lock:
+            expires_at = self._known_buckets.get(bucket_name)
+        if expires_at is not None and monotonic() < expires_at:
+            return bucket_name
+        self._create_bucket_if_missing(bucket_name)
+        if settings.s3_bucket_cache_ttl_seconds > 0:
+            with self._bucket_lock:
+                self._known_buckets[bucket_name] = (
+                    monotonic() + settings.s3_bucket_cache_ttl_seconds
+                )
+        return bucket_name
+
+    @classmethod
+    def forget_bucket(cls, bucket_name: str) -> None:
+        """Drop a bucket from the existence cache, e.g. after it was deleted out of band."""
+        with cls._bucket_lock:
+            cls._known_buckets.pop(bucket_name, None)
+
+    @logfire.instrument("ensure storage bucket", extract_args=False)
+    def _create_bucket_if_missing(self, bucket_name: str) -> None:
         try:
             self.client.head_bucket(Bucket=bucket_name)
         except ClientError as exc:
@@ -63,7 +165,7 @@ class StorageService:
             if error_code not in {"403", "404", "NoSuchBucket", "NotFound", "AccessDenied"}:
                 raise
         else:
-            return bucket_name
+            return
 
         try:
             if settings.s3_region and settings.s3_region != "us-east-1":
@@ -76,9 +178,36 @@ class StorageService:
         except ClientError as exc:
             error_code = str(exc.response.get("Error", {}).get("Code", ""))
             if error_code in {"BucketAlreadyOwnedByYou", "BucketAlreadyExists"}:
-                return bucket_name
+                return
             raise
-        return bucket_name
+
+    @staticmethod
+    def _compresses(content_type: object) -> bool:
+        return settings.s3_compression == ZSTD and compressible(str(content_type or ""))
+
+    @staticmethod
+    def _codec_metadata(extra: object, size: int) -> dict[str, str]:
+        metadata = dict(extra) if isinstance(extra, dict) else {}
+        return {**metadata, CODEC_METADATA_KEY: ZSTD, SIZE_METADATA_KEY: str(size)}
+
+    def _put_object(self, bucket_name: str, **params: object) -> None:
+        """Put an object, recreating the bucket once if its cached existence was stale.
+
+        With ``S3_COMPRESSION=zstd``, text-like bodies are compressed and the codec and
+        original size are recorded in the object's metadata.
+        """
+        body = params.get("Body")
+        if isinstance(body, bytes) and body and self._compresses(params.get("ContentType")):
+            params["Metadata"] = self._codec_metadata(params.get("Metadata"), len(body))
+            params["Body"] = compress(body, settings.s3_compression_level)
+        try:
+            self.client.put_object(Bucket=bucket_name, **params)
+        except ClientError as exc:
+            if str(exc.response.get("Error", {}).get("Code", "")) != "NoSuchBucket":
+                raise
+            self.forget_bucket(bucket_name)
+            self._ensure_bucket_named(bucket_name)
+            self.client.put_object(Bucket=bucket_name, **params)
 
     @logfire.instrument("upload object bytes", extract_args=False)
     def upload_bytes(
@@ -90,12 +219,16 @@ class StorageService:
         content_type: str | None,
     ) -> str:
         """Upload file bytes and return the object key."""
+        if settings.s3_content_addressed:
+            return self._store_blob(
+                investigation_id, document_id, filename, BytesIO(content), content_type
+            )
         bucket_name = self.ensure_bucket(investigation_id)
         safe_filename = filename or "upload.bin"
-        key = f"{document_id}/{safe_filename}"
+        key = self.document_key(document_id, safe_filename)
 
-        self.client.put_object(
-            Bucket=bucket_name,
+        self._put_object(
+            bucket_name,
             Key=key,
             Body=content,
             ContentType=content_type or "application/octet-stream",
@@ -107,14 +240,502 @@ class StorageService:
         )
         return key
 
+    @logfire.instrument("upload object stream", extract_args=False)
+    def upload_stream(
+        self,
+        investigation_id: str,
+        document_id: str,
+        filename: str,
+        fileobj: IO[bytes],
+        content_type: str | None,
+    ) -> str:
+        """Stream a file object to storage and return the object key.
+
+        Files above ``S3_MULTIPART_THRESHOLD_MB`` are sent as a multipart upload whose parts
+        are read and uploaded concurrently, so only a few parts are held in memory at once.
+        """
+        if settings.s3_content_addressed and fileobj.seekable():
+            return self._store_blob(investigation_id, document_id, filename, fileobj, content_type)
+        bucket_name = self.ensure_bucket(investigation_id)
+        safe_filename = filename or "upload.bin"
+        key = self.document_key(document_id, safe_filename)
+        extra_args = {
+            "ContentType": content_type or "application/octet-stream",
+            "Metadata": {
+                "investigation_id": investigation_id,
+                "document_id": document_id,
+                "filename": safe_filename,
+            },
+        }
+        start = fileobj.tell() if fileobj.seekable() else None
+        try:
+            self._upload_fileobj(fileobj, bucket_name, key, extra_args)
+        except S3UploadFailedError as exc:
+            if "NoSuchBucket" not in str(exc) or start is None:
+                raise
+            self.forget_bucket(bucket_name)
+            self._ensure_bucket_named(bucket_name)
+            fileobj.seek(start)
+            self._upload_fileobj(fileobj, bucket_name, key, extra_args)
+        return key
+
+    @logfire.instrument("presign object upload", extract_args=False)
+    def presign_upload(
+        self,
+        investigation_id: str,
+        document_id: str,
+        filename: str,
+        content_type: str | None,
+        size_bytes: int,
+    ) -> dict[str, Any]:
+        """Return presigned URLs a client uses to upload a document straight to storage.
+
+        Files up to ``S3_MULTIPART_THRESHOLD_MB`` get a single PUT URL. Larger files get a
+        multipart upload with one URL per part; the client reports each part's ETag to
+        ``complete_upload``. Direct uploads always use the per-investigation layout, since
+        content hashes are not known before the bytes arrive.
+        """
+        bucket_name = self.ensure_bucket(investigation_id)
+        key = self.document_key(document_id, filename)
+        content_type = content_type or "application/octet-stream"
+        expires_in = settings.s3_presign_expiry_seconds
+        if size_bytes <= settings.s3_multipart_threshold_mb * MEBIBYTE:
+            url = self.presign_client.generate_presigned_url(
+                "put_object",
+                Params={"Bucket": bucket_name, "Key": key, "ContentType": content_type},
+                ExpiresIn=expires_in,
+            )
+            return {
+                "key": key,
+                "expires_in": expires_in,
+                "url": url,
+                "headers": {"Content-Type": content_type},
+            }
+
+        part_size = max(
+            settings.s3_multipart_chunk_mb * MEBIBYTE,
+            math.ceil(size_bytes / S3_MAX_PARTS),
+        )
+        upload = self.client.create_multipart_upload(
+            Bucket=bucket_name,
+            Key=key,
+            ContentType=content_type,
+            Metadata={
+                "investigation_id": investigation_id,
+                "document_id": document_id,
+                "filename": filename or "upload.bin",
+            },
+        )
+        upload_id = str(upload["UploadId"])
+        parts = [
+            {
+                "part_number": part_number,
+                "url": self.presign_client.generate_presigned_url(
+                    "upload_part",
+                    Params={
+                        "Bucket": bucket_name,
+                        "Key": key,
+                        "UploadId": upload_id,
+                        "PartNumber": part_number,
+                    },
+                    ExpiresIn=expires_in,
+                ),
+            }
+            for part_number in range(1, math.ceil(size_bytes / part_size) + 1)
+        ]
+        return {
+            "key": key,
+            "expires_in": expires_in,
+            "upload_id": upload_id,
+            "part_size": part_size,
+            "parts": parts,
+        }
+
+    @logfire.instrument("complete direct upload", extract_args=False)
+    def complete_upload(
+        self,
+        investigation_id: str,
+        key: str,
+        upload_id: str | None = None,
+        parts: list[tuple[int, str]] | None = None,
+    ) -> int:
+        """Finish a presigned upload and return the stored object's size in bytes.
+
+        Multipart uploads are assembled from the reported ``(part_number, etag)`` pairs;
+        single PUT uploads are only checked for existence.
+        """
+        bucket_name = self._bucket_name_for(investigation_id)
+        try:
+            if upload_id:
+                if not parts:
+                    msg = "Multipart upload completion requires the uploaded parts"
+                    raise ValueError(msg)
+                self.client.complete_multipart_upload(
+                    Bucket=bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={
+                        "Parts": [
+                            {"PartNumber": number, "ETag": etag} for number, etag in sorted(parts)
+                        ],
+                    },
+                )
+            head = self.client.head_object(Bucket=bucket_name, Key=key)
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NotFound", "NoSuchUpload"}:
+                msg = "Uploaded object not found in storage"
+                raise ValueError(msg) from exc
+            if error_code in {"InvalidPart", "InvalidPartOrder", "EntityTooSmall"}:
+                msg = f"Multipart upload could not be completed: {error_code}"
+                raise ValueError(msg) from exc
+            raise
+        return int(head.get("ContentLength", 0))
+
+    @logfire.instrument("store content-addressed object", extract_args=False)
+    def _store_blob(
+        self,
+        investigation_id: str,
+        document_id: str,
+        filename: str,
+        fileobj: IO[bytes],
+        content_type: str | None,
+    ) -> str:
+        """Store content once under its SHA-256 and record this document's reference to it.
+
+        The stream is hashed in chunks and rewound; content already in the blob bucket is not
+        transferred again. Each reference is an empty marker object, so reference counts per
+        investigation are prefix listings and need no read-modify-write. A second marker indexes
+        the reference under its investigation. The markers are written before the existence
+        check; ``release_reference`` relies on that ordering to restore content it deleted while
+        this upload found it.
+        """
+        start = fileobj.tell()
+        hasher = hashlib.sha256()
+        for chunk in iter(lambda: fileobj.read(HASH_CHUNK_BYTES), b""):
+            hasher.update(chunk)
+        fileobj.seek(start)
+        digest = hasher.hexdigest()
+
+        bucket_name = self._ensure_bucket_named(self.blob_bucket_name())
+        key = self.blob_key(digest)
+        self._put_object(
+            bucket_name,
+            Key=self._investigation_reference_key(investigation_id, digest, document_id),
+            Body=b"",
+        )
+        self._put_object(
+            bucket_name,
+            Key=f"{self._reference_prefix(digest, investigation_id)}{document_id}",
+            Body=b"",
+            Metadata={"filename": filename or "upload.bin"},
+        )
+        transferred = not self._object_exists(bucket_name, key)
+        if transferred:
+            self._upload_fileobj(
+                fileobj,
+                bucket_name,
+                key,
+                {
+                    "ContentType": content_type or "application/octet-stream",
+                    "Metadata": {"sha256": digest, "filename": filename or "upload.bin"},
+                },
+            )
+        logfire.info("content-addressed object stored", sha256=digest, transferred=transferred)
+        return key
+
+    def _object_exists(self, bucket_name: str, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=bucket_name, Key=key)
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NotFound"}:
+                return False
+            raise
+        return True
+
+    def _reference_keys(self, prefix: str) -> list[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        return [
+            str(item["Key"])
+            for page in paginator.paginate(Bucket=self.blob_bucket_name(), Prefix=prefix)
+            for item in page.get("Contents", [])
+        ]
+
+    def reference_counts(self, key: str) -> dict[str, int]:
+        """Return how many documents in each investigation reference a content-addressed key."""
+        digest = key.rsplit("/", 1)[-1]
+        counts: dict[str, int] = {}
+        for reference in self._reference_keys(self._reference_prefix(digest)):
+            investigation_id = reference.split("/")[2]
+            counts[investigation_id] = counts.get(investigation_id, 0) + 1
+        return counts
+
+    @logfire.instrument("release content-addressed object", extract_args=False)
+    def release_reference(self, investigation_id: str, document_id: str, key: str) -> bool:
+        """Drop a document's reference and delete the content once nothing references it.
+
+        An upload of the same content may record its reference after the last one was listed
+        and find the content just before it is deleted. The content is therefore copied aside
+        first and restored if a reference appears by the time it is gone. Returns whether the
+        content itself was deleted.
+        """
+        if not key.startswith(BLOB_KEY_PREFIX):
+            return False
+        digest = key.rsplit("/", 1)[-1]
+        bucket_name = self.blob_bucket_name()
+        self.client.delete_object(
+            Bucket=bucket_name,
+            Key=f"{self._reference_prefix(digest, investigation_id)}{document_id}",
+        )
+        self.client.delete_object(
+            Bucket=bucket_name,
+            Key=self._investigation_reference_key(investigation_id, digest, document_id),
+        )
+        if self._reference_keys(self._reference_prefix(digest)):
+            return False
+
+        retired_key = f"retired/{digest}/{uuid4().hex}"
+        try:
+            self.client.copy({"Bucket": bucket_name, "Key": key}, bucket_name, retired_key)
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NotFound"}:
+                # A concurrent release already took the content.
+                return False
+            raise
+        self.client.delete_object(Bucket=bucket_name, Key=key)
+        deleted = not self._reference_keys(self._reference_prefix(digest))
+        if not deleted:
+            self.client.copy({"Bucket": bucket_name, "Key": retired_key}, bucket_name, key)
+        self.client.delete_object(Bucket=bucket_name, Key=retired_key)
+        return deleted
+
+    def delete_document_object(self, investigation_id: str, document_id: str, key: str) -> None:
+        """Remove a document's stored original, releasing shared content instead of deleting it."""
+        if key.startswith(BLOB_KEY_PREFIX):
+            self.release_reference(investigation_id, document_id, key)
+            return
+        self.client.delete_object(Bucket=self._bucket_name_for(investigation_id), Key=key)
+
+    @logfire.instrument("release investigation content references", extract_args=False)
+    def release_investigation_references(self, investigation_id: str) -> int:
+        """Release every content reference held by an investigation's documents.
+
+        Returns how many content objects were deleted because nothing else referenced them.
+        """
+        released = 0
+        prefix = f"investigations/{investigation_id}/"
+        for reference in self._reference_keys(prefix):
+            digest, document_id = reference.removeprefix(prefix).split("/", 1)
+            if self.release_reference(investigation_id, document_id, self.blob_key(digest)):
+                released += 1
+        return released
+
+    def key_from_url(self, url: str) -> str | None:
+        """Return the content-addressed key of an ``object_url``, if it points at one."""
+        prefix = f"s3://{self.blob_bucket_name()}/"
+        return url.removeprefix(prefix) if url.startswith(prefix) else None
+
+    def source_key(self, investigation_id: str, url: str) -> str | None:
+        """Return the object key of an ``object_url`` stored for this investigation."""
+        for bucket_name in (self._bucket_name_for(investigation_id), self.blob_bucket_name()):
+            prefix = f"s3://{bucket_name}/"
+            if url.startswith(prefix):
+                return url.removeprefix(prefix)
+        return None
+
+    def _upload_fileobj(
+        self,
+        fileobj: IO[bytes],
+        bucket_name: str,
+        key: str,
+        extra_args: dict[str, object],
+    ) -> None:
+        # Only seekable streams are compressed, since their size is recorded up front.
+        if self._compresses(extra_args.get("ContentType")) and fileobj.seekable():
+            start = fileobj.tell()
+            size = fileobj.seek(0, 2) - start
+            fileobj.seek(start)
+            extra_args = {
+                **extra_args,
+                "Metadata": self._codec_metadata(extra_args.get("Metadata"), size),
+            }
+            fileobj = compressing_reader(fileobj, settings.s3_compression_level)
+        mebibyte = 1024 * 1024
+        self.client.upload_fileobj(
+            fileobj,
+            bucket_name,
+            key,
+            ExtraArgs=extra_args,
+            Config=TransferConfig(
+                multipart_threshold=settings.s3_multipart_threshold_mb * mebibyte,
+                multipart_chunksize=settings.s3_multipart_chunk_mb * mebibyte,
+                max_concurrency=settings.s3_multipart_concurrency,
+            ),
+        )
+
     @logfire.instrument("download object bytes", extract_args=False)
     def download_bytes(self, investigation_id: str, key: str) -> bytes:
         """Download file bytes by object key."""
-        bucket_name = self._bucket_name_for(investigation_id)
-        response = self.client.get_object(Bucket=bucket_name, Key=key)
-        return response["Body"].read()
+        return self.open_object(investigation_id, key)["Body"].read()
+
+    def open_object(
+        self,
+        investigation_id: str,
+        key: str,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> dict[str, Any]:
+        """Start a GET and return the response, whose ``Body`` is read incrementally.
+
+        ``start``/``end`` select an inclusive byte range; the response then carries the
+        range's ``ContentLength``. Compressed objects are decompressed transparently, so
+        sizes and ranges always refer to the original content.
+        """
+        params: dict[str, object] = {
+            "Bucket": self._bucket_for_key(investigation_id, key),
+            "Key": key,
+        }
+        if start is None and end is None:
+            return self._decoded(self.client.get_object(**params))
+        response = self.client.get_object(
+            **params,
+            Range=f"bytes={start or 0}-{'' if end is None else end}",
+        )
+        if not self._is_compressed(response):
+            return response
+        # The range addressed compressed bytes; decompress the whole object instead.
+        response["Body"].close()
+        return self._decoded(self.client.get_object(**params), start or 0, end)
+
+    @staticmethod
+    def _is_compressed(response: dict[str, Any]) -> bool:
+        return (response.get("Metadata") or {}).get(CODEC_METADATA_KEY) == ZSTD
+
+    def _decoded(
+        self,
+        response: dict[str, Any],
+        start: int = 0,
+        end: int | None = None,
+    ) -> dict[str, Any]:
+        """Wrap a compressed object's body so it reads as the original (sub)range."""
+        if not self._is_compressed(response):
+            return response
+        size = int(response["Metadata"].get(SIZE_METADATA_KEY, 0))
+        last = size - 1 if end is None else min(end, size - 1)
+        length = max(last - start + 1, 0)
+        return {
+            **response,
+            "Body": ZstdBody(response["Body"], start, length),
+            "ContentLength": length,
+        }
+
+    def iter_object(
+        self,
+        investigation_id: str,
+        key: str,
+        start: int | None = None,
+        end: int | None = None,
+        chunk_size: int = STREAM_CHUNK_BYTES,
+    ) -> Iterator[bytes]:
+        """Yield an object, or an inclusive byte range of it, in chunks of ``chunk_size``."""
+        body = self.open_object(investigation_id, key, start, end)["Body"]
+        try:
+            yield from iter(lambda: body.read(chunk_size), b"")
+        finally:
+            body.close()
+
+    @logfire.instrument("download object range", extract_args=False)
+    def download_range(self, investigation_id: str, key: str, start: int, end: int) -> bytes:
+        """Download the inclusive byte range ``start``-``end`` of an object."""
+        return self.open_object(investigation_id, key, start, end)["Body"].read()
+
+    def object_size(self, investigation_id: str, key: str) -> int | None:
+        """Return an object's size in bytes, or None when it does not exist."""
+        try:
+            head = self.client.head_object(
+                Bucket=self._bucket_for_key(investigation_id, key),
+                Key=key,
+            )
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NoSuchBucket", "NotFound"}:
+                return None
+            raise
+        if self._is_compressed(head):
+            return int(head["Metadata"].get(SIZE_METADATA_KEY, 0))
+        return int(head.get("ContentLength", 0))
+
+    @staticmethod
+    def derived_key(document_id: str, name: str) -> str:
+        """Return the object key for data derived from a document, e.g. parsed text."""
+        return f"{document_id}/_derived/{name}.json"
+
+    @logfire.instrument("upload derived bytes", extract_args=False)
+    def upload_derived_bytes(
+        self,
+        investigation_id: str,
+        key: str,
+        content: bytes,
+        content_type: str,
+    ) -> str:
+        """Store bytes derived from a document (e.g. a page range) under an explicit key."""
+        bucket_name = self.ensure_bucket(investigation_id)
+        self._put_object(bucket_name, Key=key, Body=content, ContentType=content_type)
+        return key
+
+    @logfire.instrument("put json object", extract_args=False)
+    def put_json(self, investigation_id: str, key: str, payload: object) -> str:
+        """Store a JSON payload in the investigation bucket and return its key."""
+        bucket_name = self.ensure_bucket(investigation_id)
+        self._put_object(
+            bucket_name,
+            Key=key,
+            Body=json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"),
+            ContentType="application/json",
+        )
+        return key
+
+    def get_json(self, investigation_id: str, key: str) -> object:
+        """Load a JSON payload stored with put_json."""
+        return json.loads(self.download_bytes(investigation_id, key))
+
+    @logfire.instrument("get cached object", extract_args=False)
+    def get_cached_object(self, key: str) -> bytes | None:
+        """Return a cache object's bytes, or None when it does not exist."""
+        try:
+            response = self.client.get_object(Bucket=self.cache_bucket_name(), Key=key)
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NoSuchBucket", "NotFound"}:
+                return None
+            raise
+        return self._decoded(response)["Body"].read()
+
+    def has_cached_object(self, key: str) -> bool:
+        """Return whether a cache object exists."""
+        try:
+            self.client.head_object(Bucket=self.cache_bucket_name(), Key=key)
+        except ClientError as exc:
+            error_code = str(exc.response.get("Error", {}).get("Code", ""))
+            if error_code in {"404", "NoSuchKey", "NoSuchBucket", "NotFound"}:
+                return False
+            raise
+        return True
+
+    @logfire.instrument("put cached object", extract_args=False)
+    def put_cached_object(self, key: str, content: bytes, content_type: str) -> None:
+        """Store a cache object in the shared cache bucket."""
+        bucket_name = self._ensure_bucket_named(self.cache_bucket_name())
+        self._put_object(
+            bucket_name,
+            Key=key,
+            Body=content,
+            ContentType=content_type,
+        )
 
     def object_url(self, investigation_id: str, key: str) -> str:
         """Return a stable URI-like path for object provenance."""
-        bucket_name = self._bucket_name_for(investigation_id)
+        bucket_name = self._bucket_for_key(investigation_id, key)
         return f"s3://{bucket_name}/{key}"
@@ -0,0 +1,80 @@
+"""Bounded TTL/LRU cache for Yente responses."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+
+class YenteCache:
+    """Keep recent Yente responses in process, evicting the least recently used first.
+
+    Entries expire after ``ttl_seconds``. The whole cache is dropped when the indexed
+    dataset version changes, since cached results may then refer to stale entities.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(max_entries, 0)
+        self.ttl_seconds = ttl_seconds
+        self.dataset_version: str | None = None
+        self._lock = Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> object | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: object) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def set_dataset_version(self, version: str) -> bool:
+        """Record the indexed dataset version, clearing the cache when it changed."""
+        with self._lock:
+            changed = self.dataset_version is not None and version != self.dataset_version
+            self.dataset_version = version
+            if changed:
+                self._entries.clear()
+                self._stats["invalidations"] += 1
+            return changed
+
+    def stats(self) -> dict[str, object]:
+        """Return entry counts, hit/miss/eviction counters and the hit rate."""
+        with self._lock:
+            counters = dict(self._stats)
+            entries = len(self._entries)
+        total = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": round(counters["hits"] / total, 4) if total else 0.0,
+            "dataset_version": self.dataset_version,
+        }
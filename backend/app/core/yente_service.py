@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+from importlib.util import find_spec
+from time import monotonic
 from typing import Any
 from urllib import parse
 
@@ -10,6 +12,7 @@ import httpx
 import logfire
 
 from app.config import settings
+from app.core.yente_cache import YenteCache
 from app.models.enrich import YenteSearchResponse, YenteSearchResult
 
 
@@ -20,12 +23,52 @@ class YenteServiceError(Exception):
 class YenteService:
     """Search OpenSanctions entities through Yente."""
 
-    @logfire.instrument("request yente json", extract_args=False)
-    def _request_json(self, path: str, params: dict[str, str] | None = None) -> dict[str, Any]:
-        url = f"{settings.yente_url.rstrip('/')}/{path.lstrip('/')}"
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: YenteCache | None = None,
+    ) -> None:
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self.cache = cache or YenteCache(
+            settings.yente_cache_max_entries,
+            settings.yente_cache_ttl_seconds,
+        )
+        self._version_checked_at: float | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, created on first use inside the running event loop."""
+        if self._client is None or self._client.is_closed:
+            http2 = settings.yente_http2 and find_spec("h2") is not None
+            if settings.yente_http2 and not http2:
+                logfire.warn("YENTE_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                base_url=f"{settings.yente_url.rstrip('/')}/",
+                timeout=settings.yente_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=settings.yente_max_connections,
+                    max_keepalive_connections=settings.yente_max_keepalive_connections,
+                    keepalive_expiry=settings.yente_keepalive_expiry_seconds,
+                ),
+                http2=http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections; the next request opens a new client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
+    @logfire.instrument("request yente json", extract_args=False)
+    async def _request_json(
+        self,
+        path: str,
+        params: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
         try:
-            response = httpx.get(url, params=params, timeout=settings.yente_timeout_seconds)
+            response = await self._get_client().get(path.lstrip("/"), params=params)
             response.raise_for_status()
             payload = response.json()
         except httpx.HTTPStatusError as exc:
@@ -41,6 +84,42 @@ class YenteService:
             raise YenteServiceError(msg)
         return payload
 
+    async def _refresh_dataset_version(self) -> None:
+        """Clear the cache when the dataset's index version in ``/catalog`` has changed.
+
+        The catalog is read at most every ``YENTE_VERSION_CHECK_SECONDS``; a failed read keeps
+        the cache, since the search that follows reports the outage itself.
+        """
+        if not self.cache.enabled:
+            return
+        now = monotonic()
+        if (
+            self._version_checked_at is not None
+            and now - self._version_checked_at < settings.yente_version_check_seconds
+        ):
+            return
+        self._version_checked_at = now
+        try:
+            catalog = await self._request_json("catalog")
+        except YenteServiceError as exc:
+            logfire.warn("yente catalog check failed", error=str(exc))
+            return
+        version = self._dataset_version(catalog, settings.yente_dataset)
+        if version is not None and self.cache.set_dataset_version(version):
+            logfire.info(
+                "yente dataset version changed, cache cleared",
+                dataset=settings.yente_dataset,
+                version=version,
+            )
+
+    @staticmethod
+    def _dataset_version(catalog: dict[str, Any], dataset: str) -> str | None:
+        for item in catalog.get("datasets", []):
+            if isinstance(item, dict) and item.get("name") == dataset:
+                version = item.get("index_version") or item.get("version")
+                return str(version) if version else None
+        return None
+
     @staticmethod
     def _normalize_properties(raw: object) -> dict[str, list[str]]:
         if not isinstance(raw, dict):
@@ -109,12 +188,18 @@ class YenteService:
                 ids.update(YenteService._extract_entity_ids(nested))
         return ids
 
-    def search(self, query: str, limit: int = 20) -> YenteSearchResponse:
+    async def search(self, query: str, limit: int = 20) -> YenteSearchResponse:
         q = query.strip()
         if not q:
             return YenteSearchResponse(query=query, total=0, results=[])
 
-        payload = self._request_json(
+        await self._refresh_dataset_version()
+        cache_key = ("search", settings.yente_dataset, q, limit)
+        cached = self.cache.get(cache_key)
+        if isinstance(cached, YenteSearchResponse):
+            return cached.model_copy(deep=True)
+
+        payload = await self._request_json(
             f"search/{parse.quote(settings.yente_dataset, safe='')}",
             params={"q": q, "limit": str(limit)},
         )
@@ -132,12 +217,21 @@ class YenteService:
         if not isinstance(total, int):
             total = len(results)
 
-        return YenteSearchResponse(query=q, total=total, results=results)
+        response = YenteSearchResponse(query=q, total=total, results=results)
+        self.cache.put(cache_key, response.model_copy(deep=True))
+        return response
+
+    async def adjacent_entity_ids(self, entity_id: str) -> list[str]:
+        await self._refresh_dataset_version()
+        cache_key = ("adjacent", settings.yente_dataset, entity_id)
+        cached = self.cache.get(cache_key)
+        if isinstance(cached, tuple):
+            return list(cached)
 
-    def adjacent_entity_ids(self, entity_id: str) -> list[str]:
-        payload = self._request_json(f"entities/{parse.quote(entity_id, safe='')}/adjacent")
+        payload = await self._request_json(f"entities/{parse.quote(entity_id, safe='')}/adjacent")
         adjacent = payload.get("adjacent")
         if not isinstance(adjacent, dict):
+            self.cache.put(cache_key, ())
             return []
 
         linked_ids: set[str] = set()
@@ -153,4 +247,5 @@ class YenteService:
                 linked_ids.update(self._extract_entity_ids(result.get("properties", {})))
 
         linked_ids.discard(entity_id)
+        self.cache.put(cache_key, tuple(sorted(linked_ids)))
         return sorted(linked_ids)
@@ -10,7 +10,7 @@ except ImportError:  # pragma: no cover - optional dependency
     RedisConnectionError = ConnectionError
 
 from app.api.auth import require_auth
-from app.api.deps import get_graph_service
+from app.api.deps import get_graph_service, get_yente_service
 from app.api.routes import (
     auth,
     chat,
@@ -68,6 +68,11 @@ async def startup_event() -> None:
     app.state.logfire_configured = True
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await get_yente_service().aclose()
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
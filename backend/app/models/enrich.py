@@ -31,3 +31,18 @@ class YenteLinkResponse(BaseModel):
     entity_id: str
     linked_to: list[str]
     links_applied: int
+
+
+class YenteCacheStats(BaseModel):
+    """Hit/miss counters and size of the Yente response cache."""
+
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    invalidations: int
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    dataset_version: str | None = None
@@ -37,6 +37,18 @@ class EntityExpand(BaseModel):
     edges: list[dict]  # Edge information including relationship type
 
 
+class EntityAppearance(BaseModel):
+    """An entity in another investigation that shares match keys."""
+
+    investigation_id: str
+    entity_id: str
+    schema_: str = Field(..., alias="schema")
+    caption: str
+    matched_keys: list[str]
+
+    model_config = {"populate_by_name": True}
+
+
 class DuplicateCandidate(BaseModel):
     """Potential duplicate pair for manual review."""
 
@@ -59,3 +71,27 @@ class MergeEntitiesResponse(BaseModel):
 
     target: Entity
     merged_source_ids: list[str]
+
+
+class BulkMergeEntitiesRequest(BaseModel):
+    """Request model for merging many duplicate clusters in one call."""
+
+    clusters: list[MergeEntitiesRequest] = Field(..., min_length=1)
+
+
+class MergeClusterResult(BaseModel):
+    """Outcome of a single cluster within a bulk merge."""
+
+    target_id: str
+    status: str  # merged | failed
+    merged_source_ids: list[str] = Field(default_factory=list)
+    target: Entity | None = None
+    error: str | None = None
+
+
+class BulkMergeEntitiesResponse(BaseModel):
+    """Response payload after a bulk merge."""
+
+    results: list[MergeClusterResult]
+    merged: int
+    failed: int
@@ -1,6 +1,8 @@
 """Ingestion response models."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.config import settings
 
 
 class IngestResult(BaseModel):
@@ -22,3 +24,77 @@ class ExtractionStatus(BaseModel):
     status: str
     result: dict | None = None
     error: str | None = None
+
+
+class BatchIngestResult(BaseModel):
+    """Response for bulk document uploads."""
+
+    batch_id: str
+    documents: int
+    workflow_ids: list[str]
+    errors: list[str]
+    status: str = "processing"
+    message: str | None = None
+
+
+class BatchIngestStatus(BaseModel):
+    """Aggregate progress of the extraction workflows started by a bulk upload."""
+
+    batch_id: str
+    total: int
+    counts: dict[str, int]
+    completed: int
+    failed: int
+    progress: float
+    errors: list[str]
+
+
+class ExtractionMetrics(BaseModel):
+    """Per-stage timing and throughput across recent extraction workflows."""
+
+    workflows: int
+    stages: dict[str, dict]
+    queue_wait_seconds: dict[str, dict[str, float]]
+    bottleneck: str | None = None
+
+
+class UploadRequest(BaseModel):
+    """Request to upload a document directly to object storage."""
+
+    filename: str = Field(..., min_length=1)
+    content_type: str | None = None
+    size_bytes: int = Field(..., gt=0, le=settings.s3_presign_max_upload_mb * 1024 * 1024)
+
+
+class PresignedPart(BaseModel):
+    """Presigned URL for one part of a multipart upload."""
+
+    part_number: int
+    url: str
+
+
+class UploadTicket(BaseModel):
+    """Presigned URLs for a direct upload: one PUT URL, or one URL per multipart part."""
+
+    document_id: str
+    key: str
+    expires_in: int
+    url: str | None = None
+    headers: dict[str, str] = Field(default_factory=dict)
+    upload_id: str | None = None
+    part_size: int | None = None
+    parts: list[PresignedPart] = Field(default_factory=list)
+
+
+class CompletedPart(BaseModel):
+    """Part number and ETag returned by storage for an uploaded part."""
+
+    part_number: int = Field(..., ge=1)
+    etag: str
+
+
+class UploadCompletion(BaseModel):
+    """Request to finish a direct upload and queue the document for extraction."""
+
+    upload_id: str | None = None
+    parts: list[CompletedPart] = Field(default_factory=list)
@@ -0,0 +1,55 @@
+"""Extraction worker entry point: runs queued DBOS extraction workflows.
+
+Run with ``python -m app.worker`` alongside an API started with ``EXTRACTION_MODE=enqueue``.
+"""
+
+import signal
+import threading
+from types import FrameType
+
+import logfire
+from dbos import DBOS
+
+from app.config import settings
+from app.core.extraction.workflow_service import launch_dbos
+
+
+def _configure_logfire() -> None:
+    logfire_environment = settings.logfire_environment.strip() or (
+        "development" if settings.debug else "production"
+    )
+    logfire.configure(
+        service_name=f"{settings.logfire_service_name}-worker",
+        service_version="0.1.0",
+        environment=logfire_environment,
+        send_to_logfire=bool(settings.logfire_token),
+        token=settings.logfire_token or None,
+    )
+    logfire.instrument_httpx()
+    logfire.instrument_pydantic()
+
+
+def main() -> None:
+    """Launch DBOS and process extraction queues until interrupted."""
+    _configure_logfire()
+    stop = threading.Event()
+
+    def _request_stop(signum: int, frame: FrameType | None) -> None:
+        _ = signum, frame
+        stop.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+
+    launch_dbos()
+    logfire.info(
+        "extraction worker started",
+        worker_concurrency=settings.extraction_worker_concurrency,
+        investigation_concurrency=settings.extraction_investigation_concurrency,
+    )
+    stop.wait()
+    DBOS.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Tests for bulk document uploads."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+import threading
+import time
+import zipfile
+from typing import IO, Any, cast
+
+from boto3.exceptions import S3UploadFailedError
+
+from app.config import settings
+from app.core.batch_ingest_service import BatchIngestService, BatchUpload
+from app.models.entity import Entity, EntityCreate
+
+
+class FakeEntityService:
+    def __init__(self) -> None:
+        self.batches: list[list[EntityCreate]] = []
+
+    def create_many(
+        self, investigation_id: str, payloads: list[EntityCreate]
+    ) -> tuple[dict[int, Entity], dict[int, str]]:
+        self.batches.append(payloads)
+        created = {
+            index: Entity(id=str(payload.id), schema="Document", properties=payload.properties)
+            for index, payload in enumerate(payloads)
+        }
+        return created, {}
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.json: dict[str, object] = {}
+
+    def upload_stream(
+        self,
+        investigation_id: str,
+        document_id: str,
+        filename: str,
+        fileobj: IO[bytes],
+        content_type: str | None,
+    ) -> str:
+        key = f"{document_id}/{filename}"
+        self.objects[key] = fileobj.read()
+        return key
+
+    def delete_document_object(self, investigation_id: str, document_id: str, key: str) -> None:
+        del self.objects[key]
+
+    def put_json(self, investigation_id: str, key: str, payload: object) -> str:
+        self.json[key] = payload
+        return key
+
+    def get_json(self, investigation_id: str, key: str) -> object:
+        return self.json[key]
+
+
+class FakeWorkflows:
+    def __init__(self) -> None:
+        self.enqueued: list[dict[str, Any]] = []
+        self.batches: list[str] = []
+
+    def enqueue_many(
+        self, investigation_id: str, documents: list[dict[str, Any]], batch_workflow_id: str
+    ) -> list[str]:
+        self.batches.append(batch_workflow_id)
+        self.enqueued.extend(documents)
+        return [str(document["workflow_id"]) for document in documents]
+
+    def count_by_status(self, workflow_id_prefix: str) -> dict[str, int]:
+        matching = [item for item in self.enqueued if item["workflow_id"].startswith(workflow_id_prefix)]
+        return {"SUCCESS": len(matching) - 1, "ENQUEUED": 1}
+
+
+def _zip(entries: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("mail/", b"")
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def _tar(entries: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in entries.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+def test_batch_uploads_archive_entries_and_fans_out_workflows(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "ingest_batch_max_entry_mb", 1)
+    monkeypatch.setattr(settings, "ingest_batch_upload_concurrency", 2)
+    entities = FakeEntityService()
+    storage = FakeStorage()
+    workflows = FakeWorkflows()
+    service = BatchIngestService(cast("Any", entities), cast("Any", storage), cast("Any", workflows))
+
+    uploads = [
+        BatchUpload(
+            "leak.zip",
+            _zip(
+                {
+                    "mail/a.eml": b"From: a@example.com",
+                    "mail/b.eml": b"From: b@example.com",
+                    "__MACOSX/mail/._a.eml": b"resource fork",
+                    "mail/huge.pdf": b"x" * (1024 * 1024 + 1),
+                }
+            ),
+            "application/zip",
+        ),
+        BatchUpload("filings.tar.gz", _tar({"10k.txt": b"FORM 10-K"}), "application/gzip"),
+        BatchUpload("memo.txt", io.BytesIO(b"memo"), "text/markdown"),
+        BatchUpload("empty.txt", io.BytesIO(b""), "text/plain"),
+    ]
+    result = service.ingest("inv-1", uploads)
+
+    assert result.documents == 4
+    assert len(entities.batches) == 1
+    assert sorted(payload.properties["fileName"][0] for payload in entities.batches[0]) == [
+        "10k.txt",
+        "a.eml",
+        "b.eml",
+        "memo.txt",
+    ]
+    assert {
+        payload.properties["fileName"][0]: payload.properties["mimeType"][0]
+        for payload in entities.batches[0]
+    } == {
+        "10k.txt": "text/plain",
+        "a.eml": "message/rfc822",
+        "b.eml": "message/rfc822",
+        "memo.txt": "text/markdown",
+    }
+    assert len(storage.objects) == 4
+    assert all(wid.startswith(f"{result.batch_id}-") for wid in result.workflow_ids)
+    assert [item["storage_key"] for item in workflows.enqueued] == [
+        f"{payload.id}/{payload.properties['fileName'][0]}" for payload in entities.batches[0]
+    ]
+    assert any("huge.pdf" in error for error in result.errors)
+    assert any("empty.txt" in error for error in result.errors)
+    assert workflows.batches == [result.batch_id]
+
+    status = service.status("inv-1", result.batch_id)
+    assert status is not None
+    assert status.total == 4
+    assert status.completed == 3
+    assert status.progress == 0.75
+
+
+def test_mbox_is_streamed_into_one_document_per_message(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "ingest_batch_max_entry_mb", 1)
+    mbox = b"".join(
+        [
+            b"From alice@example.com Mon Jan  1 00:00:00 2024\n",
+            b"From: alice@example.com\nSubject: Transfer\n\n",
+            b"Wire sent to Acme Holdings.\n>From the account of Bob.\n\n",
+            b"From bob@example.com Tue Jan  2 00:00:00 2024\n",
+            b"From: bob@example.com\nSubject: Huge\n\n",
+            b"y" * (1024 * 1024 + 1) + b"\n\n",
+            b"From carol@example.com Wed Jan  3 00:00:00 2024\n",
+            b"From: carol@example.com\nSubject: Re: Transfer\n\nReceived.\n",
+        ]
+    )
+    entities = FakeEntityService()
+    storage = FakeStorage()
+    service = BatchIngestService(
+        cast("Any", entities), cast("Any", storage), cast("Any", FakeWorkflows())
+    )
+
+    result = service.ingest("inv-1", [BatchUpload("leak.mbox", io.BytesIO(mbox), None)])
+
+    assert result.documents == 2
+    assert [payload.properties["fileName"][0] for payload in entities.batches[0]] == [
+        "message-000001.eml",
+        "message-000003.eml",
+    ]
+    assert [payload.properties["mimeType"][0] for payload in entities.batches[0]] == [
+        "message/rfc822",
+        "message/rfc822",
+    ]
+    first = storage.objects[f"{entities.batches[0][0].id}/message-000001.eml"]
+    assert first.startswith(b"From: alice@example.com")
+    assert b"\nFrom the account of Bob." in first
+    assert result.errors == ["message-000002.eml: entry exceeds 1048576 bytes"]
+
+
+class RejectingEntityService(FakeEntityService):
+    def create_many(
+        self, investigation_id: str, payloads: list[EntityCreate]
+    ) -> tuple[dict[int, Entity], dict[int, str]]:
+        created, _ = super().create_many(investigation_id, payloads)
+        return {index: entity for index, entity in created.items() if index != 1}, {
+            1: "Entity already exists"
+        }
+
+
+class SlowStorage(FakeStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def upload_stream(self, *args: Any, **kwargs: Any) -> str:
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return super().upload_stream(*args, **kwargs)
+
+
+def test_rejected_documents_are_removed_and_buffered_bytes_are_bounded(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "ingest_batch_max_entry_mb", 1)
+    monkeypatch.setattr(settings, "ingest_batch_buffer_mb", 1)
+    monkeypatch.setattr(settings, "ingest_batch_upload_concurrency", 4)
+    storage = SlowStorage()
+    workflows = FakeWorkflows()
+    service = BatchIngestService(
+        cast("Any", RejectingEntityService()), cast("Any", storage), cast("Any", workflows)
+    )
+
+    archive = _zip({f"mail/{index}.eml": b"From: a@example.com" for index in range(3)})
+    result = service.ingest("inv-1", [BatchUpload("leak.zip", archive, None)])
+
+    assert result.documents == 2
+    assert result.errors == ["1.eml: Entity already exists"]
+    assert sorted(key.rsplit("/", 1)[-1] for key in storage.objects) == ["0.eml", "2.eml"]
+    assert [item["workflow_id"] for item in workflows.enqueued] == result.workflow_ids
+    # A 1 MB buffer holds a single 1 MB entry, so entries upload one at a time.
+    assert storage.max_active == 1
+
+
+class FailingStorage(FakeStorage):
+    def upload_stream(self, *args: Any, **kwargs: Any) -> str:
+        if kwargs["filename"] == "1.eml":
+            msg = "Failed to upload 1.eml: An error occurred (InternalError)"
+            raise S3UploadFailedError(msg)
+        return super().upload_stream(*args, **kwargs)
+
+
+def test_failed_upload_is_reported_without_failing_the_batch(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "ingest_batch_max_entry_mb", 1)
+    monkeypatch.setattr(settings, "ingest_batch_upload_concurrency", 2)
+    storage = FailingStorage()
+    workflows = FakeWorkflows()
+    service = BatchIngestService(
+        cast("Any", FakeEntityService()), cast("Any", storage), cast("Any", workflows)
+    )
+
+    archive = _zip({f"mail/{index}.eml": b"From: a@example.com" for index in range(3)})
+    result = service.ingest("inv-1", [BatchUpload("leak.zip", archive, None)])
+
+    assert result.documents == 2
+    assert len(result.errors) == 1
+    assert result.errors[0].startswith("1.eml: upload failed:")
+    assert sorted(key.rsplit("/", 1)[-1] for key in storage.objects) == ["0.eml", "2.eml"]
+    assert len(workflows.enqueued) == 2
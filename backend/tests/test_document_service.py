@@ -0,0 +1,135 @@
+"""Tests for document parsing and the parse cache."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from app.config import settings
+from app.core.extraction import document_service
+from app.core.extraction.document_service import DocumentService
+from app.core.extraction.parse_cache import ParseCache
+from app.core.extraction.parse_pool import ParsePool
+from app.core.extraction.pdf_pages import page_ranges
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@dataclass
+class FakeExtractionResult:
+    content: str
+    mime_type: str
+    metadata: dict[str, object] = field(default_factory=dict)
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def get_cached_object(self, key: str) -> bytes | None:
+        return self.objects.get(key)
+
+    def has_cached_object(self, key: str) -> bool:
+        return key in self.objects
+
+    def put_cached_object(self, key: str, content: bytes, content_type: str) -> None:
+        self.objects[key] = content
+
+
+def test_identical_bytes_skip_kreuzberg_on_second_parse(monkeypatch: Any) -> None:
+    calls: list[str] = []
+
+    def fake_extract(content: bytes, mime_type: str) -> FakeExtractionResult:
+        calls.append(mime_type)
+        return FakeExtractionResult(content="FORM 10-K Amazon.com, Inc.", mime_type=mime_type)
+
+    monkeypatch.setattr(document_service, "extract_bytes_sync", fake_extract)
+    storage = FakeStorage()
+    service = DocumentService(parse_cache=ParseCache(cast("Any", storage)))
+
+    first = service.extract(b"%PDF-1.7 filing", "filing.pdf", None)
+    second = service.extract(b"%PDF-1.7 filing", "copy-in-other-case.pdf", None)
+
+    assert calls == ["application/pdf"]
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["content"] == first["content"]
+    assert second["document_type"] == "sec_filing"
+    assert len(storage.objects) == 1
+    assert next(iter(storage.objects)).startswith("parsed/")
+
+
+def test_parse_pool_parses_in_worker_and_recovers_after_timeout() -> None:
+    pytest.importorskip("kreuzberg")
+    pool = ParsePool(
+        max_workers=1, timeout_seconds=60, memory_limit_mb=settings.parse_memory_limit_mb
+    )
+    try:
+        parsed = pool.parse(b"FORM 10-K Amazon.com, Inc.", "text/plain")
+        assert "Amazon.com" in str(parsed["content"])
+
+        pool.timeout_seconds = 0.0001
+        with pytest.raises(RuntimeError, match="timed out"):
+            pool.parse(b"FORM 10-K Amazon.com, Inc.", "text/plain")
+
+        pool.timeout_seconds = 60
+        parsed = pool.parse(b"Recovered", "text/plain")
+        assert "Recovered" in str(parsed["content"])
+    finally:
+        pool.shutdown()
+
+
+def _blank_pdf(pages: int) -> bytes:
+    pypdf = pytest.importorskip("pypdf")
+    writer = pypdf.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_large_pdf_splits_into_ordered_ranges_and_joins_into_cache() -> None:
+    storage = FakeStorage()
+    service = DocumentService(parse_cache=ParseCache(cast("Any", storage)))
+    content = _blank_pdf(7)
+
+    assert page_ranges(7, 3) == [(1, 3), (4, 6), (7, 7)]
+    assert list(service.split_pages(content, "big.pdf", None, min_pages=10, range_size=3)) == []
+    lazy = service.split_pages(content, "big.pdf", None, min_pages=5, range_size=3)
+    first_range = next(lazy)
+    assert first_range[:2] == (1, 3)
+    ranges = [first_range, *lazy]
+    assert [(first, last) for first, last, _ in ranges] == [(1, 3), (4, 6), (7, 7)]
+    assert all(part.startswith(b"%PDF") for _, _, part in ranges)
+
+    parts: list[dict[str, object]] = [
+        {"content": f"pages {first}-{last}", "mime_type": "application/pdf", "metadata": {}}
+        for first, last, _ in ranges
+    ]
+    cache_key = ParseCache(cast("Any", storage)).cache_key(content, "application/pdf")
+    joined = service.join_pages(parts, "big.pdf", cache_key=cache_key)
+
+    assert joined["content"] == "pages 1-3\n\npages 4-6\n\npages 7-7"
+    assert cache_key in storage.objects
+    # Once the joined parse is cached, the document is served whole from the cache.
+    assert list(service.split_pages(content, "big.pdf", None, min_pages=5, range_size=3)) == []
+
+
+def test_downloaded_pdf_path_splits_and_keys_like_its_bytes(tmp_path: Path) -> None:
+    storage = FakeStorage()
+    service = DocumentService(parse_cache=ParseCache(cast("Any", storage)))
+    content = _blank_pdf(7)
+    path = tmp_path / "big.pdf"
+    path.write_bytes(content)
+
+    from_path = list(service.split_pages(path, "big.pdf", None, min_pages=5, range_size=3))
+    from_bytes = list(service.split_pages(content, "big.pdf", None, min_pages=5, range_size=3))
+    assert [(first, last) for first, last, _ in from_path] == [(1, 3), (4, 6), (7, 7)]
+    assert len(from_path) == len(from_bytes)
+    cache = ParseCache(cast("Any", storage))
+    assert cache.cache_key(path, "application/pdf") == cache.cache_key(content, "application/pdf")
@@ -0,0 +1,347 @@
+"""Tests for entity merge behavior."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, cast
+
+import pytest
+
+from app.core.entity_service import EntityService
+from app.core.match_keys import folded_key, match_keys, token_key
+from app.models.entity import EntityCreate, MergeEntitiesRequest
+
+
+@dataclass
+class FakeResult:
+    result_set: list[list[object]]
+
+
+@dataclass
+class FakeNode:
+    properties: dict[str, Any]
+
+
+class FakeGraph:
+    def __init__(self) -> None:
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.edges: list[dict[str, Any]] = []
+        self.queries: list[str] = []
+
+    def add_node(self, entity_id: str, schema: str, name: str) -> None:
+        self.nodes[entity_id] = {"id": entity_id, "schema": schema, "_name": [name]}
+
+    def add_edge(self, source: str, target: str, rel_type: str, edge_id: str) -> None:
+        self.edges.append(
+            {"source": source, "target": target, "type": rel_type, "properties": {"id": edge_id}}
+        )
+
+    def query(self, query: str, params: dict[str, object] | None = None) -> FakeResult:
+        self.queries.append(query)
+        params = params or {}
+
+        if "match_identifiers IS NULL" in query:
+            return FakeResult(
+                [
+                    [FakeNode(dict(node))]
+                    for node in self.nodes.values()
+                    if "match_identifiers" not in node
+                ]
+            )
+
+        if "UNWIND a.match_tokens AS key" in query:
+            schema = params.get("schema")
+            nodes = sorted(self.nodes.values(), key=lambda node: node["id"])
+            return FakeResult(
+                [
+                    [FakeNode(dict(left)), FakeNode(dict(right))]
+                    for left in nodes
+                    for right in nodes
+                    if left["id"] < right["id"]
+                    and left["schema"] == right["schema"]
+                    and schema in {None, left["schema"]}
+                    and any(
+                        set(left[key]) & set(right[key])
+                        for key in ("match_folded", "match_tokens", "match_identifiers")
+                    )
+                ]
+            )
+
+        if query.startswith("MATCH (n:Entity {id: $entity_id}) RETURN n LIMIT 1"):
+            node = self.nodes.get(str(params["entity_id"]))
+            return FakeResult([[FakeNode(dict(node))]] if node else [])
+
+        if query.startswith("UNWIND $rows AS row CREATE (n:Entity"):
+            rows = cast("list[dict[str, Any]]", params["rows"])
+            for row in rows:
+                self.nodes[row["id"]] = {"id": row["id"], "schema": row["schema"], **row["properties"]}
+            return FakeResult([[FakeNode(dict(self.nodes[row["id"]]))] for row in rows])
+
+        if "SET n += row.keys" in query:
+            for row in cast("list[dict[str, Any]]", params["rows"]):
+                self.nodes[row["id"]].update(row["keys"])
+            return FakeResult([])
+
+        if query.startswith("MATCH (n:Entity) WHERE n.id IN $ids RETURN n"):
+            ids = cast("list[str]", params["ids"])
+            return FakeResult([[FakeNode(dict(self.nodes[i]))] for i in ids if i in self.nodes])
+
+        if query.startswith("MATCH (a:Entity)-[r]->(b:Entity)"):
+            ids = set(cast("list[str]", params["ids"]))
+            return FakeResult(
+                [
+                    [edge["source"], edge["type"], dict(edge["properties"]), edge["target"]]
+                    for edge in self.edges
+                    if edge["source"] in ids or edge["target"] in ids
+                ]
+            )
+
+        if query.startswith("UNWIND $rows AS row MATCH (a:Entity"):
+            rel_type = query.split("[r:", 1)[1].split(" ", 1)[0].split("]", 1)[0]
+            for row in cast("list[dict[str, Any]]", params["rows"]):
+                self.edges.append(
+                    {
+                        "source": row["source"],
+                        "target": row["target"],
+                        "type": rel_type,
+                        "properties": dict(row["properties"]),
+                    }
+                )
+            return FakeResult([])
+
+        if "DETACH DELETE n" in query:
+            ids = set(cast("list[str]", params.get("ids", [params.get("entity_id")])))
+            self.nodes = {key: node for key, node in self.nodes.items() if key not in ids}
+            self.edges = [
+                edge
+                for edge in self.edges
+                if edge["source"] not in ids and edge["target"] not in ids
+            ]
+            return FakeResult([])
+
+        if "SET n = row.properties" in query:
+            for row in cast("list[dict[str, Any]]", params["rows"]):
+                self.nodes[row["id"]] = dict(row["properties"])
+            return FakeResult([])
+
+        raise AssertionError(f"Unexpected query: {query}")
+
+
+class FakeGraphService:
+    def __init__(self) -> None:
+        self.graphs: dict[str, FakeGraph] = {}
+        self.match_refs: dict[tuple[str, str], dict[str, Any]] = {}
+
+    @property
+    def graph(self) -> FakeGraph:
+        return self.create_investigation_graph("inv-1")
+
+    def create_investigation_graph(self, investigation_id: str) -> FakeGraph:
+        return self.graphs.setdefault(investigation_id, FakeGraph())
+
+    def upsert_match_refs(self, investigation_id: str, refs: list[dict[str, Any]]) -> None:
+        for ref in refs:
+            self.match_refs[(investigation_id, ref["entity_id"])] = {
+                "investigation_id": investigation_id,
+                **ref,
+            }
+
+    def delete_match_refs(self, investigation_id: str, entity_ids: list[str] | None = None) -> None:
+        for key in list(self.match_refs):
+            if key[0] == investigation_id and (entity_ids is None or key[1] in entity_ids):
+                del self.match_refs[key]
+
+    def find_match_refs(self, keys: list[str]) -> list[dict[str, Any]]:
+        return [
+            {**ref, "matched_keys": [key for key in keys if key in ref["keys"]]}
+            for ref in self.match_refs.values()
+            if set(keys) & set(ref["keys"])
+        ]
+
+
+class FakeFTMService:
+    def validate_entity_input(self, schema: str, properties: dict[str, list[str]]) -> None:
+        _ = schema, properties
+
+
+def _service() -> tuple[EntityService, FakeGraph]:
+    service, graph_service = _service_with_index()
+    return service, graph_service.graph
+
+
+def _service_with_index() -> tuple[EntityService, FakeGraphService]:
+    EntityService._backfilled_investigations.clear()
+    graph_service = FakeGraphService()
+    service = EntityService(
+        graph_service=cast("Any", graph_service),
+        ftm_service=cast("Any", FakeFTMService()),
+    )
+    return service, graph_service
+
+
+def test_bulk_merge_applies_clusters_and_reports_failures() -> None:
+    service, graph = _service()
+    graph.add_node("p1", "Person", "Jeff Bezos")
+    graph.add_node("p2", "Person", "Jeffrey P. Bezos")
+    graph.add_node("c1", "Company", "Amazon")
+    graph.add_node("c2", "Company", "Amazon.com")
+    graph.add_node("c3", "Company", "Amazon Inc")
+    graph.add_edge("p2", "c2", "DIRECTORSHIP", "edge-1")
+    graph.add_edge("p1", "p2", "ASSOCIATE", "edge-2")
+
+    response = service.merge_entities_bulk(
+        "inv-1",
+        [
+            MergeEntitiesRequest(source_ids=["p1", "p2"], target_id="p1"),
+            MergeEntitiesRequest(source_ids=["c1", "c2"], target_id="c1"),
+            MergeEntitiesRequest(source_ids=["c2", "c3"], target_id="c3"),
+            MergeEntitiesRequest(source_ids=["p1", "missing"], target_id="missing"),
+        ],
+    )
+
+    assert response.merged == 2
+    assert response.failed == 2
+    assert [result.status for result in response.results] == [
+        "merged",
+        "merged",
+        "failed",
+        "failed",
+    ]
+    assert "more than one cluster" in str(response.results[2].error)
+
+    person = response.results[0].target
+    assert person is not None
+    assert person.properties["name"] == ["Jeff Bezos", "Jeffrey P. Bezos"]
+    assert set(graph.nodes) == {"p1", "c1", "c3"}
+    assert graph.edges == [
+        {
+            "source": "p1",
+            "target": "c1",
+            "type": "DIRECTORSHIP",
+            "properties": {"id": "edge-1"},
+        }
+    ]
+    assert sum("DETACH DELETE" in query for query in graph.queries) == 1
+
+
+def test_bulk_merge_rejected_cluster_does_not_claim_its_ids() -> None:
+    service, graph = _service()
+    graph.add_node("p1", "Person", "Jeff Bezos")
+    graph.add_node("p2", "Person", "Jeffrey P. Bezos")
+    graph.add_node("c1", "Company", "Amazon")
+
+    response = service.merge_entities_bulk(
+        "inv-1",
+        [
+            MergeEntitiesRequest(source_ids=["p1", "c1"], target_id="p1"),
+            MergeEntitiesRequest(source_ids=["p1", "p2"], target_id="p1"),
+        ],
+    )
+
+    assert [result.status for result in response.results] == ["failed", "merged"]
+    assert "same schema" in str(response.results[0].error)
+    assert set(graph.nodes) == {"p1", "c1"}
+
+
+def test_single_merge_raises_for_schema_mismatch() -> None:
+    service, graph = _service()
+    graph.add_node("p1", "Person", "Jeff Bezos")
+    graph.add_node("c1", "Company", "Amazon")
+
+    with pytest.raises(ValueError, match="same schema"):
+        service.merge_entities("inv-1", ["p1", "c1"], "p1", None)
+
+
+def test_match_keys_fold_accents_punctuation_and_token_order() -> None:
+    assert folded_key("  Amazon.com,  Inc. ") == "amazon com inc"
+    assert folded_key("José Müller") == "jose muller"
+    assert token_key("Bezos, Jeffrey P.") == token_key("Jeffrey P. Bezos")
+    assert match_keys({"name": ["Acme Corp", "ACME  corp"]})["match_name"] == ["acme corp"]
+
+
+def test_merged_target_stores_match_keys_and_hides_them() -> None:
+    service, graph = _service()
+    graph.add_node("p1", "Person", "Jeff Bezos")
+    graph.add_node("p2", "Person", "Jeffrey P. Bezos")
+
+    merged = service.merge_entities("inv-1", ["p1", "p2"], "p1", None)
+
+    assert graph.nodes["p1"]["match_name"] == ["jeff bezos", "jeffrey p. bezos"]
+    assert graph.nodes["p1"]["match_folded"] == ["jeff bezos", "jeffrey p bezos"]
+    assert "match_name" not in merged.target.properties
+
+
+def test_find_appearances_uses_cross_investigation_index() -> None:
+    service, graph_service = _service_with_index()
+    graph_service.create_investigation_graph("inv-a").add_node("a1", "Company", "Acme Corp.")
+    graph_service.create_investigation_graph("inv-b").add_node("b1", "Company", "ACME corp")
+    graph_service.create_investigation_graph("inv-c").add_node("c1", "Company", "Contoso")
+
+    # First access to each graph backfills keys and the shared index.
+    service.get("inv-b", "b1")
+    service.get("inv-c", "c1")
+
+    appearances = service.find_appearances("inv-a", "a1")
+
+    assert appearances is not None
+    assert [(item.investigation_id, item.entity_id) for item in appearances] == [("inv-b", "b1")]
+    assert appearances[0].matched_keys == ["name:acme corp"]
+
+    service.delete("inv-b", "b1")
+    assert service.find_appearances("inv-a", "a1") == []
+
+
+def test_create_many_writes_one_batch_and_reports_duplicates() -> None:
+    service, graph_service = _service_with_index()
+    graph = graph_service.graph
+    graph.add_node("c1", "Company", "Amazon")
+
+    created, errors = service.create_many(
+        "inv-1",
+        [
+            EntityCreate(schema="Person", properties={"name": ["Andy Jassy"]}),
+            EntityCreate(id="c1", schema="Company", properties={"name": ["Amazon.com"]}),
+            EntityCreate(schema="Company", properties={"name": ["Whole Foods Market"]}),
+        ],
+    )
+
+    assert sorted(created) == [0, 2]
+    assert errors == {1: "Entity 'c1' already exists"}
+    assert created[0].properties["name"] == ["Andy Jassy"]
+    assert graph.nodes[created[2].id]["match_folded"] == ["whole foods market"]
+    assert sum(query.startswith("UNWIND $rows AS row CREATE") for query in graph.queries) == 1
+    assert ("inv-1", created[0].id) in graph_service.match_refs
+
+
+def test_find_duplicates_scores_only_pairs_blocked_on_stored_keys() -> None:
+    service, graph = _service()
+    graph.add_node("p1", "Person", "Jeffrey P. Bezos")
+    graph.add_node("p2", "Person", "Bezos, Jeffrey P.")
+    graph.add_node("p3", "Person", "Jeff Bezos")
+    graph.add_node("c1", "Company", "Jeffrey P. Bezos")
+    graph.nodes["p1"]["_email"] = ["jeff@example.com"]
+    graph.nodes["p2"]["_email"] = ["JEFF@example.com"]
+
+    candidates = service.find_duplicates("inv-1")
+
+    assert [(item.left.id, item.right.id) for item in candidates] == [("p1", "p2")]
+    assert candidates[0].similarity == 1.0
+    assert candidates[0].reason == "same name tokens, shared identifier"
+    assert service.find_duplicates("inv-1", schema="Company") == []
+    assert not any(query.startswith("MATCH (n:Entity) RETURN n") for query in graph.queries)
+
+
+def test_find_duplicates_blocks_on_identifiers_and_scores_name_similarity() -> None:
+    service, graph = _service()
+    graph.add_node("p1", "Person", "Jon Smith")
+    graph.add_node("p2", "Person", "John Smith")
+    graph.add_node("p3", "Person", "Jane Smith")
+    graph.nodes["p1"]["_passportNumber"] = ["X 1234-567"]
+    graph.nodes["p2"]["_passportNumber"] = ["x1234567"]
+
+    candidates = service.find_duplicates("inv-1", threshold=0.5)
+
+    assert [(item.left.id, item.right.id) for item in candidates] == [("p1", "p2")]
+    assert candidates[0].similarity == 0.9632
+    assert candidates[0].reason == "name similarity 0.95, shared identifier"
+    assert service.find_duplicates("inv-1", threshold=0.97) == []
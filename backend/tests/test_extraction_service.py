@@ -0,0 +1,189 @@
+"""Tests for chunk-level extraction caching."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from app.config import settings
+from app.core.extraction import extraction_service
+from app.core.extraction.extraction_cache import split_chunks
+from app.core.extraction.extraction_service import ExtractionService
+from app.core.extraction.sec_sections import relevant_sections, split_sections
+
+
+@dataclass
+class FakeInterval:
+    start_pos: int
+    end_pos: int
+
+
+@dataclass
+class FakeExtraction:
+    extraction_class: str
+    extraction_text: str
+    char_interval: FakeInterval
+    attributes: dict[str, object]
+
+
+@dataclass
+class FakeAnnotated:
+    document_id: str
+    extractions: list[FakeExtraction]
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def get_cached_object(self, key: str) -> bytes | None:
+        return self.objects.get(key)
+
+    def put_cached_object(self, key: str, content: bytes, content_type: str) -> None:
+        self.objects[key] = content
+
+
+def _fake_extract(calls: list[list[str]]) -> Any:
+    def extract(text_or_documents: list[Any], **_: object) -> list[FakeAnnotated]:
+        calls.append([document.text for document in text_or_documents])
+        annotated = []
+        for document in text_or_documents:
+            start = document.text.find("Acme")
+            extractions = []
+            if start >= 0:
+                extractions.append(
+                    FakeExtraction(
+                        extraction_class="Company",
+                        extraction_text="Acme",
+                        char_interval=FakeInterval(start, start + 4),
+                        attributes={},
+                    )
+                )
+            annotated.append(FakeAnnotated(document.document_id, extractions))
+        return annotated
+
+    return extract
+
+
+def test_split_chunks_cover_text_and_survive_earlier_edits() -> None:
+    paragraphs = [f"Paragraph {index} " + "text " * 20 for index in range(40)]
+    text = "\n\n".join(paragraphs)
+    chunks = split_chunks(text, 600)
+
+    assert "".join(chunk for _, chunk in chunks) == text
+    assert all(text[offset : offset + len(chunk)] == chunk for offset, chunk in chunks)
+    assert all(len(chunk) <= 600 for _, chunk in chunks)
+
+    edited = split_chunks("Inserted preface.\n\n" + text, 600)
+    assert {chunk for _, chunk in chunks[-3:]} <= {chunk for _, chunk in edited}
+
+
+def test_cached_chunks_skip_model_and_keep_document_offsets(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(settings, "extract_cache_chunk_chars", 200)
+    calls: list[list[str]] = []
+    monkeypatch.setattr(extraction_service.lx, "extract", _fake_extract(calls))
+    service = ExtractionService(cache_storage=cast("Any", FakeStorage()))
+
+    first_text = "\n\n".join(["Filler " * 20, "Acme appears here. " * 5])
+    first = service.extract_entities(first_text, "sec_filing")
+    second_text = "Edited " + first_text
+    second = service.extract_entities(second_text, "sec_filing")
+
+    assert len(calls) == 2
+    assert len(calls[0]) == len(split_chunks(first_text, 200)) == 2
+    assert calls[1] == [split_chunks(second_text, 200)[0][1]]
+
+    start = int(first[0]["properties"]["charStart"][0])
+    assert first_text[start : start + 4] == "Acme"
+    second_start = int(second[0]["properties"]["charStart"][0])
+    assert second_text[second_start : second_start + 4] == "Acme"
+
+
+def test_failed_run_keeps_completed_batches_cached(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(settings, "extract_cache_chunk_chars", 200)
+    monkeypatch.setattr(settings, "extract_batch_length", 1)
+    calls: list[list[str]] = []
+    extract = _fake_extract(calls)
+
+    def failing_extract(text_or_documents: list[Any], **kwargs: object) -> list[FakeAnnotated]:
+        if len(calls) == 1:
+            calls.append([])
+            msg = "model unavailable"
+            raise RuntimeError(msg)
+        return extract(text_or_documents, **kwargs)
+
+    monkeypatch.setattr(extraction_service.lx, "extract", failing_extract)
+    service = ExtractionService(cache_storage=cast("Any", FakeStorage()))
+    text = "\n\n".join(["Filler " * 20, "Acme appears here. " * 5])
+    chunks = split_chunks(text, 200)
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        service.extract_entities(text, "sec_filing")
+    entities = service.extract_entities(text, "sec_filing")
+
+    assert calls == [[chunks[0][1]], [], [chunks[1][1]]]
+    assert service.last_stats["cached_chunks"] == 1
+    start = int(entities[0]["properties"]["charStart"][0])
+    assert text[start : start + 4] == "Acme"
+
+
+def test_sec_filing_extracts_only_relevant_items(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    fixture = (Path(__file__).parent / "fixtures" / "sec_excerpt_amazon_item13.txt").read_text()
+    assert [section.item for section in split_sections(fixture)] == ["13"]
+    assert relevant_sections(fixture) == [(0, fixture)]
+
+    filing = "\n".join(
+        [
+            "UNITED STATES SECURITIES AND EXCHANGE COMMISSION",
+            "FORM 10-K",
+            "Item 7. Management's Discussion and Analysis",
+            "Item 13. Certain Relationships",
+            "",
+            "ITEM 7. MANAGEMENT'S DISCUSSION AND ANALYSIS",
+            "Net sales increased. " * 50,
+            fixture,
+            "ITEM 15. EXHIBITS, FINANCIAL STATEMENT SCHEDULES",
+            "Exhibit 21.1 List of Acme subsidiaries.",
+        ]
+    )
+    calls: list[list[str]] = []
+    monkeypatch.setattr(extraction_service.lx, "extract", _fake_extract(calls))
+    entities = ExtractionService().extract_entities(filing, "sec_filing")
+
+    assert len(calls) == 1
+    sent = calls[0]
+    assert fixture.strip() in sent[1]
+    assert not any("Net sales increased" in text for text in sent)
+    assert sum(len(text) for text in sent) < len(filing) / 2
+
+    start = int(entities[0]["properties"]["charStart"][0])
+    assert filing[start : start + 4] == "Acme"
+
+
+def test_exhibit_index_rows_stay_in_one_section() -> None:
+    rows = [f"Exhibit {number}.1 Agreement with Acme party {number}." for number in range(2, 40)]
+    filing = "\n".join(
+        [
+            "FORM 10-K",
+            "ITEM 13. CERTAIN RELATIONSHIPS AND RELATED TRANSACTIONS",
+            "Acme Holdings is controlled by the chairman.",
+            "ITEM 15. EXHIBITS, FINANCIAL STATEMENT SCHEDULES",
+            "The following documents are filed as part of this report.",
+            "EXHIBIT INDEX",
+            *rows,
+        ]
+    )
+
+    sections = split_sections(filing)
+    assert [section.item for section in sections] == ["cover", "13", "15", "exhibits"]
+    exhibits = sections[-1]
+    assert filing[exhibits.start : exhibits.end].count("Exhibit ") == len(rows)
+    selected = "".join(text for _, text in relevant_sections(filing))
+    assert "filed as part of this report" in selected
+    assert all(row in selected for row in rows)
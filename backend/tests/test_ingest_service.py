@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any, cast
 
 from app.core.ingest_service import IngestService
+from app.core.match_keys import match_keys
 
 
 @dataclass
@@ -17,15 +18,15 @@ class FakeResult:
 class FakeGraph:
     def __init__(self) -> None:
         self.nodes_by_id = {
-            "person-1": {"id": "person-1", "name": ["John Doe"]},
-            "company-1": {"id": "company-1", "name": ["Acme Corp"]},
+            "person-1": {"id": "person-1", **match_keys({"name": ["John Doe"]})},
+            "company-1": {"id": "company-1", **match_keys({"name": ["Acme Corp"]})},
         }
         self.edges: list[dict[str, Any]] = []
 
     def add_node(self, entity_id: str, properties: dict[str, list[str]]) -> None:
         self.nodes_by_id[entity_id] = {
             "id": entity_id,
-            "name": properties.get("name", []),
+            **match_keys(properties),
         }
 
     def query(self, query: str, params: dict[str, object] | None = None) -> FakeResult:
@@ -37,11 +38,11 @@ class FakeGraph:
                 return FakeResult([[entity_id]])
             return FakeResult([])
 
-        if "WHERE any(name IN coalesce(n._name, [])" in query:
-            name = str(params.get("name", "")).casefold()
+        if "WHERE $name IN n.match_" in query:
+            prop = query.split("IN n.", 1)[1].split(" ", 1)[0]
+            name = str(params.get("name", ""))
             for node in self.nodes_by_id.values():
-                first_name = str((node.get("name") or [""])[0]).casefold()
-                if first_name == name:
+                if name in node.get(prop, []):
                     return FakeResult([[str(node["id"])]])
             return FakeResult([])
 
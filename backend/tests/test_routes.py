@@ -1,6 +1,22 @@
 """API route registration tests."""
 
+from typing import IO, Any
+
+import pytest
+from boto3.exceptions import S3UploadFailedError
+from fastapi.testclient import TestClient
+
+from app.api.auth import AuthContext, require_auth
+from app.api.deps import (
+    get_extraction_workflow_service,
+    get_ingest_service,
+    get_storage_service,
+)
+from app.api.routes.entities import _byte_range
+from app.config import settings
+from app.core.graph_service import GraphServiceError
 from app.main import app
+from app.models.entity import Entity, EntityCreate
 
 
 def test_core_api_routes_registered() -> None:
@@ -12,12 +28,114 @@ def test_core_api_routes_registered() -> None:
     assert "/api/investigations/{investigation_id}/entities" in paths
     assert "/api/investigations/{investigation_id}/entities/deduplicate/candidates" in paths
     assert "/api/investigations/{investigation_id}/entities/merge" in paths
+    assert "/api/investigations/{investigation_id}/entities/merge/bulk" in paths
     assert "/api/investigations/{investigation_id}/entities/{entity_id}" in paths
     assert "/api/investigations/{investigation_id}/entities/{entity_id}/expand" in paths
+    assert "/api/investigations/{investigation_id}/entities/{entity_id}/appearances" in paths
+    assert "/api/investigations/{investigation_id}/entities/{entity_id}/content" in paths
     assert "/api/investigations/{investigation_id}/ingest" in paths
     assert "/api/investigations/{investigation_id}/ingest/{workflow_id}/status" in paths
+    assert "/api/investigations/{investigation_id}/ingest/batch" in paths
+    assert "/api/investigations/{investigation_id}/ingest/batch/{batch_id}" in paths
+    assert "/api/investigations/{investigation_id}/ingest/metrics" in paths
+    assert "/api/investigations/{investigation_id}/ingest/uploads" in paths
+    assert "/api/investigations/{investigation_id}/ingest/uploads/{document_id}/complete" in paths
     assert "/api/investigations/{investigation_id}/graph" in paths
     assert "/api/investigations/{investigation_id}/notebook" in paths
     assert "/api/schema" in paths
     assert "/api/schema/{schema_name}" in paths
+    assert "/api/enrich/yente/cache" in paths
     assert "/api/auth/me" in paths
+
+
+def test_document_content_byte_ranges() -> None:
+    assert _byte_range(None, 100) is None
+    assert _byte_range("bytes=0-9", 100) == (0, 9)
+    assert _byte_range("bytes=90-", 100) == (90, 99)
+    assert _byte_range("bytes=-10", 100) == (90, 99)
+    assert _byte_range("bytes=50-500", 100) == (50, 99)
+    assert _byte_range("bytes=0-1,5-9", 100) is None
+    with pytest.raises(ValueError, match="not satisfiable"):
+        _byte_range("bytes=100-", 100)
+
+
+class UnavailableEntityService:
+    def get(self, *_: object) -> Any:
+        msg = "FalkorDB is unavailable"
+        raise GraphServiceError(msg)
+
+
+class FakeIngestService:
+    entity_service = UnavailableEntityService()
+
+
+def test_direct_upload_rejects_oversize_and_reports_graph_outage() -> None:
+    app.dependency_overrides.update(
+        {
+            require_auth: lambda: AuthContext(user_id="user_123", session_id="sess", claims={}),
+            get_ingest_service: FakeIngestService,
+            get_storage_service: object,
+            get_extraction_workflow_service: object,
+        }
+    )
+    client = TestClient(app)
+    try:
+        oversize = client.post(
+            "/api/investigations/inv-1/ingest/uploads",
+            json={
+                "filename": "scan.pdf",
+                "size_bytes": settings.s3_presign_max_upload_mb * 1024 * 1024 + 1,
+            },
+        )
+        completed = client.post(
+            "/api/investigations/inv-1/ingest/uploads/doc-1/complete",
+            json={"parts": []},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert oversize.status_code == 422
+    assert completed.status_code == 503
+    assert completed.json() == {"detail": "FalkorDB is unavailable"}
+
+
+class RecordingEntityService:
+    def __init__(self) -> None:
+        self.deleted: list[str] = []
+
+    def create(self, investigation_id: str, payload: EntityCreate) -> Entity:
+        return Entity(id="doc-1", schema="Document", properties=payload.properties)
+
+    def delete(self, investigation_id: str, entity_id: str) -> bool:
+        self.deleted.append(entity_id)
+        return True
+
+
+class FailingUploadStorage:
+    def upload_stream(self, fileobj: IO[bytes], **_: object) -> str:
+        msg = "Failed to upload memo.txt: An error occurred (SlowDown)"
+        raise S3UploadFailedError(msg)
+
+
+def test_failed_document_upload_removes_queued_document() -> None:
+    entity_service = RecordingEntityService()
+    ingest_service = type("RecordingIngestService", (), {"entity_service": entity_service})()
+    app.dependency_overrides.update(
+        {
+            require_auth: lambda: AuthContext(user_id="user_123", session_id="sess", claims={}),
+            get_ingest_service: lambda: ingest_service,
+            get_storage_service: FailingUploadStorage,
+            get_extraction_workflow_service: object,
+        }
+    )
+    client = TestClient(app)
+    try:
+        response = client.post(
+            "/api/investigations/inv-1/ingest",
+            files={"file": ("memo.txt", b"memo", "text/plain")},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    assert entity_service.deleted == ["doc-1"]
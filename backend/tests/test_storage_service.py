@@ -0,0 +1,360 @@
+"""Tests for the storage service bucket existence cache."""
+
+from __future__ import annotations
+
+import io
+from typing import Any, cast
+
+import pytest
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.core.investigation_service import InvestigationService
+from app.core.storage_service import StorageService
+
+
+class FakeS3:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.buckets: set[str] = set()
+
+    def head_bucket(self, Bucket: str) -> None:  # noqa: N803
+        self.calls.append("head_bucket")
+        if Bucket not in self.buckets:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadBucket")
+
+    def create_bucket(self, Bucket: str, **_: object) -> None:  # noqa: N803
+        self.calls.append("create_bucket")
+        self.buckets.add(Bucket)
+
+    def put_object(self, Bucket: str, **_: object) -> None:  # noqa: N803
+        self.calls.append("put_object")
+        if Bucket not in self.buckets:
+            raise ClientError({"Error": {"Code": "NoSuchBucket"}}, "PutObject")
+
+
+def test_bucket_existence_is_cached_and_refreshed_when_stale(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_bucket_cache_ttl_seconds", 300.0)
+    s3 = FakeS3()
+    storage = StorageService()
+    storage.client = s3
+
+    for index in range(3):
+        storage.upload_bytes("inv-1", f"doc-{index}", "a.txt", b"a", "text/plain")
+    assert s3.calls == ["head_bucket", "create_bucket", "put_object", "put_object", "put_object"]
+
+    s3.buckets.clear()
+    s3.calls.clear()
+    storage.upload_bytes("inv-1", "doc-3", "a.txt", b"a", "text/plain")
+    assert s3.calls == ["put_object", "head_bucket", "create_bucket", "put_object"]
+
+
+def test_upload_stream_uses_multipart_config_and_retries_stale_bucket(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_multipart_chunk_mb", 8)
+    monkeypatch.setattr(settings, "s3_multipart_concurrency", 3)
+    s3 = FakeS3()
+    uploads: list[tuple[bytes, Any]] = []
+
+    def upload_fileobj(fileobj: Any, bucket: str, key: str, **kwargs: Any) -> None:
+        s3.calls.append("upload_fileobj")
+        if bucket not in s3.buckets:
+            fileobj.read()
+            msg = "Failed to upload: NoSuchBucket"
+            raise S3UploadFailedError(msg)
+        uploads.append((fileobj.read(), kwargs["Config"]))
+
+    s3.upload_fileobj = upload_fileobj  # type: ignore[attr-defined]
+    storage = StorageService()
+    storage.client = s3
+    storage.ensure_bucket("inv-1")
+    s3.buckets.clear()
+
+    key = storage.upload_stream("inv-1", "doc-1", "big.bin", io.BytesIO(b"evidence"), None)
+
+    assert key == "doc-1/big.bin"
+    content, config = uploads[0]
+    assert content == b"evidence"
+    assert config.multipart_chunksize == 8 * 1024 * 1024
+    assert config.max_concurrency == 3
+
+
+class FakeObjectStore(FakeS3):
+    def __init__(self) -> None:
+        super().__init__()
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.metadata: dict[tuple[str, str], dict[str, str]] = {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs: Any) -> None:  # noqa: N803
+        self.calls.append("put_object")
+        self.objects[Bucket, Key] = Body
+        self.metadata[Bucket, Key] = kwargs.get("Metadata", {})
+
+    def upload_fileobj(self, fileobj: Any, bucket: str, key: str, **kwargs: Any) -> None:
+        self.calls.append("upload_fileobj")
+        self.objects[bucket, key] = fileobj.read()
+        self.metadata[bucket, key] = kwargs.get("ExtraArgs", {}).get("Metadata", {})
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:  # noqa: N803
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {
+            "ContentLength": len(self.objects[Bucket, Key]),
+            "Metadata": self.metadata.get((Bucket, Key), {}),
+        }
+
+    def get_object(self, Bucket: str, Key: str, Range: str = "") -> dict[str, Any]:  # noqa: N803
+        content = self.objects[Bucket, Key]
+        if Range:
+            first, last = Range.removeprefix("bytes=").split("-")
+            content = content[int(first) : int(last) + 1 if last else None]
+        return {
+            "Body": io.BytesIO(content),
+            "ContentLength": len(content),
+            "Metadata": self.metadata.get((Bucket, Key), {}),
+        }
+
+    def delete_object(self, Bucket: str, Key: str) -> None:  # noqa: N803
+        self.objects.pop((Bucket, Key), None)
+
+    def copy(self, CopySource: dict[str, str], Bucket: str, Key: str) -> None:  # noqa: N803
+        source = (CopySource["Bucket"], CopySource["Key"])
+        if source not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        self.objects[Bucket, Key] = self.objects[source]
+        self.metadata[Bucket, Key] = self.metadata.get(source, {})
+
+    def get_paginator(self, _: str) -> Any:
+        store = self
+
+        class Paginator:
+            def paginate(self, Bucket: str, Prefix: str) -> list[dict[str, Any]]:  # noqa: N803
+                keys = [key for bucket, key in store.objects if bucket == Bucket]
+                return [{"Contents": [{"Key": key} for key in keys if key.startswith(Prefix)]}]
+
+        return Paginator()
+
+
+def test_content_addressed_uploads_are_stored_once_and_reference_counted(
+    monkeypatch: Any,
+) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_content_addressed", True)
+    s3 = FakeObjectStore()
+    storage = StorageService()
+    storage.client = s3
+
+    key_a = storage.upload_stream("inv-a", "doc-1", "report.pdf", io.BytesIO(b"same"), None)
+    key_b = storage.upload_bytes("inv-b", "doc-2", "copy.pdf", b"same", None)
+    key_c = storage.upload_bytes("inv-b", "doc-3", "again.pdf", b"same", None)
+
+    assert key_a == key_b == key_c
+    assert key_a.startswith("sha256/")
+    assert s3.calls.count("upload_fileobj") == 1
+    assert storage.download_bytes("inv-b", key_a) == b"same"
+    assert storage.reference_counts(key_a) == {"inv-a": 1, "inv-b": 2}
+    assert storage.key_from_url(storage.object_url("inv-a", key_a)) == key_a
+
+    assert not storage.release_reference("inv-b", "doc-2", key_a)
+    assert not storage.release_reference("inv-b", "doc-3", key_a)
+    assert storage.release_reference("inv-a", "doc-1", key_a)
+    assert (storage.blob_bucket_name(), key_a) not in s3.objects
+
+
+def test_reference_is_recorded_before_content_existence_check(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_content_addressed", True)
+    storage = StorageService()
+
+    class ReleasingStore(FakeObjectStore):
+        releasing = False
+
+        def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:  # noqa: N803
+            found = super().head_object(Bucket, Key)
+            if self.releasing:
+                # The last older reference is dropped right after this upload found the content.
+                self.releasing = False
+                storage.release_reference("inv-a", "doc-1", Key)
+            return found
+
+    s3 = ReleasingStore()
+    storage.client = s3
+    key = storage.upload_bytes("inv-a", "doc-1", "report.pdf", b"same", None)
+    s3.releasing = True
+    assert storage.upload_bytes("inv-b", "doc-2", "copy.pdf", b"same", None) == key
+
+    assert storage.download_bytes("inv-b", key) == b"same"
+    assert storage.reference_counts(key) == {"inv-b": 1}
+
+
+def test_content_found_by_an_upload_survives_a_concurrent_release(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_content_addressed", True)
+    storage = StorageService()
+
+    class InterleavingStore(FakeObjectStore):
+        uploading = False
+
+        def delete_object(self, Bucket: str, Key: str) -> None:  # noqa: N803
+            if self.uploading and Key.startswith("sha256/"):
+                # Another upload records its reference and finds the content just before it goes.
+                self.uploading = False
+                storage.upload_bytes("inv-b", "doc-2", "copy.pdf", b"same", None)
+            super().delete_object(Bucket, Key)
+
+    s3 = InterleavingStore()
+    storage.client = s3
+    key = storage.upload_bytes("inv-a", "doc-1", "report.pdf", b"same", None)
+    s3.uploading = True
+
+    assert not storage.release_reference("inv-a", "doc-1", key)
+    assert s3.calls.count("upload_fileobj") == 1
+    assert storage.download_bytes("inv-b", key) == b"same"
+    assert storage.reference_counts(key) == {"inv-b": 1}
+    assert not [name for _, name in s3.objects if name.startswith("retired/")]
+
+
+def test_deleting_investigation_releases_its_content_references(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_content_addressed", True)
+    s3 = FakeObjectStore()
+    storage = StorageService()
+    storage.client = s3
+    shared = storage.upload_bytes("inv-a", "doc-1", "report.pdf", b"shared", None)
+    storage.upload_bytes("inv-b", "doc-2", "copy.pdf", b"shared", None)
+    own = storage.upload_bytes("inv-a", "doc-3", "notes.txt", b"only a", None)
+
+    class FakeGraph:
+        def get_investigation_metadata(self, investigation_id: str) -> dict[str, str]:
+            return {"id": investigation_id}
+
+        def delete_investigation_metadata(self, investigation_id: str) -> None: ...
+
+        def delete_investigation(self, investigation_id: str) -> None: ...
+
+        def delete_match_refs(self, investigation_id: str) -> None: ...
+
+    service = InvestigationService(cast("Any", FakeGraph()), storage_service=storage)
+    assert service.delete("inv-a")
+
+    assert storage.reference_counts(shared) == {"inv-b": 1}
+    assert storage.reference_counts(own) == {}
+    assert (storage.blob_bucket_name(), shared) in s3.objects
+    assert (storage.blob_bucket_name(), own) not in s3.objects
+    assert not [name for _, name in s3.objects if name.startswith("investigations/inv-a/")]
+
+
+class FakePresigningStore(FakeObjectStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.uploads: dict[str, dict[int, bytes]] = {}
+
+    def generate_presigned_url(self, operation: str, Params: dict[str, Any], **_: Any) -> str:  # noqa: N803
+        suffix = f"?part={Params['PartNumber']}" if "PartNumber" in Params else ""
+        return f"https://storage/{operation}/{Params['Bucket']}/{Params['Key']}{suffix}"
+
+    def create_multipart_upload(self, Bucket: str, Key: str, **_: Any) -> dict[str, str]:  # noqa: N803
+        self.uploads[f"{Bucket}/{Key}"] = {}
+        return {"UploadId": f"{Bucket}/{Key}"}
+
+    def complete_multipart_upload(
+        self,
+        *,
+        Bucket: str,  # noqa: N803
+        Key: str,  # noqa: N803
+        UploadId: str,  # noqa: N803
+        MultipartUpload: dict[str, list[dict[str, Any]]],  # noqa: N803
+    ) -> None:
+        parts = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        self.objects[Bucket, Key] = b"".join(parts[number] for number in numbers)
+
+
+def test_presigned_uploads_use_single_put_or_multipart_by_size(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_multipart_threshold_mb", 16)
+    monkeypatch.setattr(settings, "s3_multipart_chunk_mb", 8)
+    s3 = FakePresigningStore()
+    storage = StorageService()
+    storage.client = storage.presign_client = s3
+    bucket = storage.ensure_bucket("inv-1")
+
+    small = storage.presign_upload("inv-1", "doc-1", "memo.pdf", "application/pdf", 1024)
+    assert small["key"] == "doc-1/memo.pdf"
+    assert small["url"] == f"https://storage/put_object/{bucket}/doc-1/memo.pdf"
+    assert small["headers"] == {"Content-Type": "application/pdf"}
+    s3.objects[bucket, "doc-1/memo.pdf"] = b"memo"
+    assert storage.complete_upload("inv-1", small["key"]) == len(b"memo")
+
+    large = storage.presign_upload("inv-1", "doc-2", "dump.bin", None, 20 * 1024 * 1024)
+    assert large["part_size"] == 8 * 1024 * 1024
+    assert [part["part_number"] for part in large["parts"]] == [1, 2, 3]
+    s3.uploads[large["upload_id"]] = {1: b"a", 2: b"b", 3: b"c"}
+    size = storage.complete_upload(
+        "inv-1", large["key"], large["upload_id"], [(3, "e3"), (1, "e1"), (2, "e2")]
+    )
+    assert size == 3
+    assert s3.objects[bucket, "doc-2/dump.bin"] == b"abc"
+
+
+def test_complete_upload_rejects_missing_object(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    storage = StorageService()
+    storage.client = FakePresigningStore()
+
+    with pytest.raises(ValueError, match="not found"):
+        storage.complete_upload("inv-1", "doc-1/missing.pdf")
+
+
+def test_ranged_and_streamed_reads(monkeypatch: Any) -> None:
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    s3 = FakeObjectStore()
+    storage = StorageService()
+    storage.client = s3
+    key = storage.upload_bytes("inv-1", "doc-1", "a.pdf", b"0123456789", None)
+
+    assert storage.object_size("inv-1", key) == 10
+    assert storage.object_size("inv-1", "doc-1/missing.pdf") is None
+    assert storage.download_range("inv-1", key, 2, 4) == b"234"
+    assert list(storage.iter_object("inv-1", key, start=6, chunk_size=3)) == [b"678", b"9"]
+    assert b"".join(storage.iter_object("inv-1", key, chunk_size=4)) == b"0123456789"
+
+
+def test_zstd_compression_is_transparent_on_read(monkeypatch: Any) -> None:
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(StorageService, "_known_buckets", {})
+    monkeypatch.setattr(settings, "s3_compression", "zstd")
+    s3 = FakeObjectStore()
+    storage = StorageService()
+    storage.client = s3
+    text = b"Item 13. Certain Relationships and Related Transactions\n" * 500
+    bucket = storage.ensure_bucket("inv-1")
+
+    key = storage.upload_bytes("inv-1", "doc-1", "filing.txt", text, "text/plain")
+    streamed = storage.upload_stream("inv-1", "doc-2", "mail.eml", io.BytesIO(text), "message/rfc822")
+    pdf = storage.upload_bytes("inv-1", "doc-3", "scan.pdf", b"%PDF-1.7", "application/pdf")
+    storage.put_json("inv-1", "doc-1/_derived/parsed.json", {"content": text.decode()})
+
+    assert len(s3.objects[bucket, key]) < len(text) // 10
+    assert s3.metadata[bucket, key] == {
+        "investigation_id": "inv-1",
+        "document_id": "doc-1",
+        "filename": "filing.txt",
+        "codec": "zstd",
+        "uncompressed_size": str(len(text)),
+    }
+    assert s3.metadata[bucket, streamed]["codec"] == "zstd"
+    assert "codec" not in s3.metadata[bucket, pdf]
+    assert storage.download_bytes("inv-1", key) == text
+    assert storage.download_bytes("inv-1", streamed) == text
+    assert storage.download_bytes("inv-1", pdf) == b"%PDF-1.7"
+    assert storage.get_json("inv-1", "doc-1/_derived/parsed.json") == {"content": text.decode()}
+    assert storage.object_size("inv-1", key) == len(text)
+    assert storage.download_range("inv-1", key, 5000, 5009) == text[5000:5010]
+    assert b"".join(storage.iter_object("inv-1", key, start=len(text) - 7)) == text[-7:]
+
+    # Objects keep decompressing after compression is switched off.
+    monkeypatch.setattr(settings, "s3_compression", "none")
+    assert storage.download_bytes("inv-1", key) == text
@@ -0,0 +1,365 @@
+"""Tests for extraction workflow submission modes."""
+
+from __future__ import annotations
+
+import io
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, ClassVar, cast
+
+import pytest
+from dbos._context import get_local_dbos_context
+
+from app.config import settings
+from app.core.extraction import workflow_service
+from app.core.extraction.consolidation import consolidate_entities
+from app.core.extraction.pipeline_metrics import stage_metrics, workflow_metrics
+from app.core.extraction.workflow_service import ExtractionWorkflowService
+from app.core.storage_service import StorageService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@dataclass
+class FakeStatus:
+    status: str
+
+
+class FakeHandle:
+    def __init__(self, workflow_id: str) -> None:
+        self.workflow_id = workflow_id
+
+    def get_workflow_id(self) -> str:
+        return self.workflow_id
+
+    def get_status(self) -> FakeStatus:
+        return FakeStatus("SUCCESS")
+
+    def get_result(self) -> dict[str, object]:
+        return {"processed": 1}
+
+
+class FakeClient:
+    def __init__(self, system_database_url: str) -> None:
+        self.system_database_url = system_database_url
+        self.enqueued: list[tuple[dict[str, Any], tuple[object, ...]]] = []
+
+    def enqueue(self, options: dict[str, Any], *args: object) -> FakeHandle:
+        self.enqueued.append((options, args))
+        return FakeHandle("wf-1")
+
+    def retrieve_workflow(self, workflow_id: str) -> FakeHandle:
+        return FakeHandle(workflow_id)
+
+
+def test_enqueue_mode_submits_through_client_without_launching_dbos(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "extraction_mode", "enqueue")
+    monkeypatch.setattr(workflow_service, "DBOSClient", FakeClient)
+    monkeypatch.setattr(
+        workflow_service,
+        "launch_dbos",
+        lambda: pytest.fail("API in enqueue mode must not launch DBOS"),
+    )
+
+    service = ExtractionWorkflowService()
+    workflow_id = service.enqueue("inv-1", "doc-1", "doc-1/report.pdf", "report.pdf", None)
+
+    assert workflow_id == "wf-1"
+    client = service.client
+    assert isinstance(client, FakeClient)
+    options, args = client.enqueued[0]
+    assert options == {
+        "queue_name": "extraction_investigations",
+        "workflow_name": "document_extraction_workflow",
+        "queue_partition_key": "inv-1",
+    }
+    assert args == ("inv-1", "doc-1", "doc-1/report.pdf", "report.pdf", None)
+    assert service.get_status("wf-1")["result"] == {"processed": 1}
+
+
+def test_inline_enqueue_partitions_by_investigation(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "extraction_mode", "inline")
+    monkeypatch.setattr(workflow_service, "launch_dbos", lambda: None)
+    enqueued: list[tuple[object, str | None, str | None]] = []
+
+    def enqueue(function: object, *args: object) -> FakeHandle:
+        context = get_local_dbos_context()
+        assert context is not None
+        partition_key = context.queue_partition_key
+        workflow_id = context.id_assigned_for_next_workflow
+        assert args[0] == partition_key
+        enqueued.append((function, partition_key, workflow_id))
+        return FakeHandle(workflow_id)
+
+    queue = workflow_service.INVESTIGATION_QUEUE
+    monkeypatch.setattr(queue, "enqueue", enqueue)
+    service = ExtractionWorkflowService()
+    service.enqueue("inv-1", "doc-1", "doc-1/a.pdf", "a.pdf", None, workflow_id="wf-a")
+    service.enqueue("inv-2", "doc-2", "doc-2/b.pdf", "b.pdf", None, workflow_id="wf-b")
+
+    assert queue.partition_queue
+    assert queue.name != workflow_service.EXTRACTION_QUEUE.name
+    assert enqueued == [
+        (workflow_service.document_extraction_workflow, "inv-1", "wf-a"),
+        (workflow_service.document_extraction_workflow, "inv-2", "wf-b"),
+    ]
+
+
+class FakeStepStorage:
+    objects: ClassVar[dict[str, object]] = {}
+
+    derived_key = staticmethod(StorageService.derived_key)
+
+    def open_object(self, investigation_id: str, key: str) -> dict[str, object]:
+        content = cast("bytes", self.objects[f"{investigation_id}/{key}"])
+        return {"Body": io.BytesIO(content), "ContentLength": len(content)}
+
+    def put_json(self, investigation_id: str, key: str, payload: object) -> str:
+        self.objects[f"{investigation_id}/{key}"] = json.loads(json.dumps(payload))
+        return key
+
+    def get_json(self, investigation_id: str, key: str) -> object:
+        return self.objects[f"{investigation_id}/{key}"]
+
+
+class FakeParser:
+    parse_cache = None
+
+    def split_pages(self, *_: object, **__: object) -> Iterator[tuple[int, int, bytes]]:
+        return iter(())
+
+    def extract(self, content: bytes, filename: str, content_type: str | None) -> dict[str, object]:
+        return {
+            "content": content.decode(),
+            "mime_type": content_type or "text/plain",
+            "document_type": "email",
+            "metadata": {"filename": filename},
+            "cache_hit": False,
+        }
+
+
+class FakeExtractor:
+    def __init__(self, cache_storage: object = None) -> None:
+        self.last_stats: dict[str, int] = {}
+
+    def extract_entities(self, text: str, document_type: str) -> list[dict]:
+        return [
+            {"schema": "Company", "properties": {"name": [text.rsplit(maxsplit=1)[-1]]}, "note": document_type}
+        ]
+
+
+def test_steps_exchange_storage_keys_and_read_derived_objects(monkeypatch: Any) -> None:
+    monkeypatch.setattr(workflow_service, "StorageService", FakeStepStorage)
+    monkeypatch.setattr(workflow_service, "_document_service", lambda _: FakeParser())
+    monkeypatch.setattr(workflow_service, "ExtractionService", FakeExtractor)
+    body = "Wire sent to Acme " * 200
+    monkeypatch.setattr(FakeStepStorage, "objects", {"inv-1/doc-1/mail.eml": body.encode()})
+
+    parsed_ref = workflow_service.parse_document_step(
+        "inv-1", "doc-1", "doc-1/mail.eml", "mail.eml", "message/rfc822"
+    )
+    extracted_ref = workflow_service.extract_entities_step("inv-1", "doc-1", parsed_ref)
+
+    assert parsed_ref["parsed_key"] == "doc-1/_derived/parsed.json"
+    assert extracted_ref["entities_key"] == "doc-1/_derived/entities.json"
+    assert extracted_ref["entity_count"] == 1
+    for ref in (parsed_ref, extracted_ref):
+        assert body not in json.dumps(ref)
+        assert len(json.dumps(ref)) < len(body) / 4
+    parsed = FakeStepStorage.objects["inv-1/doc-1/_derived/parsed.json"]
+    assert cast("dict", parsed)["content"] == body
+    assert FakeStepStorage.objects["inv-1/doc-1/_derived/entities.json"] == [
+        {"schema": "Company", "properties": {"name": ["Acme"]}, "note": "email"}
+    ]
+
+
+def test_unknown_extraction_mode_is_rejected(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "extraction_mode", "sideways")
+
+    with pytest.raises(ValueError, match="EXTRACTION_MODE"):
+        ExtractionWorkflowService()
+
+
+class FakeResult:
+    def __init__(self, result_set: list[list[object]]) -> None:
+        self.result_set = result_set
+
+
+class RecordingGraph:
+    def __init__(self, lookup_rows: list[list[object]]) -> None:
+        self.lookup_rows = lookup_rows
+        self.queries: list[tuple[str, dict[str, Any]]] = []
+
+    def query(self, query: str, params: dict[str, Any] | None = None) -> FakeResult:
+        self.queries.append((query, params or {}))
+        if "UNION ALL" in query:
+            return FakeResult(self.lookup_rows)
+        if "MERGE (a)-[r:" in query:
+            return FakeResult([[row["edge_id"]] for row in (params or {})["rows"]])
+        raise AssertionError(f"Unexpected query: {query}")
+
+
+def test_resolve_entity_refs_uses_name_map_then_one_ranked_lookup() -> None:
+    graph = RecordingGraph(
+        [["Acme Corp.", "folded-match", 2], ["Acme Corp.", "exact-name", 1], ["p-9", "p-9", 0]],
+    )
+    name_to_id = {"jeff bezos": "p-1"}
+
+    resolved = workflow_service._resolve_entity_refs(
+        graph,
+        ["Jeff  Bezos", "Acme Corp.", "p-9", "Unknown Ltd", "Acme Corp."],
+        name_to_id,
+    )
+
+    assert resolved == {"Jeff  Bezos": "p-1", "Acme Corp.": "exact-name", "p-9": "p-9"}
+    assert len(graph.queries) == 1
+    assert [ref["ref"] for ref in graph.queries[0][1]["refs"]] == [
+        "Acme Corp.",
+        "p-9",
+        "Unknown Ltd",
+    ]
+    assert name_to_id["acme corp."] == "exact-name"
+
+
+def test_create_edges_batches_rows_per_relation_type() -> None:
+    graph = RecordingGraph([])
+    rows: list[dict[str, object]] = [
+        {"edge_id": "e1", "schema": "Ownership", "source": "a", "target": "b", "properties": {}},
+        {"edge_id": "e2", "schema": "Directorship", "source": "c", "target": "b", "properties": {}},
+        {"edge_id": "e3", "schema": "Ownership", "source": "d", "target": "b", "properties": {}},
+    ]
+
+    created = workflow_service._create_edges(graph, rows)
+
+    assert created == {"e1", "e2", "e3"}
+    assert len(graph.queries) == 2
+    assert "[r:OWNERSHIP" in graph.queries[0][0]
+    assert [row["edge_id"] for row in graph.queries[0][1]["rows"]] == ["e1", "e3"]
+
+
+@dataclass
+class FakeWorkflowStatus:
+    input: dict[str, Any]
+    output: dict[str, Any]
+    status: str = "SUCCESS"
+    workflow_id: str = ""
+
+
+def _metrics(extract_seconds: float, entities: int, wait: float) -> dict[str, object]:
+    return workflow_metrics(
+        {
+            "download": stage_metrics(0.1, bytes=1000),
+            "parse": stage_metrics(0.5, bytes=1000, chars=4000),
+            "extract": stage_metrics(extract_seconds, chars=4000, entities=entities),
+            "persist": stage_metrics(0.2, entities=entities, edges=1),
+        },
+        {"investigation": wait, "worker": 0.0},
+    )
+
+
+def test_metrics_summary_aggregates_stages_for_one_investigation(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "extraction_mode", "enqueue")
+    monkeypatch.setattr(workflow_service, "DBOSClient", FakeClient)
+    monkeypatch.setattr(workflow_service, "METRICS_PAGE_SIZE", 2)
+    listed: list[dict[str, Any]] = []
+    runs = [("inv-2", 100.0, 1, 9.0)] * 3 + [
+        ("inv-1", 2.0, 10, 1.0),
+        ("inv-1", 6.0, 30, 3.0),
+        ("inv-1", 50.0, 1, 1.0),
+    ]
+    workflows = [
+        FakeWorkflowStatus(
+            {"args": [investigation]},
+            {"metrics": _metrics(seconds, entities, wait)},
+            workflow_id=f"w{index}",
+        )
+        for index, (investigation, seconds, entities, wait) in enumerate(runs)
+    ]
+
+    def list_workflows(**filters: Any) -> list[FakeWorkflowStatus]:
+        listed.append(filters)
+        if "workflow_ids" in filters:
+            return [item for item in workflows if item.workflow_id in filters["workflow_ids"]]
+        offset = filters["offset"]
+        return workflows[offset : offset + filters["limit"]]
+
+    service = ExtractionWorkflowService()
+    monkeypatch.setattr(service.client, "list_workflows", list_workflows, raising=False)
+    summary = service.metrics_summary("inv-1", limit=2, since_hours=24)
+
+    # Other investigations fill the newest pages; paging continues until two are found.
+    assert all(filters["name"] == "document_extraction_workflow" for filters in listed)
+    assert [filters.get("offset") for filters in listed] == [0, 2, 4, None]
+    assert listed[-1]["workflow_ids"] == ["w3", "w4"]
+    window = datetime.now(UTC) - datetime.fromisoformat(listed[0]["start_time"])
+    assert timedelta(hours=23) < window <= timedelta(hours=24, minutes=1)
+    assert len({filters.get("start_time") for filters in listed[:-1]}) == 1
+    assert summary["workflows"] == 2
+    assert summary["bottleneck"] == "extract"
+    extract = summary["stages"]["extract"]
+    assert extract["totals"] == {"chars": 8000, "entities": 40}
+    assert extract["throughput_per_second"]["entities"] == 5.0
+    assert extract["seconds"]["max"] == 6.0
+    assert summary["queue_wait_seconds"]["investigation"]["mean"] == 2.0
+
+
+def test_consolidate_entities_merges_mentions_with_spans() -> None:
+    candidates: list[object] = [
+        {
+            "schema": "Person",
+            "properties": {"name": ["Jeffrey P. Bezos"], "charStart": ["10"], "charEnd": ["26"]},
+        },
+        {
+            "schema": "Person",
+            "properties": {
+                "name": ["jeffrey  p. bezos"],
+                "position": ["Executive Chair"],
+                "charStart": ["200"],
+                "charEnd": ["216"],
+            },
+        },
+        {
+            "schema": "Person",
+            "properties": {"name": ["Jeffrey P. Bezos"], "charStart": ["10"], "charEnd": ["26"]},
+        },
+        {"schema": "Company", "properties": {"name": ["Jeffrey P. Bezos"]}},
+        {
+            "schema": "Ownership",
+            "properties": {
+                "owner": ["Bezos Family Trust"],
+                "asset": ["Amazon.com"],
+                "relationGroup": ["ownership_1"],
+                "charStart": ["300"],
+                "charEnd": ["320"],
+            },
+        },
+        {
+            "schema": "Ownership",
+            "properties": {
+                "owner": ["bezos family trust"],
+                "asset": ["Amazon.com"],
+                "percentage": ["9.8"],
+                "relationGroup": ["ownership_1"],
+                "charStart": ["400"],
+                "charEnd": ["430"],
+            },
+        },
+        {"schema": "Ownership", "properties": {"owner": ["Someone"]}},
+    ]
+
+    merged = consolidate_entities(candidates, workflow_service.RELATION_ENDPOINT_CANDIDATES)
+
+    assert len(merged) == 4
+    person, company, ownership, incomplete = (cast("dict[str, Any]", item) for item in merged)
+    assert person["properties"] == {
+        "name": ["Jeffrey P. Bezos", "jeffrey  p. bezos"],
+        "charStart": ["10", "200"],
+        "charEnd": ["26", "216"],
+        "position": ["Executive Chair"],
+    }
+    assert company["schema"] == "Company"
+    assert ownership["properties"]["percentage"] == ["9.8"]
+    assert ownership["properties"]["charStart"] == ["300", "400"]
+    assert incomplete == candidates[-1]
@@ -0,0 +1,146 @@
+"""Tests for the pooled Yente client."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.core import yente_cache
+from app.core.yente_cache import YenteCache
+from app.core.yente_service import YenteService, YenteServiceError
+
+
+def _handler(requests: list[httpx.Request], version: list[str] | None = None) -> Any:
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/catalog":
+            return httpx.Response(
+                200,
+                json={"datasets": [{"name": "default", "index_version": (version or ["1"])[0]}]},
+            )
+        if request.url.path == "/search/default":
+            return httpx.Response(
+                200,
+                json={
+                    "total": 1,
+                    "results": [
+                        {
+                            "id": "Q7747",
+                            "schema": "Person",
+                            "caption": "Vladimir Putin",
+                            "score": 0.97,
+                            "datasets": ["wd_peps"],
+                            "properties": {"name": ["Vladimir Putin"]},
+                        },
+                    ],
+                },
+            )
+        if request.url.path == "/entities/Q7747/adjacent":
+            return httpx.Response(
+                200,
+                json={
+                    "adjacent": {
+                        "familyPerson": {
+                            "results": [
+                                {"properties": {"relative": [{"id": "Q100"}], "person": ["Q7747"]}},
+                            ],
+                        },
+                    },
+                },
+            )
+        return httpx.Response(500, text="index unavailable")
+
+    return handle
+
+
+async def test_search_and_adjacency_share_one_pooled_client(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "yente_url", "http://yente.test/")
+    monkeypatch.setattr(settings, "yente_dataset", "default")
+    requests: list[httpx.Request] = []
+    service = YenteService(transport=httpx.MockTransport(_handler(requests)))
+
+    response = await service.search("  Vladimir Putin ", limit=5)
+    client = service._client
+    linked = await service.adjacent_entity_ids("Q7747")
+
+    assert [result.id for result in response.results] == ["Q7747"]
+    assert response.query == "Vladimir Putin"
+    assert linked == ["Q100"]
+    assert service._client is client
+    assert str(requests[1].url) == "http://yente.test/search/default?q=Vladimir+Putin&limit=5"
+
+    await service.aclose()
+    assert client is not None
+    assert client.is_closed
+
+
+async def test_failed_requests_raise_service_error(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "yente_url", "http://yente.test")
+    monkeypatch.setattr(settings, "yente_dataset", "missing")
+    service = YenteService(transport=httpx.MockTransport(_handler([])))
+
+    with pytest.raises(YenteServiceError, match="500"):
+        await service.search("anyone")
+    await service.aclose()
+
+
+async def test_cache_serves_repeats_and_clears_on_new_dataset_version(monkeypatch: Any) -> None:
+    monkeypatch.setattr(settings, "yente_url", "http://yente.test")
+    monkeypatch.setattr(settings, "yente_dataset", "default")
+    monkeypatch.setattr(settings, "yente_version_check_seconds", 0.0)
+    requests: list[httpx.Request] = []
+    version = ["20260101"]
+    service = YenteService(
+        transport=httpx.MockTransport(_handler(requests, version)),
+        cache=YenteCache(max_entries=10, ttl_seconds=60.0),
+    )
+
+    def lookups() -> list[str]:
+        return [request.url.path for request in requests if request.url.path != "/catalog"]
+
+    first = await service.search("Vladimir Putin")
+    again = await service.search("Vladimir Putin ")
+    await service.adjacent_entity_ids("Q7747")
+    assert await service.adjacent_entity_ids("Q7747") == ["Q100"]
+    assert again == first
+    assert lookups() == ["/search/default", "/entities/Q7747/adjacent"]
+    await service.search("Vladimir Putin", limit=5)
+    assert len(lookups()) == 3
+
+    version[0] = "20260102"
+    await service.search("Vladimir Putin")
+    assert len(lookups()) == 4
+    stats = service.cache.stats()
+    assert stats["hits"] == 2
+    assert stats["invalidations"] == 1
+    assert stats["dataset_version"] == "20260102"
+    await service.aclose()
+
+
+def test_cache_expires_and_evicts_least_recently_used(monkeypatch: Any) -> None:
+    now = [100.0]
+    monkeypatch.setattr(yente_cache, "monotonic", lambda: now[0])
+    cache = YenteCache(max_entries=2, ttl_seconds=10.0)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    now[0] = 111.0
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "expirations": 1,
+        "invalidations": 0,
+        "entries": 1,
+        "max_entries": 2,
+        "ttl_seconds": 10.0,
+        "hit_rate": 0.3333,
+        "dataset_version": None,
+    }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark chunked LLM extraction latency against a local stand-in model server.
+
+The stand-in server speaks the OpenAI chat completions API, sleeps for a fixed
+latency per request and returns no extractions, so the timings isolate how
+ExtractionService schedules chunks across workers.
+
+Usage:
+    cd backend && uv run python ../scripts/benchmark_extraction.py --workers 1 4 16
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+FIXTURE = BACKEND_DIR / "tests" / "fixtures" / "sec_excerpt_amazon_item13.txt"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.config import settings  # noqa: E402
+from app.core.extraction.extraction_service import ExtractionService  # noqa: E402
+
+
+def make_handler(latency_seconds: float) -> type[BaseHTTPRequestHandler]:
+    class StandInModelHandler(BaseHTTPRequestHandler):
+        requests_served = 0
+        lock = threading.Lock()
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length", "0"))
+            self.rfile.read(length)
+            time.sleep(latency_seconds)
+            with StandInModelHandler.lock:
+                StandInModelHandler.requests_served += 1
+
+            body = json.dumps(
+                {
+                    "id": "stand-in",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "gpt-4o-mini",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "finish_reason": "stop",
+                            "message": {
+                                "role": "assistant",
+                                "content": '{"extractions": []}',
+                            },
+                        }
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_: object) -> None:
+            return
+
+    return StandInModelHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per model call")
+    parser.add_argument("--repeat", type=int, default=20, help="fixture copies per document")
+    parser.add_argument("--chunk-size", type=int, default=settings.extract_max_char_buffer)
+    args = parser.parse_args()
+
+    handler = make_handler(args.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.gemini_api_key = settings.gemini_api_key or "stand-in"
+    settings.extract_model_id = "gpt-4o-mini"
+    settings.extract_model_url = f"http://127.0.0.1:{server.server_port}/v1"
+    settings.extract_max_char_buffer = args.chunk_size
+
+    text = "\n\n".join([FIXTURE.read_text(encoding="utf-8")] * args.repeat)
+    service = ExtractionService()
+    print(f"document: {len(text)} chars, chunk size {args.chunk_size}, latency {args.latency}s")
+
+    # Warm up imports, prompt validation and connections before timing.
+    service.extract_entities(text[:200], "sec_filing")
+
+    baseline: float | None = None
+    for workers in args.workers:
+        settings.extract_max_workers = workers
+        settings.extract_batch_length = max(workers, 1)
+        handler.requests_served = 0  # type: ignore[attr-defined]
+        started = time.perf_counter()
+        service.extract_entities(text, "sec_filing")
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        calls = handler.requests_served  # type: ignore[attr-defined]
+        print(
+            f"workers={workers:>3} calls={calls:>4} "
+            f"elapsed={elapsed:7.2f}s speedup={baseline / elapsed:5.1f}x"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark zstd storage compression: space saved against CPU time spent.
+
+Each sample is compressed at every level and read back through the same decoder that
+StorageService uses. The "store+read" columns estimate the time to write and read the
+object once over a link of --bandwidth Mbit/s, with and without compression. The built-in
+samples derive from one short fixture; pass real documents with --files for representative
+ratios (repeating the fixture with --repeat overstates them).
+
+Usage:
+    cd backend && uv run --extra compression python ../scripts/benchmark_storage_compression.py
+    cd backend && uv run --extra compression python ../scripts/benchmark_storage_compression.py \
+        --levels 1 3 9 --bandwidth 1000 --files ~/samples/*.eml
+"""
+
+import argparse
+import io
+import json
+import mimetypes
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+FIXTURE = BACKEND_DIR / "tests" / "fixtures" / "sec_excerpt_amazon_item13.txt"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.storage_codec import ZstdBody, compress, compressible  # noqa: E402
+
+
+def builtin_samples(repeat: int) -> dict[str, tuple[bytes, str]]:
+    text = "\n\n".join([FIXTURE.read_text(encoding="utf-8")] * repeat)
+    paragraphs = "".join(f"<p>{line}</p>\n" for line in text.splitlines() if line.strip())
+    html = f"<html><head><title>Filing</title></head><body>{paragraphs}</body></html>"
+    email = (
+        "From: counsel@example.com\nTo: board@example.com\nSubject: Related transactions\n"
+        f"Content-Type: text/plain; charset=utf-8\n\n{text}"
+    )
+    parsed = json.dumps({"content": text, "mime_type": "text/plain", "metadata": {}})
+    return {
+        "filing.txt": (text.encode(), "text/plain"),
+        "filing.html": (html.encode(), "text/html"),
+        "message.eml": (email.encode(), "message/rfc822"),
+        "parsed.json": (parsed.encode(), "application/json"),
+    }
+
+
+def read_back(stored: bytes, size: int) -> bytes:
+    return ZstdBody(io.BytesIO(stored), 0, size).read()
+
+
+def timed(function: Callable[[], bytes], rounds: int) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    result = b""
+    for _ in range(rounds):
+        result = function()
+    return result, (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 3, 9, 19])
+    parser.add_argument("--repeat", type=int, default=1, help="fixture copies per sample")
+    parser.add_argument("--rounds", type=int, default=5, help="timed runs per measurement")
+    parser.add_argument("--bandwidth", type=float, default=100.0, help="Mbit/s to storage")
+    parser.add_argument("--files", type=Path, nargs="*", default=[], help="extra samples")
+    args = parser.parse_args()
+
+    samples = builtin_samples(args.repeat)
+    for path in args.files:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        samples[path.name] = (path.read_bytes(), content_type)
+    bytes_per_second = args.bandwidth * 1_000_000 / 8
+
+    print(
+        f"{'sample':<16} {'type':<24} {'level':>5} {'size':>10} {'stored':>10} {'ratio':>6} "
+        f"{'comp MB/s':>10} {'read MB/s':>10} {'store+read':>11} {'raw':>8}"
+    )
+    for name, (content, content_type) in samples.items():
+        raw_seconds = 2 * len(content) / bytes_per_second
+        flag = "" if compressible(content_type) else " (skipped)"
+        for level in args.levels:
+            stored, compress_seconds = timed(partial(compress, content, level), args.rounds)
+            decoded, read_seconds = timed(partial(read_back, stored, len(content)), args.rounds)
+            assert decoded == content
+            megabytes = len(content) / 1_000_000
+            total = compress_seconds + read_seconds + 2 * len(stored) / bytes_per_second
+            print(
+                f"{name:<16} {content_type + flag:<24} {level:>5} {len(content):>10} "
+                f"{len(stored):>10} {len(content) / len(stored):>5.1f}x "
+                f"{megabytes / compress_seconds:>10.1f} {megabytes / read_seconds:>10.1f} "
+                f"{total * 1000:>9.1f}ms {raw_seconds * 1000:>6.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()